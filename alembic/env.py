@@ -25,6 +25,17 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Objetos gestionados fuera de los modelos: columnas tsvector generadas (con
+# sus índices GIN) en PostgreSQL y el índice FTS5 de respaldo en SQLite
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name and name.endswith("_search_vector"):
+        return False
+    if type_ == "table" and name and name.startswith("search_index"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +58,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -72,7 +84,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,63 @@
+"""indexes for the remaining list filter combinations
+
+Revision ID: 259259bcdaf5
+Revises: a971b9cf97b9
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '259259bcdaf5'
+down_revision: Union[str, None] = 'a971b9cf97b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Combinaciones de filtros de los listados que aún no tenían índice propio,
+# con el mismo formato que d7e4f262e554: (filtros..., orden, id)
+FILTER_INDEXES = [
+    ('ix_beaches_zona_destacado_nombre_id', 'beaches', ['zona', 'nombre', 'id'],
+     {'postgresql': 'destacado = true', 'sqlite': 'destacado = 1'}),
+    ('ix_restaurants_ubicacion_tipo_nombre_id', 'restaurants', ['ubicacion', 'tipo', 'nombre', 'id'], None),
+    ('ix_restaurants_ubicacion_precio_nombre_id', 'restaurants', ['ubicacion', 'precio', 'nombre', 'id'], None),
+    ('ix_restaurants_tipo_precio_nombre_id', 'restaurants', ['tipo', 'precio', 'nombre', 'id'], None),
+]
+
+# Duplican las claves únicas uq_food_nombre y uq_heritage_sites_name (el
+# nombre ya es único) y solo encarecen las escrituras
+REDUNDANT_INDEXES = [
+    ('ix_food_nombre_id', 'food', ['nombre', 'id']),
+    ('ix_heritage_sites_name_id', 'heritage_sites', ['name', 'id']),
+]
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    # Sin bloquear escrituras en PostgreSQL; un índice INVALID de un intento
+    # anterior fallido se borra antes de crearlo de nuevo
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, table, columns, where in FILTER_INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgresql)
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where['postgresql']) if where else None,
+                sqlite_where=sa.text(where['sqlite']) if where else None,
+                postgresql_concurrently=postgresql,
+            )
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgresql)
+
+
+def downgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgresql)
+            op.create_index(name, table, columns, postgresql_concurrently=postgresql)
+        for name, table, _, _ in reversed(FILTER_INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgresql)
@@ -0,0 +1,48 @@
+"""partial indexes for the catalog zona and categoria filters
+
+Revision ID: 3b7f1c2d9a64
+Revises: c81f3e5a9d27
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7f1c2d9a64'
+down_revision: Union[str, None] = 'c81f3e5a9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Filtros de /catalog que a971b9cf97b9 dejó sin índice, con el mismo formato
+# que ix_items_catalog_pueblo_nombre_id: (filtro, nombre, id) de los items proyectados
+CATALOG_INDEXES = [
+    ('ix_items_catalog_zona_nombre_id', ['zona', 'nombre', 'id']),
+    ('ix_items_catalog_categoria_nombre_id', ['categoria', 'nombre', 'id']),
+]
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    # Sin bloquear escrituras en PostgreSQL; un índice INVALID de un intento
+    # anterior fallido se borra antes de crearlo de nuevo
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, columns in CATALOG_INDEXES:
+            op.drop_index(name, table_name='items', if_exists=True, postgresql_concurrently=postgresql)
+            op.create_index(
+                name, 'items', columns,
+                postgresql_where=sa.text('ref_id IS NOT NULL'),
+                sqlite_where=sa.text('ref_id IS NOT NULL'),
+                postgresql_concurrently=postgresql,
+            )
+
+
+def downgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, _ in reversed(CATALOG_INDEXES):
+            op.drop_index(name, table_name='items', if_exists=True, postgresql_concurrently=postgresql)
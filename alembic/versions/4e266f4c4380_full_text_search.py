@@ -0,0 +1,62 @@
+"""full text search vectors
+
+Revision ID: 4e266f4c4380
+Revises: 6019d6a77114
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e266f4c4380'
+down_revision: Union[str, None] = '6019d6a77114'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabla -> (columna de nombre, columna de descripción)
+SEARCH_TABLES = {
+    'beaches': ('nombre', 'descripcion'),
+    'food': ('nombre', 'descripcion'),
+    'restaurants': ('nombre', 'descripcion'),
+    'local_markets': ('name', 'description'),
+    'heritage_sites': ('name', 'description'),
+}
+
+
+def upgrade() -> None:
+    # tsvector y GIN solo existen en PostgreSQL; en SQLite la API usa FTS5
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() no es IMMUTABLE y no puede usarse en columnas generadas
+    op.execute("""
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS
+        $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """)
+
+    for table, (name_column, description_column) in SEARCH_TABLES.items():
+        op.execute(f"""
+            ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', immutable_unaccent(coalesce({name_column}, ''))), 'A') ||
+                setweight(to_tsvector('spanish', immutable_unaccent(coalesce({description_column}, ''))), 'B')
+            ) STORED
+        """)
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in reversed(list(SEARCH_TABLES)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
+    op.execute('DROP FUNCTION IF EXISTS immutable_unaccent(text)')
@@ -0,0 +1,88 @@
+"""servicios and ingredientes as indexed arrays
+
+Revision ID: 5690733bd420
+Revises: 4e266f4c4380
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5690733bd420'
+down_revision: Union[str, None] = '4e266f4c4380'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabla -> columna con la lista guardada como texto separado por comas
+LIST_COLUMNS = {
+    'beaches': 'servicios',
+    'food': 'ingredientes',
+}
+
+
+def _split(value):
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        for table, column in LIST_COLUMNS.items():
+            op.add_column(table, sa.Column(
+                f'{column}_new', postgresql.ARRAY(sa.String(length=100)),
+                server_default='{}', nullable=False
+            ))
+            op.execute(f"""
+                UPDATE {table} SET {column}_new = ARRAY(
+                    SELECT btrim(part) FROM unnest(string_to_array({column}, ',')) AS part
+                    WHERE btrim(part) <> ''
+                )
+                WHERE {column} IS NOT NULL
+            """)
+            op.drop_column(table, column)
+            op.alter_column(table, f'{column}_new', new_column_name=column)
+            op.create_index(f'ix_{table}_{column}', table, [column], postgresql_using='gin')
+        return
+
+    # SQLite: la lista se guarda como JSON
+    for table, column in LIST_COLUMNS.items():
+        rows = bind.execute(sa.text(f'SELECT id, {column} FROM {table}')).all()
+        for row_id, value in rows:
+            bind.execute(
+                sa.text(f'UPDATE {table} SET {column} = :value WHERE id = :id'),
+                {'value': json.dumps(_split(value), ensure_ascii=False), 'id': row_id}
+            )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=sa.JSON(), existing_type=sa.Text(), nullable=False)
+        op.create_index(f'ix_{table}_{column}', table, [column])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        for table, column in LIST_COLUMNS.items():
+            op.drop_index(f'ix_{table}_{column}', table_name=table)
+            op.add_column(table, sa.Column(f'{column}_old', sa.Text(), nullable=True))
+            op.execute(f"UPDATE {table} SET {column}_old = array_to_string({column}, ',')")
+            op.drop_column(table, column)
+            op.alter_column(table, f'{column}_old', new_column_name=column)
+        return
+
+    for table, column in LIST_COLUMNS.items():
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=sa.Text(), existing_type=sa.JSON(), nullable=True)
+        rows = bind.execute(sa.text(f'SELECT id, {column} FROM {table}')).all()
+        for row_id, value in rows:
+            bind.execute(
+                sa.text(f'UPDATE {table} SET {column} = :value WHERE id = :id'),
+                {'value': ','.join(json.loads(value or '[]')), 'id': row_id}
+            )
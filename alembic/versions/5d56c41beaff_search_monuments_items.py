@@ -0,0 +1,98 @@
+"""search index for monuments, catalog items and SQLite
+
+Revision ID: 5d56c41beaff
+Revises: 259259bcdaf5
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d56c41beaff'
+down_revision: Union[str, None] = '259259bcdaf5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tipo -> (tabla, nombre, descripción, imagen, condición para indexar la fila)
+SEARCH_TABLES = {
+    'playas': ('beaches', 'nombre', 'descripcion', 'imagen', None),
+    'food': ('food', 'nombre', 'descripcion', 'imagen', None),
+    'restaurants': ('restaurants', 'nombre', 'descripcion', 'imagen', None),
+    'markets': ('local_markets', 'name', 'description', 'image', None),
+    'heritage': ('heritage_sites', 'name', 'description', 'image', None),
+    'monuments': ('monuments', 'nombre', 'descripcion', 'imagen', None),
+    # Solo los items proyectados desde un recurso (catálogo)
+    'catalog': ('items', 'nombre', 'descripcion', 'imagen', 'ref_id IS NOT NULL'),
+}
+
+# Tablas que 4e266f4c4380 no indexaba en PostgreSQL
+NEW_TYPES = ['monuments', 'catalog']
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _upgrade_postgresql()
+    else:
+        # En SQLite el índice FTS5 se crea aquí en lugar de en la primera búsqueda
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        for table, *_ in SEARCH_TABLES.values():
+            for suffix in ('ai', 'au', 'ad'):
+                op.execute(f'DROP TRIGGER IF EXISTS {table}_search_{suffix}')
+        op.execute('DROP TABLE IF EXISTS search_index')
+        return
+
+    for tipo in reversed(NEW_TYPES):
+        table = SEARCH_TABLES[tipo][0]
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
+
+
+def _upgrade_postgresql():
+    # La extensión unaccent y immutable_unaccent() ya existen (4e266f4c4380)
+    for tipo in NEW_TYPES:
+        table, name_column, description_column, _, condition = SEARCH_TABLES[tipo]
+        op.execute(f"""
+            ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', immutable_unaccent(coalesce({name_column}, ''))), 'A') ||
+                setweight(to_tsvector('spanish', immutable_unaccent(coalesce({description_column}, ''))), 'B')
+            ) STORED
+        """)
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin',
+            postgresql_where=sa.text(condition) if condition else None,
+        )
+
+
+def _sqlite_insert(tipo, table, name_column, description_column, image_column, condition, row=None):
+    prefix = f'{row}.' if row else ''
+    source = '' if row else f' FROM {table}'
+    where = f'{prefix}{condition}' if condition else '1'
+    return (
+        'INSERT INTO search_index (tipo, ref_id, imagen, nombre, descripcion) '
+        f"SELECT '{tipo}', {prefix}id, {prefix}{image_column}, {prefix}{name_column}, "
+        f'{prefix}{description_column}{source} WHERE {where}'
+    )
+
+
+def _upgrade_sqlite():
+    op.execute(
+        'CREATE VIRTUAL TABLE search_index USING fts5('
+        'tipo UNINDEXED, ref_id UNINDEXED, imagen UNINDEXED, nombre, descripcion, '
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    for tipo, (table, *columns) in SEARCH_TABLES.items():
+        insert = _sqlite_insert(tipo, table, *columns, row='new')
+        delete = f"DELETE FROM search_index WHERE tipo = '{tipo}' AND ref_id = old.id"
+        op.execute(f'CREATE TRIGGER {table}_search_ai AFTER INSERT ON {table} BEGIN {insert}; END')
+        op.execute(f'CREATE TRIGGER {table}_search_au AFTER UPDATE ON {table} BEGIN {delete}; {insert}; END')
+        op.execute(f'CREATE TRIGGER {table}_search_ad AFTER DELETE ON {table} BEGIN {delete}; END')
+        # Relleno con las filas existentes
+        op.execute(_sqlite_insert(tipo, table, *columns))
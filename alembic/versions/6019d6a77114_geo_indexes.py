@@ -0,0 +1,37 @@
+"""geo indexes for nearby search
+
+Revision ID: 6019d6a77114
+Revises: 6221e43e5ef0
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6019d6a77114'
+down_revision: Union[str, None] = '6221e43e5ef0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índices (latitud, longitud) para el prefiltro por bounding box de /nearby
+GEO_INDEXES = [
+    ('ix_beaches_latitud_longitud', 'beaches', ['latitud', 'longitud']),
+    ('ix_food_latitud_longitud', 'food', ['latitud', 'longitud']),
+    ('ix_restaurants_latitud_longitud', 'restaurants', ['latitud', 'longitud']),
+    ('ix_local_markets_latitude_longitude', 'local_markets', ['latitude', 'longitude']),
+    ('ix_heritage_sites_latitude_longitude', 'heritage_sites', ['latitude', 'longitude']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in GEO_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(GEO_INDEXES):
+        op.drop_index(name, table_name=table)
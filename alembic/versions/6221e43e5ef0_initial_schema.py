@@ -0,0 +1,234 @@
+"""initial schema
+
+Revision ID: 6221e43e5ef0
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6221e43e5ef0'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'beaches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('descripcion', sa.Text(), nullable=True),
+        sa.Column('imagen', sa.String(length=255), nullable=True),
+        sa.Column('zona', sa.String(length=100), nullable=True),
+        sa.Column('pueblo', sa.String(length=100), nullable=True),
+        sa.Column('tipo', sa.String(length=50), nullable=True),
+        sa.Column('servicios', sa.Text(), nullable=True),
+        sa.Column('acceso', sa.String(length=100), nullable=True),
+        sa.Column('destacado', sa.Boolean(), nullable=True),
+        sa.Column('latitud', sa.Float(), nullable=True),
+        sa.Column('longitud', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_beaches_id'), 'beaches', ['id'], unique=False)
+
+    op.create_table(
+        'monuments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('descripcion', sa.Text(), nullable=True),
+        sa.Column('epoca', sa.String(length=100), nullable=True),
+        sa.Column('destacado', sa.String(length=255), nullable=True),
+        sa.Column('horario', sa.String(length=100), nullable=True),
+        sa.Column('imagen', sa.String(length=255), nullable=True),
+        sa.Column('latitud', sa.Float(), nullable=True),
+        sa.Column('longitud', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_monuments_id'), 'monuments', ['id'], unique=False)
+
+    op.create_table(
+        'food',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('categoria', sa.String(length=100), nullable=True),
+        sa.Column('descripcion', sa.Text(), nullable=True),
+        sa.Column('ingredientes', sa.Text(), nullable=True),
+        sa.Column('imagen', sa.String(length=255), nullable=True),
+        sa.Column('preparacion', sa.Text(), nullable=True),
+        sa.Column('donde_probar', sa.String(length=255), nullable=True),
+        sa.Column('latitud', sa.Float(), nullable=True),
+        sa.Column('longitud', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_food_id'), 'food', ['id'], unique=False)
+
+    op.create_table(
+        'restaurants',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('ubicacion', sa.String(length=100), nullable=True),
+        sa.Column('especialidad', sa.String(length=100), nullable=True),
+        sa.Column('precio', sa.String(length=10), nullable=True),
+        sa.Column('reserva', sa.Boolean(), nullable=True),
+        sa.Column('url', sa.String(length=255), nullable=True),
+        sa.Column('tipo', sa.String(length=50), nullable=True),
+        sa.Column('descripcion', sa.Text(), nullable=True),
+        sa.Column('horario', sa.String(length=255), nullable=True),
+        sa.Column('telefono', sa.String(length=20), nullable=True),
+        sa.Column('imagen', sa.String(length=255), nullable=True),
+        sa.Column('latitud', sa.Float(), nullable=True),
+        sa.Column('longitud', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_restaurants_id'), 'restaurants', ['id'], unique=False)
+
+    op.create_table(
+        'categories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_categories_id'), 'categories', ['id'], unique=False)
+    op.create_index(op.f('ix_categories_name'), 'categories', ['name'], unique=True)
+
+    op.create_table(
+        'items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(), nullable=True),
+        sa.Column('imagen', sa.String(), nullable=True),
+        sa.Column('descripcion', sa.String(), nullable=True),
+        sa.Column('zona', sa.String(), nullable=True),
+        sa.Column('pueblo', sa.String(), nullable=True),
+        sa.Column('tipo', sa.String(), nullable=True),
+        sa.Column('servicios', sa.String(), nullable=True),
+        sa.Column('acceso', sa.String(), nullable=True),
+        sa.Column('destacado', sa.Boolean(), nullable=True),
+        sa.Column('categoria', sa.String(), nullable=True),
+        sa.Column('ingredientes', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_items_id'), 'items', ['id'], unique=False)
+    op.create_index(op.f('ix_items_nombre'), 'items', ['nombre'], unique=False)
+
+    op.create_table(
+        'category_association',
+        sa.Column('item_id', sa.Integer(), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], )
+    )
+
+    op.create_table(
+        'reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=True),
+        sa.Column('rating', sa.Integer(), nullable=True),
+        sa.Column('comment', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reviews_id'), 'reviews', ['id'], unique=False)
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    op.create_table(
+        'local_markets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.Column('address', sa.String(), nullable=False),
+        sa.Column('google_maps_url', sa.String(), nullable=False),
+        sa.Column('days', sa.String(), nullable=False),
+        sa.Column('hours', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('image', sa.String(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_local_markets_id'), 'local_markets', ['id'], unique=False)
+
+    op.create_table(
+        'heritage_sites',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('period', sa.String(), nullable=False),
+        sa.Column('highlight', sa.String(), nullable=False),
+        sa.Column('schedule', sa.String(), nullable=False),
+        sa.Column('open_days', sa.String(), nullable=False),
+        sa.Column('image', sa.String(), nullable=False),
+        sa.Column('address', sa.String(), nullable=False),
+        sa.Column('google_maps_url', sa.String(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('entrance_fee', sa.String(), nullable=True),
+        sa.Column('accessibility', sa.String(), nullable=True),
+        sa.Column('guided_tours', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_heritage_sites_id'), 'heritage_sites', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_heritage_sites_id'), table_name='heritage_sites')
+    op.drop_table('heritage_sites')
+    op.drop_index(op.f('ix_local_markets_id'), table_name='local_markets')
+    op.drop_table('local_markets')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_reviews_id'), table_name='reviews')
+    op.drop_table('reviews')
+    op.drop_table('category_association')
+    op.drop_index(op.f('ix_items_nombre'), table_name='items')
+    op.drop_index(op.f('ix_items_id'), table_name='items')
+    op.drop_table('items')
+    op.drop_index(op.f('ix_categories_name'), table_name='categories')
+    op.drop_index(op.f('ix_categories_id'), table_name='categories')
+    op.drop_table('categories')
+    op.drop_index(op.f('ix_restaurants_id'), table_name='restaurants')
+    op.drop_table('restaurants')
+    op.drop_index(op.f('ix_food_id'), table_name='food')
+    op.drop_table('food')
+    op.drop_index(op.f('ix_monuments_id'), table_name='monuments')
+    op.drop_table('monuments')
+    op.drop_index(op.f('ix_beaches_id'), table_name='beaches')
+    op.drop_table('beaches')
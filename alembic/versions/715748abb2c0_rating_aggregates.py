@@ -0,0 +1,46 @@
+"""rating aggregates on items
+
+Revision ID: 715748abb2c0
+Revises: d7e4f262e554
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '715748abb2c0'
+down_revision: Union[str, None] = 'd7e4f262e554'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Las reseñas existentes se agregan después con: python recompute_ratings.py
+COUNTERS = ['rating_count', 'rating_sum', 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5']
+
+
+def upgrade() -> None:
+    for column in COUNTERS:
+        op.add_column('items', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+    op.add_column('items', sa.Column('rating_avg', sa.Float(), nullable=True))
+
+    for name, columns in (
+        ('ix_items_tipo_rating_avg_id', ['tipo', 'rating_avg', 'id']),
+        ('ix_items_rating_avg_id', ['rating_avg', 'id']),
+    ):
+        op.create_index(
+            name, 'items', columns,
+            postgresql_where=sa.text('rating_count > 0'),
+            sqlite_where=sa.text('rating_count > 0'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_items_rating_avg_id', table_name='items')
+    op.drop_index('ix_items_tipo_rating_avg_id', table_name='items')
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.drop_column('rating_avg')
+        for column in reversed(COUNTERS):
+            batch_op.drop_column(column)
@@ -0,0 +1,32 @@
+"""content hash for change detection
+
+Revision ID: 88377768d786
+Revises: e57b5aa5c5a7
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '88377768d786'
+down_revision: Union[str, None] = 'e57b5aa5c5a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Las filas existentes quedan con NULL y se actualizan en el primer refresco
+TABLES = ['beaches', 'food', 'restaurants', 'local_markets', 'heritage_sites']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('content_hash')
@@ -0,0 +1,51 @@
+"""composite primary key and reverse index on category_association
+
+Revision ID: 9e8aab595e98
+Revises: 715748abb2c0
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e8aab595e98'
+down_revision: Union[str, None] = '715748abb2c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Antes de la clave primaria: fuera filas incompletas y duplicadas
+    op.execute('DELETE FROM category_association WHERE item_id IS NULL OR category_id IS NULL')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            DELETE FROM category_association a USING category_association b
+            WHERE a.ctid < b.ctid AND a.item_id = b.item_id AND a.category_id = b.category_id
+        """)
+    else:
+        op.execute("""
+            DELETE FROM category_association WHERE rowid NOT IN (
+                SELECT min(rowid) FROM category_association GROUP BY item_id, category_id
+            )
+        """)
+
+    with op.batch_alter_table('category_association') as batch_op:
+        batch_op.alter_column('item_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('category_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key('pk_category_association', ['category_id', 'item_id'])
+    op.create_index(
+        'ix_category_association_item_id_category_id', 'category_association',
+        ['item_id', 'category_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_category_association_item_id_category_id', table_name='category_association')
+    with op.batch_alter_table('category_association') as batch_op:
+        batch_op.drop_constraint('pk_category_association', type_='primary')
+        batch_op.alter_column('category_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('item_id', existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,99 @@
+"""catalog projection columns and indexes on items
+
+Revision ID: a971b9cf97b9
+Revises: 9e8aab595e98
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a971b9cf97b9'
+down_revision: Union[str, None] = '9e8aab595e98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_INDEXES = [
+    ('ix_items_catalog_nombre_id', ['nombre', 'id']),
+    ('ix_items_catalog_tipo_nombre_id', ['tipo', 'nombre', 'id']),
+    ('ix_items_catalog_pueblo_nombre_id', ['pueblo', 'nombre', 'id']),
+]
+
+# Proyección de los recursos existentes, copiada de projection.catalog_upsert
+# tal como era en esta revisión: tipo, tabla, columna de items -> columna del recurso
+CATALOG_SOURCES = [
+    ('Playa', 'beaches', {
+        'nombre': 'nombre', 'imagen': 'imagen', 'descripcion': 'descripcion', 'zona': 'zona',
+        'pueblo': 'pueblo', 'acceso': 'acceso', 'destacado': 'destacado',
+        'latitud': 'latitud', 'longitud': 'longitud', 'is_active': 'is_active',
+    }),
+    ('Plato', 'food', {
+        'nombre': 'nombre', 'imagen': 'imagen', 'descripcion': 'descripcion', 'categoria': 'categoria',
+        'latitud': 'latitud', 'longitud': 'longitud', 'is_active': 'is_active',
+    }),
+    ('Restaurante', 'restaurants', {
+        'nombre': 'nombre', 'imagen': 'imagen', 'descripcion': 'descripcion', 'pueblo': 'ubicacion',
+        'categoria': 'tipo', 'latitud': 'latitud', 'longitud': 'longitud', 'is_active': 'is_active',
+    }),
+    ('Mercado', 'local_markets', {
+        'nombre': 'name', 'imagen': 'image', 'descripcion': 'description', 'pueblo': 'location',
+        'latitud': 'latitude', 'longitud': 'longitude', 'is_active': 'is_active',
+    }),
+    ('Monumento', 'heritage_sites', {
+        'nombre': 'name', 'imagen': 'image', 'descripcion': 'description', 'categoria': 'period',
+        'latitud': 'latitude', 'longitud': 'longitude', 'is_active': 'is_active',
+    }),
+]
+
+
+def project_sql(tipo, table, columns):
+    targets = ', '.join(columns)
+    values = ', '.join(columns.values())
+    updates = ', '.join(f'{name} = excluded.{name}' for name in columns)
+    # SQLite necesita un WHERE para no confundir el ON CONFLICT con un JOIN
+    return (
+        f"INSERT INTO items (tipo, ref_id, {targets}) "
+        f"SELECT '{tipo}', id, {values} FROM {table} WHERE 1 = 1 "
+        f"ON CONFLICT (tipo, ref_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP"
+    )
+
+
+def upgrade() -> None:
+    op.add_column('items', sa.Column('ref_id', sa.Integer(), nullable=True))
+    op.add_column('items', sa.Column('latitud', sa.Float(), nullable=True))
+    op.add_column('items', sa.Column('longitud', sa.Float(), nullable=True))
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.create_unique_constraint('uq_items_tipo_ref_id', ['tipo', 'ref_id'])
+
+    for name, columns in CATALOG_INDEXES:
+        op.create_index(
+            name, 'items', columns,
+            postgresql_where=sa.text('ref_id IS NOT NULL'),
+            sqlite_where=sa.text('ref_id IS NOT NULL'),
+        )
+
+    # El catálogo queda lleno al migrar, sin pasar por python projection.py
+    for tipo, table, columns in CATALOG_SOURCES:
+        op.execute(project_sql(tipo, table, columns))
+
+
+def downgrade() -> None:
+    # Se borran los items proyectados salvo los que ya tienen reseñas o
+    # categorías, que se conservan como items sueltos
+    op.execute("""
+        DELETE FROM items
+        WHERE ref_id IS NOT NULL
+          AND id NOT IN (SELECT item_id FROM reviews WHERE item_id IS NOT NULL)
+          AND id NOT IN (SELECT item_id FROM category_association)
+    """)
+    for name, _ in reversed(CATALOG_INDEXES):
+        op.drop_index(name, table_name='items')
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.drop_constraint('uq_items_tipo_ref_id', type_='unique')
+        batch_op.drop_column('longitud')
+        batch_op.drop_column('latitud')
+        batch_op.drop_column('ref_id')
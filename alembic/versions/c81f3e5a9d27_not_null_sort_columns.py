@@ -0,0 +1,62 @@
+"""not null sort columns for keyset pagination
+
+Revision ID: c81f3e5a9d27
+Revises: 5d56c41beaff
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3e5a9d27'
+down_revision: Union[str, None] = '5d56c41beaff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Columnas de orden de la paginación por clave (ver pagination.keyset). La
+    # API y la proyección del catálogo siempre las escriben; las filas antiguas
+    # sin valor reciben uno
+    op.execute("UPDATE categories SET name = 'Categoría ' || id WHERE name IS NULL")
+    op.execute("UPDATE items SET nombre = '' WHERE nombre IS NULL")
+
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.alter_column('name', existing_type=sa.String(), nullable=False)
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.alter_column('nombre', existing_type=sa.String(), nullable=False)
+    _restore_sqlite_search_triggers()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('items') as batch_op:
+        batch_op.alter_column('nombre', existing_type=sa.String(), nullable=True)
+    with op.batch_alter_table('categories') as batch_op:
+        batch_op.alter_column('name', existing_type=sa.String(), nullable=True)
+    _restore_sqlite_search_triggers()
+
+
+# Triggers de búsqueda de items tal como los crea 5d56c41beaff
+ITEMS_SEARCH_INSERT = (
+    'INSERT INTO search_index (tipo, ref_id, imagen, nombre, descripcion) '
+    "SELECT 'catalog', new.id, new.imagen, new.nombre, new.descripcion WHERE new.ref_id IS NOT NULL"
+)
+ITEMS_SEARCH_DELETE = "DELETE FROM search_index WHERE tipo = 'catalog' AND ref_id = old.id"
+ITEMS_SEARCH_TRIGGERS = [
+    f'CREATE TRIGGER IF NOT EXISTS items_search_ai AFTER INSERT ON items BEGIN {ITEMS_SEARCH_INSERT}; END',
+    f'CREATE TRIGGER IF NOT EXISTS items_search_au AFTER UPDATE ON items BEGIN '
+    f'{ITEMS_SEARCH_DELETE}; {ITEMS_SEARCH_INSERT}; END',
+    f'CREATE TRIGGER IF NOT EXISTS items_search_ad AFTER DELETE ON items BEGIN {ITEMS_SEARCH_DELETE}; END',
+]
+
+
+def _restore_sqlite_search_triggers():
+    # En SQLite batch_alter_table recrea la tabla items y se pierden sus
+    # triggers de búsqueda; los datos copiados no cambian el índice
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in ITEMS_SEARCH_TRIGGERS:
+            op.execute(statement)
@@ -0,0 +1,66 @@
+"""composite and partial indexes for list filters
+
+Revision ID: d7e4f262e554
+Revises: 88377768d786
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e4f262e554'
+down_revision: Union[str, None] = '88377768d786'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Un índice por camino de filtro de los listados. Todos terminan en
+# (orden, id), el orden de la paginación, para que el filtro, el ORDER BY y
+# el cursor se resuelvan con un solo recorrido del índice. Los parciales
+# llevan la condición tal como la escribe cada dialecto en las consultas,
+# que es como el planificador de SQLite reconoce que puede usarlos.
+FILTER_INDEXES = [
+    ('ix_beaches_nombre_id', 'beaches', ['nombre', 'id'], None),
+    ('ix_beaches_zona_nombre_id', 'beaches', ['zona', 'nombre', 'id'], None),
+    ('ix_beaches_destacado_nombre_id', 'beaches', ['nombre', 'id'],
+     {'postgresql': 'destacado = true', 'sqlite': 'destacado = 1'}),
+    ('ix_food_nombre_id', 'food', ['nombre', 'id'], None),
+    ('ix_food_categoria_nombre_id', 'food', ['categoria', 'nombre', 'id'], None),
+    ('ix_restaurants_nombre_id', 'restaurants', ['nombre', 'id'], None),
+    ('ix_restaurants_ubicacion_nombre_id', 'restaurants', ['ubicacion', 'nombre', 'id'], None),
+    ('ix_restaurants_tipo_nombre_id', 'restaurants', ['tipo', 'nombre', 'id'], None),
+    ('ix_restaurants_precio_nombre_id', 'restaurants', ['precio', 'nombre', 'id'], None),
+    ('ix_restaurants_ubicacion_tipo_precio_nombre_id', 'restaurants',
+     ['ubicacion', 'tipo', 'precio', 'nombre', 'id'], None),
+    ('ix_local_markets_name_id', 'local_markets', ['name', 'id'], None),
+    ('ix_local_markets_location_name_id', 'local_markets', ['location', 'name', 'id'], None),
+    ('ix_heritage_sites_name_id', 'heritage_sites', ['name', 'id'], None),
+    ('ix_heritage_sites_period_name_id', 'heritage_sites', ['period', 'name', 'id'], None),
+    ('ix_reviews_item_id_id', 'reviews', ['item_id', 'id'], None),
+]
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    # En PostgreSQL se crean sin bloquear escrituras (fuera de la transacción).
+    # Un CREATE INDEX CONCURRENTLY fallido deja el índice INVALID, y con
+    # IF NOT EXISTS se daría por bueno: se borra y se vuelve a crear
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, table, columns, where in FILTER_INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgresql)
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where['postgresql']) if where else None,
+                sqlite_where=sa.text(where['sqlite']) if where else None,
+                postgresql_concurrently=postgresql,
+            )
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(FILTER_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
@@ -0,0 +1,40 @@
+"""natural key unique constraints for bulk upserts
+
+Revision ID: e57b5aa5c5a7
+Revises: 5690733bd420
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e57b5aa5c5a7'
+down_revision: Union[str, None] = '5690733bd420'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Claves naturales usadas por ON CONFLICT en las cargas masivas. Si ya hay
+# duplicados en la tabla la migración falla y hay que depurarlos antes.
+NATURAL_KEYS = [
+    ('uq_beaches_nombre_pueblo', 'beaches', ['nombre', 'pueblo']),
+    ('uq_food_nombre', 'food', ['nombre']),
+    ('uq_restaurants_nombre_ubicacion', 'restaurants', ['nombre', 'ubicacion']),
+    ('uq_local_markets_name_location', 'local_markets', ['name', 'location']),
+    ('uq_heritage_sites_name', 'heritage_sites', ['name']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in NATURAL_KEYS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_unique_constraint(name, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(NATURAL_KEYS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(name, type_='unique')
@@ -0,0 +1 @@
+"""Scripts de medida de rendimiento: datos sintéticos, planes de consulta y carga HTTP."""
@@ -0,0 +1,245 @@
+"""Comprueba con EXPLAIN que cada listado filtrado usa un índice.
+
+Crea el esquema con las migraciones, llena las tablas con datos sintéticos y
+ejecuta las mismas consultas que los routers (filtro + orden + paginación),
+con y sin cursor. Falla si alguna recorre la tabla entera o necesita ordenar.
+
+    DATABASE_URL=postgresql://.../bench_db python benchmarks/explain_indexes.py --rows 200000
+
+Usa una base de datos desechable: el script escribe en ella.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+
+import models  # noqa: E402
+from benchmarks.seed import upgrade_schema  # noqa: E402
+from database import engine  # noqa: E402
+from pagination import encode_cursor, paginate  # noqa: E402
+
+ZONAS = ["Norte", "Sur", "Este", "Oeste", "Sureste", "Noreste", "Tramuntana", "Pla", "Llevant", "Migjorn"]
+PUEBLOS = [f"Pueblo {i}" for i in range(60)]
+CATEGORIAS = ["Repostería", "Embutido", "Plato principal", "Entrante", "Postre", "Sopa", "Arroz",
+              "Pescado", "Carne", "Verdura", "Bebida", "Pan"]
+TIPOS = ["Mallorquín", "Marinero", "Celler", "Cafetería", "Tapas", "Asador", "Fusión", "Italiano",
+         "Japonés", "Vegetariano", "Pizzería", "Gastrobar"]
+PRECIOS = ["€", "€€", "€€€", "€€€€"]
+CATALOG_TIPOS = ["Playa", "Plato", "Restaurante", "Mercado", "Monumento"]
+PERIODOS = ["Talayótico", "Romano", "Islámico", "Gótico", "Renacentista", "Barroco", "Modernista",
+            "Contemporáneo"]
+
+
+def seed_rows(table, count, make):
+    batch = 5000
+    with engine.begin() as conn:
+        for start in range(0, count, batch):
+            conn.execute(insert(table), [make(i) for i in range(start, min(start + batch, count))])
+
+
+def seed(rows):
+    rnd = random.Random(42)
+    # Nombres en orden aleatorio: insertados en orden, la tabla quedaría
+    # ordenada físicamente por nombre y PostgreSQL preferiría los índices por
+    # nombre (correlación perfecta con el heap), algo que no pasa con datos reales
+    order = rnd.sample(range(rows), rows)
+    seed_rows(models.Beach.__table__, rows, lambda i: dict(
+        nombre=f"Playa {order[i]:07d}", pueblo=rnd.choice(PUEBLOS), zona=rnd.choice(ZONAS),
+        descripcion="", imagen="", tipo="Playa", servicios=[], acceso="",
+        destacado=rnd.random() < 0.05, is_active=True,
+    ))
+    seed_rows(models.Food.__table__, rows, lambda i: dict(
+        nombre=f"Plato {order[i]:07d}", categoria=rnd.choice(CATEGORIAS), descripcion="", imagen="",
+        ingredientes=[], is_active=True,
+    ))
+    seed_rows(models.Restaurant.__table__, rows, lambda i: dict(
+        nombre=f"Restaurante {order[i]:07d}", ubicacion=rnd.choice(PUEBLOS), especialidad="",
+        precio=rnd.choice(PRECIOS), reserva=False, tipo=rnd.choice(TIPOS), is_active=True,
+    ))
+    seed_rows(models.LocalMarket.__table__, rows, lambda i: dict(
+        name=f"Mercado {order[i]:07d}", location=rnd.choice(PUEBLOS), address="", google_maps_url="",
+        days="", hours="", is_active=True,
+    ))
+    seed_rows(models.Heritage.__table__, rows, lambda i: dict(
+        name=f"Monumento {order[i]:07d}", period=rnd.choice(PERIODOS), description="", highlight="",
+        schedule="", open_days="", image="", address="", google_maps_url="", is_active=True,
+    ))
+    seed_rows(models.Category.__table__, rows, lambda i: dict(name=f"Categoría {order[i]:07d}", description=""))
+    # Proyección del catálogo: una fila por recurso; uno de cada diez items
+    # está desvinculado (recurso borrado) y los índices parciales no lo incluyen
+    items = max(rows // 100, 1)
+    seed_rows(models.Item.__table__, rows, lambda i: dict(
+        nombre=f"Item {order[i]:07d}", tipo=rnd.choice(CATALOG_TIPOS), ref_id=i + 1 if i % 10 else None,
+        zona=rnd.choice(ZONAS), pueblo=rnd.choice(PUEBLOS), categoria=rnd.choice(CATEGORIAS), is_active=True,
+    ))
+    seed_rows(models.Review.__table__, rows, lambda i: dict(
+        item_id=rnd.randint(1, items), rating=rnd.randint(1, 5), comment="",
+    ))
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+# Nombre -> (modelo, columna de orden, filtros, índice esperado); igual que los routers.
+# SQLite llama sqlite_autoindex_<tabla>_N a los índices de las claves únicas
+CASES = {
+    "playas": (models.Beach, models.Beach.nombre, [], "ix_beaches_nombre_id"),
+    "playas?zona": (models.Beach, models.Beach.nombre, [models.Beach.zona == "Sur"],
+                    "ix_beaches_zona_nombre_id"),
+    "playas?destacado": (models.Beach, models.Beach.nombre, [models.Beach.destacado == True],  # noqa: E712
+                         "ix_beaches_destacado_nombre_id"),
+    "playas?zona&destacado": (models.Beach, models.Beach.nombre, [
+        models.Beach.zona == "Sur", models.Beach.destacado == True,  # noqa: E712
+    ], "ix_beaches_zona_destacado_nombre_id"),
+    "food": (models.Food, models.Food.nombre, [], ("uq_food_nombre", "sqlite_autoindex_food_1")),
+    "food?categoria": (models.Food, models.Food.nombre, [models.Food.categoria == "Arroz"],
+                       "ix_food_categoria_nombre_id"),
+    "restaurants": (models.Restaurant, models.Restaurant.nombre, [], "ix_restaurants_nombre_id"),
+    "restaurants?ubicacion": (models.Restaurant, models.Restaurant.nombre,
+                              [models.Restaurant.ubicacion == "Pueblo 7"],
+                              "ix_restaurants_ubicacion_nombre_id"),
+    "restaurants?tipo": (models.Restaurant, models.Restaurant.nombre,
+                         [models.Restaurant.tipo == "Celler"], "ix_restaurants_tipo_nombre_id"),
+    "restaurants?precio": (models.Restaurant, models.Restaurant.nombre,
+                           [models.Restaurant.precio == "€€€"], "ix_restaurants_precio_nombre_id"),
+    "restaurants?ubicacion&tipo": (models.Restaurant, models.Restaurant.nombre, [
+        models.Restaurant.ubicacion == "Pueblo 7", models.Restaurant.tipo == "Celler",
+    ], "ix_restaurants_ubicacion_tipo_nombre_id"),
+    "restaurants?ubicacion&precio": (models.Restaurant, models.Restaurant.nombre, [
+        models.Restaurant.ubicacion == "Pueblo 7", models.Restaurant.precio == "€€€",
+    ], "ix_restaurants_ubicacion_precio_nombre_id"),
+    "restaurants?tipo&precio": (models.Restaurant, models.Restaurant.nombre, [
+        models.Restaurant.tipo == "Celler", models.Restaurant.precio == "€€€",
+    ], "ix_restaurants_tipo_precio_nombre_id"),
+    "restaurants?ubicacion&tipo&precio": (models.Restaurant, models.Restaurant.nombre, [
+        models.Restaurant.ubicacion == "Pueblo 7", models.Restaurant.tipo == "Celler",
+        models.Restaurant.precio == "€€€",
+    ], "ix_restaurants_ubicacion_tipo_precio_nombre_id"),
+    "markets": (models.LocalMarket, models.LocalMarket.name, [], "ix_local_markets_name_id"),
+    "markets?location": (models.LocalMarket, models.LocalMarket.name,
+                         [models.LocalMarket.location == "Pueblo 7"], "ix_local_markets_location_name_id"),
+    "heritage": (models.Heritage, models.Heritage.name, [],
+                 ("uq_heritage_sites_name", "sqlite_autoindex_heritage_sites_1")),
+    "heritage?period": (models.Heritage, models.Heritage.name, [models.Heritage.period == "Gótico"],
+                        "ix_heritage_sites_period_name_id"),
+    "categories": (models.Category, models.Category.name, [], "ix_categories_name"),
+    "reviews?item_id": (models.Review, None, [models.Review.item_id == 3], "ix_reviews_item_id_id"),
+    # /catalog solo lista items proyectados (ref_id IS NOT NULL), como sus índices parciales
+    "catalog": (models.Item, models.Item.nombre, [models.Item.ref_id.is_not(None)],
+                "ix_items_catalog_nombre_id"),
+    "catalog?tipo": (models.Item, models.Item.nombre, [
+        models.Item.ref_id.is_not(None), models.Item.tipo == "Playa",
+    ], "ix_items_catalog_tipo_nombre_id"),
+    "catalog?pueblo": (models.Item, models.Item.nombre, [
+        models.Item.ref_id.is_not(None), models.Item.pueblo == "Pueblo 7",
+    ], "ix_items_catalog_pueblo_nombre_id"),
+    "catalog?zona": (models.Item, models.Item.nombre, [
+        models.Item.ref_id.is_not(None), models.Item.zona == "Sur",
+    ], "ix_items_catalog_zona_nombre_id"),
+    "catalog?categoria": (models.Item, models.Item.nombre, [
+        models.Item.ref_id.is_not(None), models.Item.categoria == "Arroz",
+    ], "ix_items_catalog_categoria_nombre_id"),
+}
+
+
+PAGE_SIZE = 100
+
+
+def build_query(model, sort_column, filters, cursor=None):
+    query = select(model)
+    for condition in filters:
+        query = query.filter(condition)
+    return paginate(query, sort_column, model.id, PAGE_SIZE, 0, cursor)
+
+
+def middle_cursor(conn, model, sort_column, filters):
+    # Cursor a mitad del resultado para medir también la segunda página y siguientes
+    columns = [sort_column, model.id] if sort_column is not None else [model.id]
+    query = select(*columns).where(*filters).order_by(*columns)
+    total = conn.execute(select(func.count()).select_from(query.subquery())).scalar()
+    row = conn.execute(query.offset(total // 2).limit(1)).first()
+    return encode_cursor(list(row)) if row else None
+
+
+def explain(conn, query, index):
+    """Plan de la consulta y si usa `index` (o uno de sus nombres) sin recorrer la tabla ni ordenar.
+
+    En PostgreSQL se admite un Sort cuando el índice ya deja como mucho una
+    página de filas (filtros muy selectivos): ordenarlas cuesta lo mismo que
+    leerlas en orden.
+    """
+    names = (index,) if isinstance(index, str) else index
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    if engine.dialect.name == "postgresql":
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        nodes = []
+        bad = False
+
+        def walk(node):
+            nonlocal bad
+            nodes.append(node["Node Type"] + (f" {node['Index Name']}" if "Index Name" in node else ""))
+            if node["Node Type"] == "Seq Scan":
+                bad = True
+            elif node["Node Type"] == "Sort":
+                bad = bad or any(child["Plan Rows"] > PAGE_SIZE + 1 for child in node.get("Plans", []))
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk((plan if isinstance(plan, list) else json.loads(plan))[0]["Plan"])
+        uses_index = any(node.endswith(f" {name}") for node in nodes for name in names)
+        return " > ".join(nodes), uses_index and not bad
+
+    details = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+    uses_index = any(f"INDEX {name} " in f"{d} " for d in details for name in names)
+    bad = any(d.startswith("SCAN") and "USING" not in d or "TEMP B-TREE" in d for d in details)
+    return "; ".join(details), uses_index and not bad
+
+
+def timed(conn, query, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(query).all()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Filas por tabla")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por consulta")
+    parser.add_argument("--skip-seed", action="store_true", help="Reutilizar los datos existentes")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    if not args.skip_seed:
+        with engine.connect() as conn:
+            if conn.execute(select(func.count()).select_from(models.Beach)).scalar():
+                sys.exit("La base de datos ya tiene datos; usa una base de datos vacía o --skip-seed")
+        start = time.perf_counter()
+        seed(args.rows)
+        print(f"Datos generados: {args.rows} filas por tabla en {time.perf_counter() - start:.1f}s")
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, (model, sort_column, filters, index) in CASES.items():
+            cursor = middle_cursor(conn, model, sort_column, filters)
+            for label, query in (("", build_query(model, sort_column, filters)),
+                                 (" +cursor", build_query(model, sort_column, filters, cursor))):
+                plan, ok = explain(conn, query, index)
+                ms = timed(conn, query, args.repeat)
+                failures += not ok
+                print(f"{'OK  ' if ok else 'FAIL'} {name + label:<42} {ms:8.2f} ms  {plan}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Prueba de carga HTTP de los endpoints de la API.
+
+Cada escenario se lanza con `--concurrency` clientes simultáneos durante
+`--duration` segundos (tras un breve calentamiento que no se mide) y se
+registran peticiones por segundo, errores, latencias p50/p95/p99 y la
+proporción de aciertos de la caché de respuestas. Los resultados se guardan en
+JSON y se pueden comparar con una ejecución anterior:
+
+    python benchmarks/loadtest.py --base-url http://localhost:8000 --output antes.json
+    python benchmarks/loadtest.py --base-url http://localhost:8000 --baseline antes.json
+
+Con `--baseline` termina con código 1 si algún escenario empeora su p95 o su
+rendimiento más de `--max-regression`. Con `--in-process` llama a la
+aplicación sin red (útil en CI, pero sin medir el servidor ni la red). Los
+datos deben venir de benchmarks/seed.py.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from benchmarks.seed import (  # noqa: E402
+    CATEGORIAS, MUNICIPIOS, PERIODOS, PLATOS, PRECIOS, SEED_PASSWORD, TIPOS_ITEM, TIPOS_RESTAURANTE,
+    ZONAS,
+)
+
+# Nombre -> función que construye la ruta con parámetros aleatorios
+SCENARIOS = {
+    "playas": lambda ctx, rnd: "/api/v1/playas/?limit=20",
+    "playas?zona": lambda ctx, rnd: f"/api/v1/playas/?limit=20&zona={rnd.choice(ZONAS)}",
+    "playas?fields": lambda ctx, rnd: "/api/v1/playas/?limit=100&fields=id,nombre,latitud,longitud,imagen",
+    "playas/{id}": lambda ctx, rnd: f"/api/v1/playas/{rnd.choice(ctx['playas'])}",
+    "food?categoria": lambda ctx, rnd: f"/api/v1/food/?limit=20&categoria={rnd.choice(CATEGORIAS)}",
+    "food/{id}": lambda ctx, rnd: f"/api/v1/food/{rnd.choice(ctx['food'])}",
+    "restaurants?ubicacion&tipo": lambda ctx, rnd: (
+        f"/api/v1/restaurants/?limit=20&ubicacion={rnd.choice(list(MUNICIPIOS))}"
+        f"&tipo={rnd.choice(TIPOS_RESTAURANTE)}"
+    ),
+    "restaurants?precio": lambda ctx, rnd: f"/api/v1/restaurants/?limit=50&precio={rnd.choice(PRECIOS)}",
+    "restaurants/{id}": lambda ctx, rnd: f"/api/v1/restaurants/{rnd.choice(ctx['restaurants'])}",
+    "markets?location": lambda ctx, rnd: f"/api/v1/markets/?limit=20&location={rnd.choice(list(MUNICIPIOS))}",
+    "heritage?period": lambda ctx, rnd: f"/api/v1/heritage/?limit=20&period={rnd.choice(PERIODOS)}",
+    "heritage/{id}": lambda ctx, rnd: f"/api/v1/heritage/{rnd.choice(ctx['heritage'])}",
+    "catalog": lambda ctx, rnd: "/api/v1/catalog/?limit=20",
+    "catalog?pueblo": lambda ctx, rnd: f"/api/v1/catalog/?limit=20&pueblo={rnd.choice(list(MUNICIPIOS))}",
+    "categories": lambda ctx, rnd: "/api/v1/categories/?limit=20",
+    "categories/{id}/items": lambda ctx, rnd: f"/api/v1/categories/{rnd.choice(ctx['categories'])}/items?limit=20",
+    "reviews?item_id": lambda ctx, rnd: f"/api/v1/reviews/?limit=20&item_id={rnd.choice(ctx['items'])}",
+    "reviews/top": lambda ctx, rnd: f"/api/v1/reviews/top?tipo={rnd.choice(TIPOS_ITEM)}",
+    "nearby": lambda ctx, rnd: "/api/v1/nearby/?lat={:.4f}&lon={:.4f}&radius=3000".format(
+        *MUNICIPIOS[rnd.choice(list(MUNICIPIOS))]
+    ),
+    "search": lambda ctx, rnd: f"/api/v1/search/?q={rnd.choice(PLATOS).split()[0]}",
+    "users/me": lambda ctx, rnd: "/api/v1/users/me",
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+async def collect_ids(client, path, key="id"):
+    response = await client.get(path)
+    response.raise_for_status()
+    ids = [row[key] for row in response.json()]
+    if not ids:
+        raise SystemExit(f"{path} no devuelve datos; genera datos con benchmarks/seed.py")
+    return ids
+
+
+async def context(client, user):
+    """Ids reales para las rutas de detalle y cabeceras de autenticación."""
+    ctx = {
+        "playas": await collect_ids(client, "/api/v1/playas/?limit=100&fields=id"),
+        "food": await collect_ids(client, "/api/v1/food/?limit=100&fields=id"),
+        "restaurants": await collect_ids(client, "/api/v1/restaurants/?limit=100&fields=id"),
+        "heritage": await collect_ids(client, "/api/v1/heritage/?limit=100&fields=id"),
+        "categories": await collect_ids(client, "/api/v1/categories/?limit=100"),
+        "items": await collect_ids(client, "/api/v1/reviews/top?limit=100", "item_id"),
+    }
+    response = await client.post("/api/v1/users/token", data={"username": user, "password": SEED_PASSWORD})
+    response.raise_for_status()
+    ctx["headers"] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return ctx
+
+
+async def run_scenario(client, ctx, build, concurrency, duration, warmup, seed):
+    latencies = []
+    errors = 0
+    hits = 0
+    size = 0
+
+    async def worker(index, until, record):
+        nonlocal errors, hits, size
+        rnd = random.Random(seed * 1000 + index)
+        while time.perf_counter() < until:
+            path = build(ctx, rnd)
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=ctx["headers"])
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                response, ok = None, False
+            elapsed = (time.perf_counter() - start) * 1000
+            if not record:
+                continue
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+                continue
+            hits += response.headers.get("x-cache") == "HIT"
+            size += int(response.headers.get("content-length", len(response.content)))
+
+    if warmup > 0:
+        until = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(i, until, False) for i in range(concurrency)))
+    start = time.perf_counter()
+    until = start + duration
+    await asyncio.gather(*(worker(i, until, True) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    ok = len(latencies) - errors
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99), 2) if latencies else None,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+        "cache_hit_ratio": round(hits / ok, 3) if ok else None,
+        "avg_bytes": round(size / ok) if ok else None,
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Imprime la diferencia con `baseline` y devuelve los escenarios que empeoran."""
+    regressions = []
+    print(f"\n{'escenario':<30} {'p95 antes':>10} {'p95 ahora':>10} {'Δp95':>8} {'rps antes':>10} "
+          f"{'rps ahora':>10} {'Δrps':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("p95_ms") or not current.get("p95_ms"):
+            continue
+        p95_delta = current["p95_ms"] / previous["p95_ms"] - 1
+        rps_delta = current["rps"] / previous["rps"] - 1 if previous["rps"] else 0
+        worse = p95_delta > max_regression or rps_delta < -max_regression
+        if worse:
+            regressions.append(name)
+        print(f"{name:<30} {previous['p95_ms']:10.2f} {current['p95_ms']:10.2f} {p95_delta:+8.1%} "
+              f"{previous['rps']:10.1f} {current['rps']:10.1f} {rps_delta:+8.1%}{'  <-' if worse else ''}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args):
+    if args.in_process:
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    else:
+        transport = httpx.AsyncHTTPTransport(retries=0)
+        base_url = args.base_url
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"accept-encoding": "br, gzip"}
+    names = args.scenarios or list(SCENARIOS)
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits,
+                                 headers=headers, timeout=30) as client:
+        ctx = await context(client, args.user)
+        results = {}
+        print(f"{'escenario':<30} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errores':>8} {'caché':>6}")
+        for name in names:
+            result = await run_scenario(client, ctx, SCENARIOS[name], args.concurrency, args.duration,
+                                        args.warmup, args.seed)
+            results[name] = result
+            hit_ratio = f"{result['cache_hit_ratio']:.0%}" if result["cache_hit_ratio"] is not None else "-"
+            print(f"{name:<30} {result['rps']:8.1f} {result['p50_ms'] or 0:8.2f} {result['p95_ms'] or 0:8.2f} "
+                  f"{result['p99_ms'] or 0:8.2f} {result['errors']:8d} {hit_ratio:>6}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000", help="URL del servidor")
+    parser.add_argument("--in-process", action="store_true", help="Llamar a la aplicación sin red")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes simultáneos")
+    parser.add_argument("--duration", type=float, default=10, help="Segundos medidos por escenario")
+    parser.add_argument("--warmup", type=float, default=2, help="Segundos de calentamiento por escenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), help="Escenarios a lanzar")
+    parser.add_argument("--user", default="usuario0@mallorca.test", help="Usuario de /users/me")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de los parámetros aleatorios")
+    parser.add_argument("--output", help="Fichero JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Resultados JSON anteriores con los que comparar")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="Empeoramiento máximo admitido frente a --baseline (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "target": "in-process" if args.in_process else args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            sys.exit(f"\nEmpeoran más de un {args.max_regression:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Mide si una ráfaga de logins bloquea al resto de endpoints.
+
+Lanza en el mismo bucle de eventos que la aplicación `--logins` peticiones de
+login concurrentes mientras otra tarea pide `/api/v1/users/me` y `/` cada
+pocos milisegundos, y compara la latencia de esas peticiones con bcrypt en el
+propio bucle (como antes) y en el pool de hilos limitado.
+
+    DATABASE_URL=postgresql://.../bench_db python benchmarks/login_burst.py --logins 50
+
+Usa una base de datos desechable: el script escribe en ella.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from benchmarks.seed import upgrade_schema  # noqa: E402
+from routers import users  # noqa: E402
+
+EMAIL = "bench@mallorca.local"
+PASSWORD = "contraseña-de-prueba"
+
+
+async def inline_password_hash(func, *args):
+    # Comportamiento anterior: bcrypt directamente en el bucle de eventos
+    return func(*args)
+
+
+async def probe(client, token, stop, latencies, finished):
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        for url in ("/api/v1/users/me", "/"):
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            finished.append(time.perf_counter())
+            latencies.append((finished[-1] - start) * 1000)
+            assert response.status_code == 200, response.text
+        await asyncio.sleep(0.005)
+
+
+async def burst(client, logins, token):
+    latencies, finished = [], []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, token, stop, latencies, finished))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[
+        client.post("/api/v1/users/token", data={"username": EMAIL, "password": PASSWORD})
+        for _ in range(logins)
+    ])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await prober
+    assert all(response.status_code == 200 for response in responses)
+
+    # Con el bucle bloqueado las sondas ni siquiera empiezan: el hueco más largo
+    # entre dos respuestas mide cuánto tiempo estuvo parada la aplicación
+    gap = max((b - a) * 1000 for a, b in zip(finished, finished[1:]))
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, round(len(latencies) * 0.99))]
+    return logins / elapsed, len(latencies) / elapsed, statistics.median(latencies), p99, gap
+
+
+async def run(args):
+    # Se importa después de aplicar las migraciones
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/v1/users/", json={
+            "email": EMAIL, "full_name": "Bench", "password": PASSWORD,
+        })
+        assert response.status_code in (200, 400), response.text
+        response = await client.post("/api/v1/users/token", data={"username": EMAIL, "password": PASSWORD})
+        token = response.json()["access_token"]
+
+        print(f"{'modo':<12} {'logins/s':>9} {'sondas/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'parón ms':>9}")
+        original = users.run_password_hash
+        for label, hasher in (("en el bucle", inline_password_hash), ("hilos", original)):
+            users.run_password_hash = hasher
+            try:
+                rate, probes, p50, p99, gap = await burst(client, args.logins, token)
+            finally:
+                users.run_password_hash = original
+            print(f"{label:<12} {rate:9.1f} {probes:9.1f} {p50:8.2f} {p99:8.2f} {gap:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50, help="Logins concurrentes de la ráfaga")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Genera datos sintéticos con forma de Mallorca en todas las tablas.
+
+`--rows` es el número de filas de las tablas grandes (playas, platos,
+restaurantes, items); el resto se escala con `RATIOS`. Los datos son
+deterministas para una misma `--seed`, con municipios, zonas, coordenadas
+dentro de la isla y textos en castellano de longitud variable, de modo que
+los filtros, la búsqueda y /nearby devuelven resultados parecidos a los reales.
+
+    DATABASE_URL=postgresql://.../bench_db python benchmarks/seed.py --rows 100000
+
+Usa una base de datos desechable: el script escribe en ella.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import func, insert, select, text  # noqa: E402
+
+import models  # noqa: E402
+from database import engine  # noqa: E402
+
+# Filas por tabla respecto a --rows (con un mínimo para escalas pequeñas)
+RATIOS = {
+    "beaches": 1.0,
+    "food": 1.0,
+    "restaurants": 1.0,
+    "local_markets": 0.2,
+    "heritage_sites": 0.2,
+    "monuments": 0.2,
+    "items": 1.0,
+    "categories": 0.001,
+    "reviews": 3.0,
+    "users": 0.1,
+}
+MINIMUMS = {"categories": 10, "users": 10}
+
+SEED_PASSWORD = "mallorca"
+BATCH_SIZE = 5000
+
+MUNICIPIOS = {
+    "Palma": (39.5696, 2.6502), "Alcúdia": (39.8533, 3.1211), "Pollença": (39.8773, 3.0163),
+    "Sóller": (39.7667, 2.7150), "Deià": (39.7486, 2.6487), "Valldemossa": (39.7106, 2.6225),
+    "Andratx": (39.5753, 2.4201), "Calvià": (39.5658, 2.5062), "Santanyí": (39.3544, 3.1285),
+    "Ses Salines": (39.3380, 3.0530), "Campos": (39.4306, 3.0194), "Felanitx": (39.4697, 3.1479),
+    "Manacor": (39.5696, 3.2096), "Artà": (39.6939, 3.3497), "Capdepera": (39.7023, 3.4354),
+    "Son Servera": (39.6206, 3.3600), "Inca": (39.7211, 2.9109), "Sineu": (39.6428, 3.0108),
+    "Llucmajor": (39.4904, 2.8906), "Santa Ponça": (39.5087, 2.4766), "Porreres": (39.5147, 3.0214),
+    "Binissalem": (39.6873, 2.8436), "Fornalutx": (39.7825, 2.7411), "Muro": (39.7358, 3.0558),
+}
+ZONAS = ["Norte", "Sur", "Este", "Oeste", "Sureste", "Noreste", "Tramuntana", "Pla", "Llevant", "Migjorn"]
+SERVICIOS = ["parking", "duchas", "chiringuito", "socorrista", "hamacas", "accesible", "aseos",
+             "alquiler de kayak", "bandera azul", "perros permitidos"]
+ACCESOS = ["fácil", "a pie", "escaleras", "en barco", "camino de tierra"]
+PREFIJOS_PLAYA = ["Cala", "Platja de", "Caló des", "Platja d'", "Cala de"]
+NOMBRES_PLAYA = ["Mondragó", "Agulla", "Varques", "Llombards", "Formentor", "Es Trenc", "Sa Calobra",
+                 "Deià", "Figuera", "Torta", "Mesquida", "Millor", "Bóquer", "Tuent", "Estellencs"]
+CATEGORIAS = ["Repostería", "Embutido", "Plato principal", "Entrante", "Postre", "Sopa", "Arroz",
+              "Pescado", "Carne", "Verdura", "Bebida", "Pan"]
+PLATOS = ["Ensaimada", "Sobrasada", "Tumbet", "Frit mallorquí", "Arròs brut", "Pa amb oli", "Coca de trempó",
+          "Llom amb col", "Greixonera", "Panades", "Cocarrois", "Gató", "Robiols", "Sopes mallorquines",
+          "Caracoles", "Porcella", "Bunyols", "Herbes", "Crespells", "Caldereta de llagosta"]
+INGREDIENTES = ["harina", "manteca", "pimentón", "berenjena", "patata", "pimiento", "tomate de ramallet",
+                "aceite de oliva", "almendra", "sobrasada", "cerdo", "cordero", "arroz", "col", "ajo",
+                "huevo", "azúcar", "langosta", "hinojo", "alcaparras"]
+TIPOS_RESTAURANTE = ["Mallorquín", "Marinero", "Celler", "Cafetería", "Tapas", "Asador", "Fusión",
+                     "Italiano", "Japonés", "Vegetariano", "Pizzería", "Gastrobar"]
+ESPECIALIDADES = ["Arroz brut", "Pescado del día", "Frito mallorquín", "Cochinillo", "Caldereta",
+                  "Tapas variadas", "Cocina de mercado", "Paella", "Sushi", "Pizza al horno de leña"]
+PRECIOS = ["€", "€€", "€€€", "€€€€"]
+PERIODOS = ["Talayótico", "Romano", "Islámico", "Gótico", "Renacentista", "Barroco", "Modernista",
+            "Contemporáneo"]
+MONUMENTOS = ["Catedral", "Castillo", "Talayot", "Iglesia", "Convento", "Torre de defensa", "Molino",
+              "Palacio", "Ermita", "Muralla", "Lonja", "Santuario"]
+DIAS = ["L-V", "L-S", "Todos los días", "Martes a domingo", "Fines de semana"]
+HORARIOS = ["7:00-14:00", "8:00-13:30", "9:00-14:00", "10:00-17:00", "10:00-18:00", "17:00-22:00"]
+TIPOS_ITEM = ["Playa", "Plato", "Monumento", "Restaurante", "Mercado"]
+NOMBRES = ["Joan", "Maria", "Miquel", "Catalina", "Antoni", "Margalida", "Pere", "Francesca", "Tomeu",
+           "Aina", "Lucía", "Carlos", "Sofía", "Jaume", "Laura"]
+APELLIDOS = ["Ferrer", "Pons", "Vidal", "Mas", "Oliver", "Sastre", "Bauzà", "Serra", "Riera", "Rosselló"]
+FRASES = [
+    "Agua turquesa y arena fina entre pinos.",
+    "Ideal para ir en familia fuera de temporada alta.",
+    "Se recomienda llegar temprano en verano.",
+    "Vistas a la Serra de Tramuntana.",
+    "Receta tradicional que se prepara en las fiestas del pueblo.",
+    "Producto de kilómetro cero de los payeses de la zona.",
+    "Conserva elementos originales de la época.",
+    "Muy concurrido los días de mercado.",
+    "Cocina casera con productos de temporada.",
+    "Un clásico de la gastronomía mallorquina.",
+    "Rodeado de almendros y olivos centenarios.",
+    "Aparcamiento limitado en los meses de julio y agosto.",
+]
+COMENTARIOS = ["Espectacular", "Muy recomendable", "Demasiada gente en agosto", "Volveremos",
+               "Buena relación calidad-precio", "El servicio fue lento", "Imprescindible en Mallorca",
+               "Nada especial", "Precioso al atardecer", "Muy caro para lo que es"]
+
+
+def counts(rows):
+    return {
+        table: max(int(rows * ratio), MINIMUMS.get(table, 1))
+        for table, ratio in RATIOS.items()
+    }
+
+
+def place(rnd):
+    """Municipio y coordenadas cerca de su centro (unos pocos km alrededor)."""
+    municipio = rnd.choice(list(MUNICIPIOS))
+    lat, lon = MUNICIPIOS[municipio]
+    return municipio, round(lat + rnd.uniform(-0.04, 0.04), 6), round(lon + rnd.uniform(-0.05, 0.05), 6)
+
+
+def text_of(rnd, low=1, high=5):
+    return " ".join(rnd.sample(FRASES, rnd.randint(low, high)))
+
+
+def beach(rnd, i):
+    municipio, lat, lon = place(rnd)
+    return dict(
+        nombre=f"{rnd.choice(PREFIJOS_PLAYA)} {rnd.choice(NOMBRES_PLAYA)} {i}", descripcion=text_of(rnd),
+        imagen=f"https://img.mallorca.test/playas/{i}.jpg", zona=rnd.choice(ZONAS), pueblo=municipio,
+        tipo="Playa", servicios=rnd.sample(SERVICIOS, rnd.randint(0, 5)), acceso=rnd.choice(ACCESOS),
+        destacado=rnd.random() < 0.05, latitud=lat, longitud=lon, is_active=True,
+    )
+
+
+def food(rnd, i):
+    municipio, lat, lon = place(rnd)
+    return dict(
+        nombre=f"{rnd.choice(PLATOS)} {i}", categoria=rnd.choice(CATEGORIAS), descripcion=text_of(rnd),
+        ingredientes=rnd.sample(INGREDIENTES, rnd.randint(2, 7)),
+        imagen=f"https://img.mallorca.test/platos/{i}.jpg", preparacion=text_of(rnd, 2, 6),
+        donde_probar=municipio, latitud=lat, longitud=lon, is_active=True,
+    )
+
+
+def restaurant(rnd, i):
+    municipio, lat, lon = place(rnd)
+    return dict(
+        nombre=f"{rnd.choice(['Can', 'Ca na', 'Es', 'Sa', 'Celler'])} {rnd.choice(NOMBRES)} {i}",
+        ubicacion=municipio, especialidad=rnd.choice(ESPECIALIDADES), precio=rnd.choice(PRECIOS),
+        reserva=rnd.random() < 0.4, url=f"https://restaurante-{i}.mallorca.test/",
+        tipo=rnd.choice(TIPOS_RESTAURANTE), descripcion=text_of(rnd), horario=rnd.choice(HORARIOS),
+        telefono=f"971{rnd.randint(100000, 999999)}", imagen=f"https://img.mallorca.test/restaurantes/{i}.jpg",
+        latitud=lat, longitud=lon, is_active=True,
+    )
+
+
+def market(rnd, i):
+    municipio, lat, lon = place(rnd)
+    return dict(
+        name=f"Mercat de {municipio} {i}", location=municipio, address=f"Plaça Major {rnd.randint(1, 40)}",
+        google_maps_url=f"https://maps.google.com/?q={lat},{lon}", days=rnd.choice(DIAS),
+        hours=rnd.choice(HORARIOS), description=text_of(rnd), image=f"https://img.mallorca.test/mercados/{i}.jpg",
+        latitude=lat, longitude=lon, is_active=True,
+    )
+
+
+def heritage(rnd, i):
+    municipio, lat, lon = place(rnd)
+    return dict(
+        name=f"{rnd.choice(MONUMENTOS)} de {municipio} {i}", description=text_of(rnd, 2, 6),
+        period=rnd.choice(PERIODOS), highlight=rnd.choice(FRASES), schedule=rnd.choice(HORARIOS),
+        open_days=rnd.choice(DIAS), image=f"https://img.mallorca.test/patrimonio/{i}.jpg",
+        address=f"Carrer de {rnd.choice(APELLIDOS)} {rnd.randint(1, 80)}, {municipio}",
+        google_maps_url=f"https://maps.google.com/?q={lat},{lon}", latitude=lat, longitude=lon,
+        entrance_fee=rnd.choice([None, "Gratuita", "5 €", "10 €"]), guided_tours=rnd.random() < 0.3,
+        is_active=True,
+    )
+
+
+def monument(rnd, i):
+    municipio, lat, lon = place(rnd)
+    return dict(
+        nombre=f"{rnd.choice(MONUMENTOS)} de {municipio} {i}", descripcion=text_of(rnd),
+        epoca=rnd.choice(PERIODOS), destacado=rnd.choice(FRASES), horario=rnd.choice(HORARIOS),
+        imagen=f"https://img.mallorca.test/monumentos/{i}.jpg", latitud=lat, longitud=lon,
+    )
+
+
+def item(rnd, i):
+    municipio, _, _ = place(rnd)
+    tipo = rnd.choice(TIPOS_ITEM)
+    return dict(
+        nombre=f"{tipo} {municipio} {i}", imagen=f"https://img.mallorca.test/items/{i}.jpg",
+        descripcion=text_of(rnd), zona=rnd.choice(ZONAS), pueblo=municipio, tipo=tipo,
+        servicios=",".join(rnd.sample(SERVICIOS, 2)) if tipo == "Playa" else None,
+        destacado=rnd.random() < 0.05, categoria=rnd.choice(CATEGORIAS) if tipo == "Plato" else None,
+        is_active=True,
+    )
+
+
+def category(rnd, i):
+    return dict(name=f"{rnd.choice(TIPOS_ITEM)}s de {rnd.choice(list(MUNICIPIOS))} {i}",
+                description=rnd.choice(FRASES))
+
+
+def user(rnd, i, hashed_password):
+    nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}"
+    return dict(email=f"usuario{i}@mallorca.test", full_name=nombre, hashed_password=hashed_password,
+                is_active=True)
+
+
+def insert_rows(table, total, make, label):
+    """Inserta `total` filas por lotes; `make(i)` devuelve una fila o una lista de filas."""
+    start = time.perf_counter()
+    inserted = 0
+    with engine.begin() as conn:
+        for offset in range(0, total, BATCH_SIZE):
+            batch = []
+            for i in range(offset, min(offset + BATCH_SIZE, total)):
+                row = make(i)
+                batch.extend(row if isinstance(row, list) else [row])
+            conn.execute(insert(table), batch)
+            inserted += len(batch)
+    print(f"  {label:<22} {inserted:>10} filas  {time.perf_counter() - start:7.1f}s")
+
+
+def seed(rows, seed_value=42):
+    """Llena todas las tablas; devuelve el número de filas de cada una."""
+    from projection import rebuild_catalog
+    from recompute_ratings import recompute_ratings
+    from routers.users import get_password_hash
+
+    rnd = random.Random(seed_value)
+    n = counts(rows)
+    # Un único hash: todos los usuarios comparten SEED_PASSWORD
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    generators = [
+        (models.Beach.__table__, beach),
+        (models.Food.__table__, food),
+        (models.Restaurant.__table__, restaurant),
+        (models.LocalMarket.__table__, market),
+        (models.Heritage.__table__, heritage),
+        (models.Monument.__table__, monument),
+        (models.Item.__table__, item),
+        (models.Category.__table__, category),
+    ]
+    for table, make in generators:
+        insert_rows(table, n[table.name], lambda i, make=make: make(rnd, i), table.name)
+    insert_rows(models.User.__table__, n["users"], lambda i: user(rnd, i, hashed_password), "users")
+
+    # Cada item en 1-3 categorías, sin repetir par (clave primaria)
+    insert_rows(models.category_association, n["items"], lambda i: [
+        dict(category_id=category_id, item_id=i + 1)
+        for category_id in rnd.sample(range(1, n["categories"] + 1), rnd.randint(1, 3))
+    ], "category_association")
+
+    # Reseñas con más peso en los primeros items: unos pocos concentran muchas
+    insert_rows(models.Review.__table__, n["reviews"], lambda i: dict(
+        item_id=min(int(rnd.paretovariate(1.2)), n["items"]) if rnd.random() < 0.3
+        else rnd.randint(1, n["items"]),
+        rating=rnd.choices([1, 2, 3, 4, 5], weights=[5, 7, 15, 35, 38])[0],
+        comment=rnd.choice(COMENTARIOS),
+    ), "reviews")
+
+    # Agregados de valoración coherentes con las reseñas insertadas
+    recompute_ratings()
+    # Los recursos se insertan sin pasar por los routers: se proyectan al final
+    rebuild_catalog()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return n
+
+
+def upgrade_schema():
+    """Aplica las migraciones desde cualquier directorio (script_location del .ini es relativo)."""
+    alembic_cfg = Config(str(ROOT / "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(alembic_cfg, "head")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Filas de las tablas grandes (1k a 10M)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(models.Beach)).scalar():
+            sys.exit("La base de datos ya tiene datos; usa una base de datos vacía")
+
+    start = time.perf_counter()
+    seed(args.rows, args.seed)
+    print(f"Datos generados en {time.perf_counter() - start:.1f}s; usuarios usuarioN@mallorca.test, "
+          f"contraseña {SEED_PASSWORD!r}")
+
+
+if __name__ == "__main__":
+    main()
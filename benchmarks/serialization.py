@@ -0,0 +1,119 @@
+"""Compara la serialización de los listados con y sin FAST_SERIALIZATION.
+
+Llama a los routers del catálogo en proceso (sin la caché de respuestas) y
+mide por petición la latencia p50/p99 y el tiempo de CPU del proceso, con el
+response_model de Pydantic y con el camino rápido de tuplas + orjson.
+
+    DATABASE_URL=postgresql://.../bench_db python benchmarks/serialization.py --limits 100 1000
+
+Usa una base de datos desechable: el script escribe en ella.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+
+import fields  # noqa: E402
+import models  # noqa: E402
+from benchmarks.seed import upgrade_schema  # noqa: E402
+from database import engine  # noqa: E402
+from routers import heritage, markets, playas, restaurants  # noqa: E402
+
+RESOURCES = {
+    "playas": playas.router,
+    "restaurants": restaurants.router,
+    "markets": markets.router,
+    "heritage": heritage.router,
+}
+
+
+def seed(rows):
+    batch = 5000
+
+    def fill(table, make):
+        with engine.begin() as conn:
+            for start in range(0, rows, batch):
+                conn.execute(insert(table), [make(i) for i in range(start, min(start + batch, rows))])
+
+    # URLs ya normalizadas, como las guardan los routers con str(HttpUrl)
+    fill(models.Beach.__table__, lambda i: dict(
+        nombre=f"Playa {i:07d}", pueblo="Campos", zona="Sur", descripcion="Arena blanca y agua turquesa",
+        imagen="https://example.com/playa.jpg", tipo="Playa", servicios=["parking", "duchas"],
+        acceso="fácil", destacado=i % 20 == 0, latitud=39.3 + i * 1e-5, longitud=3.0, is_active=True,
+    ))
+    fill(models.Restaurant.__table__, lambda i: dict(
+        nombre=f"Restaurante {i:07d}", ubicacion="Palma", especialidad="Arroz brut", precio="€€",
+        reserva=True, tipo="Mallorquín", url=f"https://example.com/r/{i}", latitud=39.57, longitud=2.65,
+        is_active=True,
+    ))
+    fill(models.LocalMarket.__table__, lambda i: dict(
+        name=f"Mercado {i:07d}", location="Palma", address="Plaça de l'Olivar",
+        google_maps_url=f"https://maps.google.com/?q={i}", days="L-S", hours="7:00-14:00",
+        description="Mercado municipal", latitude=39.57, longitude=2.65, is_active=True,
+    ))
+    fill(models.Heritage.__table__, lambda i: dict(
+        name=f"Monumento {i:07d}", description="Catedral gótica", period="Gótico", highlight="Rosetón",
+        schedule="10:00-17:00", open_days="L-S", image="https://example.com/m.jpg", address="Palma",
+        google_maps_url=f"https://maps.google.com/?q=m{i}", latitude=39.567, longitude=2.648, is_active=True,
+    ))
+
+
+def measure(client, url, repeat):
+    latencies, cpu = [], []
+    for _ in range(repeat):
+        wall, proc = time.perf_counter(), time.process_time()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - wall) * 1000)
+        cpu.append((time.process_time() - proc) * 1000)
+        assert response.status_code == 200, response.text
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, round(len(latencies) * 0.99))]
+    return statistics.median(latencies), p99, statistics.mean(cpu), len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Filas por tabla")
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 1000], help="Tamaños de página")
+    parser.add_argument("--repeat", type=int, default=200, help="Peticiones por caso")
+    parser.add_argument("--skip-seed", action="store_true", help="Reutilizar los datos existentes")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    if not args.skip_seed:
+        with engine.connect() as conn:
+            if conn.execute(select(func.count()).select_from(models.Beach)).scalar():
+                sys.exit("La base de datos ya tiene datos; usa una base de datos vacía o --skip-seed")
+        seed(args.rows)
+
+    # App sin middlewares: se mide el router, no la caché de respuestas
+    app = FastAPI()
+    for name, router in RESOURCES.items():
+        app.include_router(router, prefix=f"/api/v1/{name}")
+
+    print(f"{'caso':<28} {'modo':<9} {'p50 ms':>8} {'p99 ms':>8} {'CPU ms':>8} {'bytes':>9}")
+    with TestClient(app) as client:
+        for name in RESOURCES:
+            for limit in args.limits:
+                url = f"/api/v1/{name}/?limit={limit}"
+                results = {}
+                for label, fast in (("pydantic", False), ("orjson", True)):
+                    fields.FAST_SERIALIZATION = fast
+                    measure(client, url, 5)  # calentamiento
+                    results[label] = measure(client, url, args.repeat)
+                    p50, p99, cpu, size = results[label]
+                    print(f"{name + f'?limit={limit}':<28} {label:<9} {p50:8.2f} {p99:8.2f} {cpu:8.2f} {size:9d}")
+                speedup = results["pydantic"][2] / results["orjson"][2]
+                print(f"{'':<28} {'CPU x':<9} {speedup:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
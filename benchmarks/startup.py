@@ -0,0 +1,81 @@
+"""Mide el arranque de la aplicación: de importar `main` a la primera respuesta.
+
+Cada medida se hace en un proceso nuevo, como al lanzar un worker, y separa
+el import, el lifespan (calentamiento incluido), la primera petición sin base
+de datos (`/`) y la primera consulta a un listado. Compara el arranque sin
+conexiones, con `DB_CREATE_ALL` (como antes, create_all al arrancar) y con
+`STARTUP_WARMUP`.
+
+    DATABASE_URL=postgresql://.../mallorca_db python benchmarks/startup.py --runs 10
+
+La base de datos debe estar migrada; el script aplica `alembic upgrade head`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "alembic": {},
+    "create_all": {"DB_CREATE_ALL": "true"},
+    "warmup": {"STARTUP_WARMUP": "true"},
+}
+PHASES = ("import", "lifespan", "first_response", "first_query")
+
+
+def child():
+    # Se ejecuta en el proceso medido
+    start = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    from main import app
+    from fastapi.testclient import TestClient
+
+    timings = {"import": time.perf_counter() - start}
+    client = TestClient(app)
+    client.__enter__()
+    timings["lifespan"] = time.perf_counter() - start
+    assert client.get("/").status_code == 200
+    timings["first_response"] = time.perf_counter() - start
+    assert client.get("/api/v1/playas/?limit=20").status_code == 200
+    timings["first_query"] = time.perf_counter() - start
+    client.__exit__(None, None, None)
+    print(json.dumps({phase: value * 1000 for phase, value in timings.items()}))
+
+
+def measure(env, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"], env={**os.environ, **env},
+            cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {phase: statistics.median(result[phase] for result in results) for phase in PHASES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Arranques por modo")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, check=True,
+                   capture_output=True)
+    print("Milisegundos desde el inicio del proceso (mediana)")
+    print(f"{'modo':<12}" + "".join(f"{phase:>16}" for phase in PHASES))
+    for mode, env in MODES.items():
+        timings = measure(env, args.runs)
+        print(f"{mode:<12}" + "".join(f"{timings[phase]:16.1f}" for phase in PHASES))
+
+
+if __name__ == "__main__":
+    main()
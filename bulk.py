@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+import models
+from projection import sync_catalog
+
+# Clave natural de cada recurso: identifica la fila en los upserts
+NATURAL_KEYS = {
+    models.Beach: ("nombre", "pueblo"),
+    models.Food: ("nombre",),
+    models.Restaurant: ("nombre", "ubicacion"),
+    models.LocalMarket: ("name", "location"),
+    models.Heritage: ("name",),
+}
+
+# Columnas que un upsert nunca sobrescribe
+_PRESERVED_COLUMNS = {"id", "created_at"}
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "50000"))
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class BulkRowResult(BaseModel):
+    index: int
+    status: str  # "ok" o "error"
+    id: Optional[int] = None
+    changed: Optional[bool] = None  # False si la fila ya tenía esos datos
+    errors: Optional[list] = None
+
+
+class BulkResult(BaseModel):
+    total: int
+    ok: int
+    errors: int
+    results: List[BulkRowResult]
+
+
+def content_hash(row):
+    """Huella estable de los datos de una fila (sin la propia huella)."""
+    data = {key: value for key, value in row.items() if key != "content_hash"}
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def hash_rows(rows):
+    for row in rows:
+        row["content_hash"] = content_hash(row)
+    return rows
+
+
+def upsert_statement(model, dialect_name, returning=True):
+    """INSERT ... ON CONFLICT (clave natural) DO UPDATE solo si cambia la huella.
+
+    Las filas sin cambios no se reescriben (ni se mueve `updated_at`). Con
+    `returning` devuelve id y clave natural de las filas insertadas o
+    actualizadas, es decir, solo de las que han cambiado.
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    keys = NATURAL_KEYS[model]
+    stmt = insert(model)
+    update = {
+        column.name: stmt.excluded[column.name]
+        for column in model.__table__.columns
+        if column.name not in keys and column.name not in _PRESERVED_COLUMNS
+    }
+    if "updated_at" in update:
+        update["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_=update,
+        where=model.content_hash.is_distinct_from(stmt.excluded.content_hash),
+    )
+    if returning:
+        stmt = stmt.returning(model.id, *(getattr(model, key) for key in keys))
+    return stmt
+
+
+def dedupe_rows(model, rows):
+    """Agrupa filas con la misma clave natural (gana la última).
+
+    Devuelve las filas únicas y, para cada fila original, la posición de su
+    fila única. Un mismo INSERT ... ON CONFLICT no puede tocar dos veces la
+    misma fila.
+    """
+    keys = NATURAL_KEYS[model]
+    positions = {}
+    unique = []
+    mapping = []
+    for row in rows:
+        key = tuple(row.get(k) for k in keys)
+        if key in positions:
+            unique[positions[key]] = row
+        else:
+            positions[key] = len(unique)
+            unique.append(row)
+        mapping.append(positions[key])
+    return unique, mapping
+
+
+async def upsert_rows(db, model, rows):
+    """Upsert multi-fila de filas únicas; devuelve {clave natural: id} de las que cambiaron.
+
+    Las filas que cambian se proyectan también en el catálogo (projection.py).
+    """
+    stmt = upsert_statement(model, db.bind.dialect.name)
+    result = await db.execute(stmt, hash_rows(rows))
+    changed = {tuple(row[1:]): row[0] for row in result.all()}
+    await sync_catalog(db, model, list(changed.values()))
+    return changed
+
+
+async def write_batch(db, model, rows):
+    """Escribe un lote con un único upsert multi-fila.
+
+    Devuelve, por cada fila, su id y si ha cambiado.
+    """
+    if not rows:
+        return []
+    keys = NATURAL_KEYS[model]
+    unique, mapping = dedupe_rows(model, rows)
+    changed = await upsert_rows(db, model, unique)
+
+    ids = dict(changed)
+    missing = [key for key in (tuple(row[k] for k in keys) for row in unique) if key not in ids]
+    if missing:
+        # Filas sin cambios: el upsert no las devuelve y se busca su id
+        columns = [getattr(model, key) for key in keys]
+        query = select(model.id, *columns).where(tuple_(*columns).in_(missing))
+        ids.update({tuple(row[1:]): row[0] for row in (await db.execute(query)).all()})
+
+    results = []
+    for position in mapping:
+        key = tuple(unique[position][k] for k in keys)
+        results.append((ids[key], key in changed))
+    return results
+
+
+async def iter_records(request):
+    """Registros del cuerpo: array JSON o NDJSON leído en streaming."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_MEDIA_TYPES:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_json(line)
+        if buffer.strip():
+            yield _parse_json(buffer)
+        return
+
+    records = _parse_json(await request.body())
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Se esperaba un array JSON o NDJSON")
+    for record in records:
+        yield record
+
+
+def _parse_json(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="JSON inválido en el cuerpo de la petición")
+
+
+async def bulk_upsert(request, db, model, schema):
+    """Valida y escribe por lotes los registros de la petición en una transacción."""
+    results = []
+    batch = []
+    batch_indexes = []
+
+    async def flush():
+        written = await write_batch(db, model, batch)
+        for index, (row_id, changed) in zip(batch_indexes, written):
+            results[index] = BulkRowResult(index=index, status="ok", id=row_id, changed=changed)
+        batch.clear()
+        batch_indexes.clear()
+
+    try:
+        async for record in iter_records(request):
+            index = len(results)
+            if index >= BULK_MAX_ROWS:
+                raise HTTPException(
+                    status_code=413, detail=f"Máximo {BULK_MAX_ROWS} registros por petición"
+                )
+            try:
+                row = schema.model_validate(record).model_dump(mode="json")
+            except ValidationError as e:
+                results.append(BulkRowResult(
+                    index=index, status="error",
+                    errors=e.errors(include_url=False, include_context=False, include_input=False)
+                ))
+                continue
+
+            results.append(None)
+            batch.append(row)
+            batch_indexes.append(index)
+            if len(batch) >= BULK_BATCH_SIZE:
+                await flush()
+
+        await flush()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Conflicto de integridad: {e.orig}")
+
+    ok = sum(1 for result in results if result.status == "ok")
+    return BulkResult(total=len(results), ok=ok, errors=len(results) - ok, results=results)
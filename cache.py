@@ -0,0 +1,338 @@
+import json
+import logging
+import os
+import time
+from urllib.parse import parse_qsl, urlencode
+
+import anyio
+from dotenv import load_dotenv
+
+from compression import (
+    CACHED_COMPRESSION, ENCODINGS, compress, decompress, encoded_headers, is_compressible,
+    request_encodings,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "redis://host:6379/0" para la caché compartida, "memory://" para una caché
+# local en memoria (desarrollo y tests, sin servidor Redis)
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+CACHE_PREFIX = "cache"
+
+# Recursos cacheados: prefijo de ruta -> (etiqueta, TTL en segundos)
+CACHED_RESOURCES = {
+    "/api/v1/playas": ("playas", int(os.getenv("CACHE_TTL_PLAYAS", "300"))),
+    "/api/v1/food": ("food", int(os.getenv("CACHE_TTL_FOOD", "600"))),
+    "/api/v1/restaurants": ("restaurants", int(os.getenv("CACHE_TTL_RESTAURANTS", "300"))),
+    "/api/v1/markets": ("markets", int(os.getenv("CACHE_TTL_MARKETS", "900"))),
+    "/api/v1/heritage": ("heritage", int(os.getenv("CACHE_TTL_HERITAGE", "3600"))),
+}
+
+# Métodos que modifican un recurso e invalidan su caché (OPTIONS, como las
+# peticiones preflight de CORS, no)
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Cabeceras de respuesta que no se guardan en caché
+_SKIPPED_HEADERS = {b"content-length", b"set-cookie", b"x-cache"}
+
+
+class MemoryBackend:
+    """Caché en memoria del proceso con la misma interfaz que RedisBackend."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._tags = {}
+
+    def _discard(self, key):
+        """Borra una entrada y la quita de los sets de sus etiquetas."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._discard(key)
+            return None
+        return value
+
+    async def set(self, key, value, ttl, tags):
+        # Una clave que se reescribe pasa al final, con sus etiquetas nuevas
+        self._discard(key)
+        if len(self._entries) >= self.max_entries:
+            # Se descarta la entrada más antigua
+            self._discard(next(iter(self._entries)))
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+    async def invalidate(self, tags):
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._discard(key)
+
+    async def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+
+
+class RedisBackend:
+    """Caché compartida entre workers sobre Redis.
+
+    Cada etiqueta es un set con las claves que dependen de ella; invalidar una
+    etiqueta borra en un solo script Lua todas sus claves y el propio set.
+    """
+
+    _INVALIDATE_SCRIPT = """
+    for _, tag in ipairs(KEYS) do
+        local keys = redis.call('SMEMBERS', tag)
+        for i = 1, #keys, 500 do
+            redis.call('DEL', unpack(keys, i, math.min(i + 499, #keys)))
+        end
+        redis.call('DEL', tag)
+    end
+    return 1
+    """
+
+    def __init__(self, url):
+        from redis import asyncio as aioredis
+
+        self.client = aioredis.from_url(url)
+        self._invalidate = self.client.register_script(self._INVALIDATE_SCRIPT)
+
+    def _tag_key(self, tag):
+        return f"{CACHE_PREFIX}:tag:{tag}"
+
+    async def get(self, key):
+        return await self.client.get(key)
+
+    async def set(self, key, value, ttl, tags):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), key)
+                pipe.expire(self._tag_key(tag), ttl)
+            await pipe.execute()
+
+    async def invalidate(self, tags):
+        await self._invalidate(keys=[self._tag_key(tag) for tag in tags])
+
+    async def clear(self):
+        async for key in self.client.scan_iter(match=f"{CACHE_PREFIX}:*"):
+            await self.client.delete(key)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if CACHE_URL.startswith("memory://"):
+            _backend = MemoryBackend()
+        else:
+            _backend = RedisBackend(CACHE_URL)
+    return _backend
+
+
+async def invalidate(*tags):
+    """Invalida todas las respuestas cacheadas con alguna de las etiquetas."""
+    try:
+        await get_backend().invalidate(tags)
+    except Exception:
+        logger.exception("No se pudo invalidar la caché para %s", tags)
+
+
+def match_resource(path):
+    for prefix, resource in CACHED_RESOURCES.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return resource
+    return None
+
+
+def row_tag(tag, row_id):
+    return f"{tag}:{row_id}"
+
+
+def list_tag(tag):
+    return f"{tag}:list"
+
+
+def response_tags(path, tag):
+    """Etiquetas de una respuesta: la del recurso y la de su fila o la de listados.
+
+    Invalidar la etiqueta del recurso borra todo; las de fila y listado permiten
+    invalidar solo lo que ha cambiado.
+    """
+    last = path.rstrip("/").rsplit("/", 1)[-1]
+    if last.isdigit():
+        return [tag, row_tag(tag, last)]
+    return [tag, list_tag(tag)]
+
+
+def cache_key(path, query_string):
+    # Los parámetros se ordenan para que ?a=1&b=2 y ?b=2&a=1 compartan entrada
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    return f"{CACHE_PREFIX}:resp:{path}?{urlencode(params)}"
+
+
+def _dump(status, headers, variants):
+    # Cabecera JSON y, detrás, los cuerpos de cada codificación concatenados
+    meta = json.dumps({
+        "status": status,
+        "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers],
+        "variants": [[encoding, len(body)] for encoding, body in variants],
+    }).encode("utf-8")
+    return meta + b"\n" + b"".join(body for _, body in variants)
+
+
+def _load(value):
+    meta, body = value.split(b"\n", 1)
+    meta = json.loads(meta)
+    headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in meta["headers"]]
+    variants = []
+    offset = 0
+    # Las entradas anteriores a la compresión guardan solo el cuerpo sin comprimir
+    for encoding, length in meta.get("variants", [["identity", len(body)]]):
+        variants.append((encoding, body[offset:offset + length]))
+        offset += length
+    return meta["status"], headers, variants
+
+
+def cached_variants(headers, body):
+    """Cuerpos a guardar: uno por codificación si merece comprimirse, si no el original.
+
+    Se comprime una sola vez al guardar, con los niveles altos de
+    CACHED_COMPRESSION; los aciertos de caché no gastan CPU en comprimir y los
+    clientes sin compresión reciben el gzip descomprimido. Es trabajo de CPU
+    bloqueante: el middleware lo ejecuta en un hilo.
+    """
+    if not is_compressible(headers, body, CACHED_COMPRESSION):
+        return [("identity", body)]
+    return [(encoding, compress(body, encoding, CACHED_COMPRESSION)) for encoding in ENCODINGS]
+
+
+def choose_variant(scope, headers, variants):
+    """Cuerpo y cabeceras de la variante que mejor acepta el cliente."""
+    available = dict(variants)
+    if "identity" in available:
+        body = available["identity"]
+        return body, headers + [(b"content-length", str(len(body)).encode("latin-1"))]
+    for encoding in request_encodings(scope):
+        if encoding in available:
+            return available[encoding], encoded_headers(headers, encoding, available[encoding])
+    encoding, body = variants[-1]
+    body = decompress(body, encoding)
+    return body, encoded_headers(headers, None, body)
+
+
+class ResponseCacheMiddleware:
+    """Caché de respuestas GET de los recursos del catálogo.
+
+    Las respuestas 200 se guardan por ruta y parámetros normalizados con el
+    TTL de su recurso. Las escrituras (POST/PUT/PATCH/DELETE) que terminan
+    bien invalidan la etiqueta del recurso antes de enviar la respuesta, de
+    modo que el cliente que escribe ya no puede leer datos antiguos.
+
+    Las respuestas grandes se guardan ya comprimidas con gzip y brotli
+    (`cached_variants`) y cada acierto sirve la variante que acepta el cliente.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        resource = match_resource(scope["path"])
+        # Las peticiones perfiladas (profiler.py) miden el trabajo real, no un acierto
+        if resource is None or scope["method"] == "HEAD" or (scope["method"] == "GET" and scope.get("profiling")):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "GET":
+            await self._serve_cached(scope, receive, send, resource)
+        elif scope["method"] in WRITE_METHODS:
+            await self._invalidate_on_write(scope, receive, send, resource)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _serve_cached(self, scope, receive, send, resource):
+        tag, ttl = resource
+        key = cache_key(scope["path"], scope["query_string"])
+        backend = get_backend()
+
+        try:
+            cached = await backend.get(key)
+        except Exception:
+            logger.exception("Error leyendo la caché")
+            cached = None
+
+        if cached is not None:
+            status, headers, variants = _load(cached)
+            body, headers = choose_variant(scope, headers, variants)
+            await send({"type": "http.response.start", "status": status,
+                        "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start = None
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] == 200:
+                    # Las respuestas 200 se guardan completas antes de enviarlas
+                    start = message
+                    return
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [(b"x-cache", b"MISS")]
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                headers = [
+                    (k, v) for k, v in start.get("headers", [])
+                    if k.lower() not in _SKIPPED_HEADERS
+                ]
+                # brotli y gzip a nivel alto tardan decenas de ms en listados grandes:
+                # fuera del bucle de eventos para no frenar las demás peticiones
+                variants = await anyio.to_thread.run_sync(cached_variants, headers, b"".join(chunks))
+                try:
+                    await backend.set(key, _dump(200, headers, variants), ttl,
+                                      response_tags(scope["path"], tag))
+                except Exception:
+                    logger.exception("Error escribiendo en la caché")
+                headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"content-length"]
+                body, headers = choose_variant(scope, headers, variants)
+                await send(dict(start, headers=headers + [(b"x-cache", b"MISS")]))
+                message = {"type": "http.response.body", "body": body}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _invalidate_on_write(self, scope, receive, send, resource):
+        tag, _ = resource
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await invalidate(tag)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
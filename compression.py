@@ -0,0 +1,167 @@
+import gzip
+import os
+
+import brotli
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Compresión por defecto de las respuestas que se comprimen en cada petición:
+# niveles bajos, porque se pagan en CPU cada vez
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Las respuestas que guarda la caché (cache.cached_variants) se comprimen una
+# sola vez al guardarlas, fuera del bucle de eventos, así que compensa un nivel
+# más alto. No se usan para nada que se comprima en cada petición
+COMPRESSION_CACHED_GZIP_LEVEL = int(os.getenv("COMPRESSION_CACHED_GZIP_LEVEL", "9"))
+COMPRESSION_CACHED_BROTLI_QUALITY = int(os.getenv("COMPRESSION_CACHED_BROTLI_QUALITY", "9"))
+
+# Tamaño mínimo en bytes y niveles gzip/brotli; None desactiva la compresión
+DEFAULT_COMPRESSION = (COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY)
+CACHED_COMPRESSION = (COMPRESSION_MIN_SIZE, COMPRESSION_CACHED_GZIP_LEVEL, COMPRESSION_CACHED_BROTLI_QUALITY)
+
+# Prefijo de ruta -> configuración de compresión por petición (las demás rutas
+# usan DEFAULT_COMPRESSION)
+ROUTE_COMPRESSION = {
+    # Las respuestas de salud son pequeñas y se piden muy a menudo
+    "/health": None,
+}
+
+# Codificaciones soportadas, en orden de preferencia a igual q
+ENCODINGS = ("br", "gzip")
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def route_compression(path):
+    for prefix, config in ROUTE_COMPRESSION.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return config
+    return DEFAULT_COMPRESSION
+
+
+def accepted_encodings(accept_encoding):
+    """Codificaciones de `ENCODINGS` aceptadas por el cliente, de mayor a menor q."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    accepted = []
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0:
+            accepted.append((q, encoding))
+    # sorted es estable: a igual q se mantiene el orden de ENCODINGS
+    return [encoding for _, encoding in sorted(accepted, key=lambda item: -item[0])]
+
+
+def request_encodings(scope):
+    for key, value in scope.get("headers", []):
+        if key == b"accept-encoding":
+            return accepted_encodings(value.decode("latin-1"))
+    return []
+
+
+def compress(body, encoding, config):
+    _, gzip_level, brotli_quality = config
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def decompress(body, encoding):
+    if encoding == "br":
+        return brotli.decompress(body)
+    return gzip.decompress(body)
+
+
+def is_compressible(headers, body, config):
+    """Si una respuesta completa merece comprimirse con `config`."""
+    if config is None or len(body) < config[0]:
+        return False
+    content_type = b""
+    for key, value in headers:
+        key = key.lower()
+        if key == b"content-encoding":
+            return False
+        if key == b"content-type":
+            content_type = value
+    return content_type.decode("latin-1").startswith(_COMPRESSIBLE_TYPES)
+
+
+def encoded_headers(headers, encoding, body):
+    """Cabeceras de una respuesta con `body` codificado con `encoding` (None si va sin comprimir)."""
+    vary = [v for k, v in headers if k.lower() == b"vary"]
+    headers = [
+        (k, v) for k, v in headers
+        if k.lower() not in (b"content-length", b"content-encoding", b"vary")
+    ]
+    headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+    if encoding is not None:
+        headers.append((b"content-encoding", encoding.encode("latin-1")))
+    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    return headers
+
+
+class CompressionMiddleware:
+    """Compresión gzip/brotli negociada con Accept-Encoding.
+
+    Comprime las respuestas completas que superan el tamaño mínimo de su ruta
+    (`ROUTE_COMPRESSION`). Las que ya llegan con Content-Encoding, como las que
+    sirve la caché precomprimidas, y las respuestas en streaming pasan sin tocar.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        config = route_compression(scope["path"])
+        encodings = request_encodings(scope)
+        if config is None or not encodings:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            if streaming or message.get("more_body", False):
+                # Respuesta en streaming: se envía tal cual
+                if not streaming:
+                    streaming = True
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = list(start.get("headers", []))
+            if is_compressible(headers, body, config):
+                encoding = encodings[0]
+                body = compress(body, encoding, config)
+                headers = encoded_headers(headers, encoding, body)
+            await send(dict(start, headers=headers))
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
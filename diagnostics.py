@@ -0,0 +1,167 @@
+"""Modo de diagnóstico: consultas lentas con su plan y detección de N+1.
+
+Desactivado por defecto (DIAGNOSTICS_ENABLED). Activado, los hooks de los
+motores de database.py pasan cada sentencia por `record_query`:
+
+- Las que superan SLOW_QUERY_MS se registran con la ruta, los parámetros y
+  su plan (`EXPLAIN (ANALYZE, BUFFERS)` en PostgreSQL, `EXPLAIN QUERY PLAN`
+  en SQLite), capturado como mucho una vez por forma de sentencia cada
+  DIAGNOSTICS_EXPLAIN_INTERVAL segundos. Solo se explican los SELECT, porque
+  ANALYZE vuelve a ejecutar la sentencia.
+- Las peticiones que ejecutan la misma forma de sentencia (con los valores
+  sustituidos por parámetros) más de NPLUS1_THRESHOLD veces se marcan como N+1.
+
+Todo se escribe en un fichero rotativo local (DIAGNOSTICS_LOG_FILE). Los
+parámetros pueden contener datos personales: no activarlo sin motivo.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DIAGNOSTICS_ENABLED = os.getenv("DIAGNOSTICS_ENABLED", "false").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+NPLUS1_THRESHOLD = int(os.getenv("NPLUS1_THRESHOLD", "10"))
+DIAGNOSTICS_EXPLAIN = os.getenv("DIAGNOSTICS_EXPLAIN", "true").lower() == "true"
+DIAGNOSTICS_EXPLAIN_INTERVAL = float(os.getenv("DIAGNOSTICS_EXPLAIN_INTERVAL", "300"))
+DIAGNOSTICS_LOG_FILE = os.getenv("DIAGNOSTICS_LOG_FILE", "logs/diagnostics.log")
+DIAGNOSTICS_LOG_MAX_BYTES = int(os.getenv("DIAGNOSTICS_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+DIAGNOSTICS_LOG_BACKUPS = int(os.getenv("DIAGNOSTICS_LOG_BACKUPS", "5"))
+
+logger = logging.getLogger("diagnostics")
+
+# Ruta y formas de sentencia de la petición en curso
+request_diagnostics = ContextVar("request_diagnostics", default=None)
+
+# Marcadores de parámetro de cada driver: ?, $1, %(name)s y :name
+_PLACEHOLDER = r"(?:\?|\$\d+|%\(\w+\)s|%s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_MAX_PARAM_LENGTH = 200
+
+_last_explain = {}
+
+
+class RequestDiagnostics:
+    __slots__ = ("route", "shapes")
+
+    def __init__(self, route):
+        self.route = route
+        self.shapes = Counter()
+
+
+def configure_logging():
+    """Fichero rotativo propio; el log de diagnóstico no se mezcla con el de la aplicación."""
+    if logger.handlers:
+        return
+    path = Path(DIAGNOSTICS_LOG_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(
+        path, maxBytes=DIAGNOSTICS_LOG_MAX_BYTES, backupCount=DIAGNOSTICS_LOG_BACKUPS, encoding="utf-8",
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def statement_shape(statement):
+    """Sentencia normalizada: espacios colapsados y listas IN (?, ?, ...) como una sola."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+def format_parameters(parameters):
+    text = repr(parameters)
+    if len(text) > _MAX_PARAM_LENGTH:
+        text = text[:_MAX_PARAM_LENGTH] + "..."
+    return text
+
+
+def _explain_prefix(dialect_name):
+    if dialect_name == "postgresql":
+        return "EXPLAIN (ANALYZE, BUFFERS) "
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return None
+
+
+def capture_explain(conn, statement, parameters):
+    """Plan de `statement` con un cursor nuevo en la misma conexión y transacción."""
+    prefix = _explain_prefix(conn.dialect.name)
+    if prefix is None:
+        return None
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+def record_query(conn, statement, parameters, executemany, elapsed):
+    """Hook de cada sentencia ejecutada (solo con DIAGNOSTICS_ENABLED)."""
+    diagnostics = request_diagnostics.get()
+    shape = statement_shape(statement)
+    if diagnostics is not None:
+        diagnostics.shapes[shape] += 1
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+
+    route = diagnostics.route if diagnostics is not None else "-"
+    plan = None
+    if DIAGNOSTICS_EXPLAIN and not executemany and shape.upper().startswith(("SELECT", "WITH")):
+        now = time.monotonic()
+        if now - _last_explain.get(shape, float("-inf")) >= DIAGNOSTICS_EXPLAIN_INTERVAL:
+            _last_explain[shape] = now
+            try:
+                plan = capture_explain(conn, statement, parameters)
+            except Exception as e:
+                plan = f"(no se pudo obtener el plan: {e.__class__.__name__}: {e})"
+    logger.warning(
+        "Consulta lenta %.1f ms en %s\n  SQL: %s\n  Parámetros: %s%s",
+        elapsed_ms, route, shape, format_parameters(parameters),
+        f"\n  Plan:\n    {plan.replace(chr(10), chr(10) + '    ')}" if plan else "",
+    )
+
+
+def report_request(diagnostics):
+    for shape, count in diagnostics.shapes.most_common():
+        if count <= NPLUS1_THRESHOLD:
+            break
+        logger.warning("Posible N+1 en %s: %d ejecuciones de\n  SQL: %s", diagnostics.route, count, shape)
+
+
+class DiagnosticsMiddleware:
+    """Asocia las sentencias a la ruta de cada petición y marca los N+1 al terminar."""
+
+    def __init__(self, app):
+        # Import diferido: metrics importa database, que importa este módulo
+        from metrics import route_template
+
+        self.app = app
+        self.route_template = route_template
+        configure_logging()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        diagnostics = RequestDiagnostics(f"{scope['method']} {self.route_template(scope)}")
+        token = request_diagnostics.set(diagnostics)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_diagnostics.reset(token)
+            report_request(diagnostics)
@@ -0,0 +1,94 @@
+import os
+from functools import lru_cache
+
+import orjson
+from dotenv import load_dotenv
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+
+from pagination import NEXT_CURSOR_HEADER
+
+load_dotenv()
+
+# Camino rápido de los GET del catálogo: las filas se leen como tuplas y se
+# serializan con orjson sin pasar por el response_model. Los datos ya se
+# validaron al escribirlos (las URLs se guardan normalizadas con str(HttpUrl)).
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "false").lower() == "true"
+
+# Parámetro ?fields= compartido por los listados y los detalles
+FIELDS_QUERY = Query(
+    None, description="Campos separados por comas, p. ej. id,nombre,latitud,longitud,imagen"
+)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada con orjson (fechas UTC con "Z", como Pydantic)."""
+
+    def render(self, content):
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+@lru_cache(maxsize=None)
+def _schema_columns(schema, model):
+    return tuple(name for name in schema.model_fields if name in model.__table__.columns)
+
+
+def parse_fields(fields, schema, model):
+    """Campos pedidos con ?fields= (None si se responde con el ORM y el response_model).
+
+    Sin ?fields= y con FAST_SERIALIZATION se piden todos los campos del schema,
+    siempre que todos sean columnas de la tabla.
+    """
+    allowed = _schema_columns(schema, model)
+    if fields is None:
+        if FAST_SERIALIZATION and len(allowed) == len(schema.model_fields):
+            return list(allowed)
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(unknown) or repr(fields)}. Valores posibles: {', '.join(allowed)}"
+        )
+    return names
+
+
+def select_fields(model, names, *required):
+    """SELECT del modelo completo o solo de las columnas pedidas.
+
+    `required` son las columnas que necesita la consulta aunque no se
+    devuelvan, como las de ordenación para el cursor de paginación.
+    """
+    if names is None:
+        return select(model)
+    columns = {name: getattr(model, name) for name in names}
+    for column in required:
+        if column is not None:
+            columns.setdefault(column.key, column)
+    return select(*columns.values())
+
+
+async def fetch_rows(db, query, names):
+    result = await db.execute(query)
+    return result.scalars().all() if names is None else result.all()
+
+
+async def fetch_one(db, model, row_id, names):
+    if names is None:
+        return await db.get(model, row_id)
+    return (await db.execute(select_fields(model, names).where(model.id == row_id))).first()
+
+
+def fields_response(names, rows, response=None):
+    """Respuesta con solo los campos pedidos, sin pasar por el response_model completo."""
+    # Las columnas pedidas van primero en el SELECT; las de orden añadidas se descartan
+    if isinstance(rows, list):
+        content = [dict(zip(names, row)) for row in rows]
+    else:
+        content = dict(zip(names, rows))
+    headers = None
+    if response is not None and NEXT_CURSOR_HEADER in response.headers:
+        headers = {NEXT_CURSOR_HEADER: response.headers[NEXT_CURSOR_HEADER]}
+    return FastJSONResponse(content, headers=headers)
@@ -0,0 +1,24 @@
+from sqlalchemy import func, select, true
+
+# Valores del parámetro `match` de los filtros por lista
+MATCH_PATTERN = "^(all|any)$"
+
+
+def array_filter(column, values, match, dialect_name):
+    """Condición para filas cuya lista contiene todos (`all`) o alguno (`any`) de los valores."""
+    values = list(dict.fromkeys(v.strip() for v in values if v and v.strip()))
+    if not values:
+        return true()
+
+    if dialect_name == "postgresql":
+        # @> y && usan el índice GIN de la columna
+        return column.contains(values) if match == "all" else column.overlap(values)
+
+    # SQLite guarda la lista como JSON
+    elements = func.json_each(column).table_valued("value")
+    found = (
+        select(func.count(func.distinct(elements.c.value)))
+        .where(elements.c.value.in_(values))
+        .scalar_subquery()
+    )
+    return found == len(values) if match == "all" else found > 0
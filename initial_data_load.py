@@ -1,42 +1,196 @@
-from scraper import MallorcaScraper
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+import typing
+from pathlib import Path
+
+import ijson
+from pydantic import ValidationError
+
+from bulk import dedupe_rows, hash_rows, upsert_statement
 from database import SessionLocal
-from models import Beach, Monument, Food
+from projection import catalog_upsert
+import models
+from routers.playas import BeachCreate
+from routers.food import PlatoTipicoCreate
+from routers.restaurants import RestaurantCreate
+from routers.markets import LocalMarketCreate
+from routers.heritage import HeritageCreate
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+LOAD_BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "1000"))
+
+# Recurso -> (modelo, esquema de validación)
+RESOURCES = {
+    "playas": (models.Beach, BeachCreate),
+    "food": (models.Food, PlatoTipicoCreate),
+    "restaurants": (models.Restaurant, RestaurantCreate),
+    "markets": (models.LocalMarket, LocalMarketCreate),
+    "heritage": (models.Heritage, HeritageCreate),
+}
+
+
+def read_json(path, schema):
+    # ijson recorre el array elemento a elemento: la memoria no crece con el fichero
+    with open(path, "rb") as f:
+        events = ijson.parse(f, use_float=True)
+        _, event, _ = next(events, (None, None, None))
+        if event != "start_array":
+            raise ValueError(f"{path}: se esperaba un array JSON")
+        yield from ijson.items(events, "item")
+
+
+def read_ndjson(path, schema):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(path, schema):
+    # Las celdas vacías se omiten y las listas se separan con ";" o "|"
+    list_fields = {
+        name for name, field in schema.model_fields.items()
+        if typing.get_origin(field.annotation) is list
+    }
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            record = {}
+            for key, value in row.items():
+                if value is None or value == "":
+                    continue
+                if key in list_fields:
+                    value = [v.strip() for v in value.replace("|", ";").split(";") if v.strip()]
+                record[key] = value
+            yield record
+
+
+# Sección del scraper -> recurso
+SCRAPER_SECTIONS = {
+    "playas": "playas",
+    "gastronomia": "food",
+    "monumentos": "heritage",
+}
+
+# Extensión -> lector de registros; se pueden registrar más fuentes aquí
+SOURCES = {
+    ".json": read_json,
+    ".ndjson": read_ndjson,
+    ".jsonl": read_ndjson,
+    ".csv": read_csv,
+}
+
+
+def iter_batches(records, schema, batch_size, stats):
+    """Valida los registros y los agrupa en lotes de tamaño fijo."""
+    batch = []
+    for record in records:
+        try:
+            batch.append(schema.model_validate(record).model_dump(mode="json"))
+        except ValidationError as e:
+            stats["invalid"] += 1
+            print(f"  Registro {stats['read']} inválido: {e.errors(include_url=False)[0]['msg']}")
+        stats["read"] += 1
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 
-def load_initial_data():
+def load_records(db, records, resource, batch_size):
+    model, schema = RESOURCES[resource]
+    # Upsert por clave natural: volver a cargar los mismos datos no duplica filas
+    # y las filas sin cambios (misma huella) no se reescriben
+    stmt = upsert_statement(model, db.bind.dialect.name)
+    stats = {"read": 0, "invalid": 0, "written": 0, "changed": 0}
+    start = time.perf_counter()
+    for batch in iter_batches(records, schema, batch_size, stats):
+        unique, _ = dedupe_rows(model, batch)
+        changed = [row[0] for row in db.execute(stmt, hash_rows(unique)).all()]
+        if changed:
+            db.execute(catalog_upsert(model, db.bind.dialect.name, changed))
+        stats["changed"] += len(changed)
+        db.commit()
+        stats["written"] += len(unique)
+    elapsed = time.perf_counter() - start
+    rate = stats["written"] / elapsed if elapsed else 0
+    print(
+        f"  {stats['written']} filas procesadas ({stats['changed']} con cambios), "
+        f"{stats['invalid']} inválidas en {elapsed:.2f}s ({rate:.0f} filas/s)"
+    )
+    return stats
+
+
+def load_file(db, path, resource, batch_size):
+    source = SOURCES.get(path.suffix.lower())
+    if source is None:
+        raise ValueError(f"{path}: formato no soportado ({', '.join(SOURCES)})")
+    return load_records(db, source(path, RESOURCES[resource][1]), resource, batch_size)
+
+
+def load_scraped(db, batch_size, offline=False):
+    """Descarga la guía con el scraper y carga cada sección en su recurso."""
+    from scraper import OFFLINE_FIXTURES, MallorcaScraper
+
+    options = {"fixtures_dir": OFFLINE_FIXTURES} if offline else {}
+    with MallorcaScraper(**options) as scraper:
+        results = asyncio.run(scraper.scrape(*SCRAPER_SECTIONS))
+    invalid = 0
+    for section, items in results.items():
+        resource = SCRAPER_SECTIONS[section]
+        print(f"Cargando datos de {resource} desde el scraper ({section})...")
+        invalid += load_records(db, items, resource, batch_size)["invalid"]
+    return invalid
+
+
+def resource_for(path):
+    resource = path.stem.split(".")[0]
+    if resource not in RESOURCES:
+        raise ValueError(
+            f"{path}: no se puede deducir el recurso; usa --resource ({', '.join(RESOURCES)})"
+        )
+    return resource
+
+
+def load_initial_data(paths=None, resource=None, batch_size=LOAD_BATCH_SIZE,
+                      scrape=False, offline=False):
+    if not paths and not scrape:
+        paths = sorted(p for p in FIXTURES_DIR.iterdir() if p.suffix.lower() in SOURCES)
     db = SessionLocal()
-    scraper = MallorcaScraper()
-    
+    total_invalid = 0
+
     try:
-        # Cargar datos de playas
-        print("Cargando datos de playas...")
-        beaches_data = scraper.scrape_beaches()
-        for beach_data in beaches_data:
-            beach = Beach(**beach_data)
-            db.add(beach)
-        
-        # Cargar datos de monumentos
-        print("Cargando datos de monumentos...")
-        monuments_data = scraper.scrape_monuments()
-        for monument_data in monuments_data:
-            monument = Monument(**monument_data)
-            db.add(monument)
-        
-        # Cargar datos de comida
-        print("Cargando datos de gastronomía...")
-        food_data = scraper.scrape_food()
-        for food_item in food_data:
-            food = Food(**food_item)
-            db.add(food)
-        
-        # Guardar todos los cambios
-        db.commit()
+        for path in map(Path, paths or []):
+            name = resource or resource_for(path)
+            print(f"Cargando datos de {name} desde {path}...")
+            total_invalid += load_file(db, path, name, batch_size)["invalid"]
+        if scrape:
+            total_invalid += load_scraped(db, batch_size, offline)
         print("Datos iniciales cargados exitosamente!")
-        
     except Exception as e:
         print(f"Error al cargar los datos: {e}")
         db.rollback()
+        raise
     finally:
         db.close()
+    return total_invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga idempotente de datos iniciales")
+    parser.add_argument("paths", nargs="*", help="Ficheros a cargar (por defecto, fixtures/)")
+    parser.add_argument("--resource", choices=list(RESOURCES), help="Recurso de todos los ficheros")
+    parser.add_argument("--batch-size", type=int, default=LOAD_BATCH_SIZE)
+    parser.add_argument("--scrape", action="store_true", help="Cargar también los datos del scraper")
+    parser.add_argument("--offline", action="store_true", help="Scraper sin red, con fixtures/html")
+    args = parser.parse_args()
+    invalid = load_initial_data(args.paths, args.resource, args.batch_size, args.scrape, args.offline)
+    raise SystemExit(1 if invalid else 0)
+
 
 if __name__ == "__main__":
-    load_initial_data() 
\ No newline at end of file
+    main()
@@ -1,25 +1,73 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
-from database import engine
-import models
-from routers import categories, reviews, users, food, playas, restaurants, markets, heritage
+from database import engine, async_engine, pool_status, replicas
+from cache import ResponseCacheMiddleware
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware, metrics_response
+from diagnostics import DIAGNOSTICS_ENABLED, DiagnosticsMiddleware
+from profiler import PROFILER_TOKEN, ProfilerMiddleware
+from refresh import REFRESH_ENABLED, create_scheduler
+from startup import DB_CREATE_ALL, STARTUP_WARMUP, create_schema, warm_up
+from routers import categories, reviews, users, food, playas, restaurants, markets, heritage, nearby, search, catalog
 
-# Crear las tablas en la base de datos
-models.Base.metadata.create_all(bind=engine)
+# El esquema se crea y actualiza con Alembic (`alembic upgrade head`); importar
+# la aplicación no abre ninguna conexión
+
+@asynccontextmanager
+async def lifespan(app):
+    if DB_CREATE_ALL:
+        await create_schema()
+    if STARTUP_WARMUP:
+        await warm_up(app)
+
+    # Refresco periódico del catálogo (activar en una sola instancia)
+    scheduler = None
+    if REFRESH_ENABLED:
+        scheduler = create_scheduler()
+        scheduler.start()
+    yield
+    if scheduler:
+        scheduler.shutdown(wait=False)
 
 app = FastAPI(
     title="Mallorca API",
     description="API REST para la información turística de Mallorca",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Configurar CORS
+# Caché de respuestas GET del catálogo (Redis o memoria según CACHE_URL)
+app.add_middleware(ResponseCacheMiddleware)
+
+# Compresión gzip/brotli negociada; va por fuera de la caché, que ya entrega
+# sus respuestas comprimidas
+app.add_middleware(CompressionMiddleware)
+
+# Consultas lentas y N+1 por ruta, solo en modo diagnóstico
+if DIAGNOSTICS_ENABLED:
+    app.add_middleware(DiagnosticsMiddleware)
+
+# Métricas por ruta y Server-Timing; por fuera de la caché y la compresión
+# para medir también los aciertos y el coste de comprimir
+app.add_middleware(MetricsMiddleware)
+
+# Perfilado bajo demanda con `X-Profile: <PROFILER_TOKEN>`; sin token no se instala
+if PROFILER_TOKEN:
+    app.add_middleware(ProfilerMiddleware)
+
+# Configurar CORS. Va por fuera de todo: las cabeceras Access-Control-* se
+# calculan para cada origen y no se guardan en la caché, y las peticiones
+# preflight se responden sin llegar a ella
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # En producción, especificar los orígenes permitidos
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor de paginación por clave
 )
 
 # Incluir routers
@@ -31,6 +79,9 @@ app.include_router(reviews.router, prefix="/api/v1/reviews", tags=["reviews"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(markets.router, prefix="/api/v1/markets", tags=["markets"])
 app.include_router(heritage.router, prefix="/api/v1/heritage", tags=["heritage"])
+app.include_router(nearby.router, prefix="/api/v1/nearby", tags=["nearby"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+app.include_router(catalog.router, prefix="/api/v1/catalog", tags=["catalog"])
 
 @app.get("/")
 async def root():
@@ -40,6 +91,39 @@ async def root():
         "docs_url": "/docs"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Formato de exposición de Prometheus
+    return metrics_response()
+
+@app.get("/health/db")
+async def health_db():
+    # Comprueba la conexión y devuelve el estado de los pools
+    status_code = 200
+    database = "ok"
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        status_code = 503
+        database = f"error: {e.__class__.__name__}"
+
+    return JSONResponse(status_code=status_code, content={
+        "database": database,
+        "pools": {
+            "async": pool_status(async_engine.sync_engine),
+            "sync": pool_status(engine),
+        },
+        "replicas": [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "available": replica.available,
+                **pool_status(replica.engine.sync_engine),
+            }
+            for replica in replicas
+        ],
+    })
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
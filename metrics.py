@@ -0,0 +1,124 @@
+"""Métricas por ruta en formato Prometheus.
+
+El middleware registra por ruta (la plantilla, p. ej. /api/v1/playas/{playa_id})
+la latencia, las peticiones en curso, el tamaño de la respuesta y las
+consultas y el tiempo de base de datos que cuentan los hooks de database.py.
+Con varios workers, PROMETHEUS_MULTIPROC_DIR hace que /metrics agregue los de
+todos los procesos.
+"""
+import os
+import time
+
+from dotenv import load_dotenv
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+    multiprocess,
+)
+from starlette.responses import Response
+from starlette.routing import Match
+
+from database import DbStats, request_db_stats
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Server-Timing expone a los clientes el tiempo de base de datos de cada petición
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+# Las rutas que no existen comparten etiqueta para no crear una serie por URL
+UNMATCHED_ROUTE = "<unmatched>"
+
+LABELS = ["method", "route"]
+REQUESTS = Counter("http_requests_total", "Peticiones HTTP", LABELS + ["status"])
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP", LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Peticiones HTTP en curso", LABELS, multiprocess_mode="livesum",
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Tamaño de las respuestas enviadas", LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries", "Consultas a la base de datos por petición", LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME = Histogram(
+    "http_request_db_seconds", "Tiempo de base de datos por petición", LABELS,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+def route_template(scope):
+    """Plantilla de la ruta que atenderá la petición, sin ejecutarla."""
+    app = scope.get("app")
+    partial = None
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+def server_timing(stats, elapsed):
+    return (
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"app;dur={elapsed * 1000:.1f}"
+    ).encode("latin-1")
+
+
+def metrics_response():
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Métricas por ruta y cabecera Server-Timing con el tiempo de base de datos."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        labels = (scope["method"], route_template(scope))
+        stats = DbStats()
+        token = request_db_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", server_timing(stats, time.perf_counter() - start))
+                    ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(*labels)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            request_db_stats.reset(token)
+            REQUESTS.labels(*labels, str(status)).inc()
+            LATENCY.labels(*labels).observe(time.perf_counter() - start)
+            RESPONSE_SIZE.labels(*labels).observe(size)
+            DB_QUERIES.labels(*labels).observe(stats.queries)
+            DB_TIME.labels(*labels).observe(stats.seconds)
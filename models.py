@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Boolean, Table
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Boolean, Table, Index, JSON, PrimaryKeyConstraint, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -6,16 +7,38 @@ from datetime import datetime
 
 Base = declarative_base()
 
-# Tabla de asociación para categorías
+# Lista de textos: array indexable con GIN en PostgreSQL, JSON en SQLite
+StringList = ARRAY(String(100)).with_variant(JSON(), "sqlite")
+
+# Tabla de asociación para categorías: la clave primaria sirve las consultas
+# por categoría y el índice inverso las consultas por item
 category_association = Table(
     'category_association',
     Base.metadata,
-    Column('item_id', Integer, ForeignKey('items.id')),
-    Column('category_id', Integer, ForeignKey('categories.id'))
+    Column('item_id', Integer, ForeignKey('items.id'), nullable=False),
+    Column('category_id', Integer, ForeignKey('categories.id'), nullable=False),
+    PrimaryKeyConstraint('category_id', 'item_id', name='pk_category_association'),
+    Index('ix_category_association_item_id_category_id', 'item_id', 'category_id'),
 )
 
 class Beach(Base):
     __tablename__ = "beaches"
+    __table_args__ = (
+        Index("ix_beaches_latitud_longitud", "latitud", "longitud"),
+        Index("ix_beaches_servicios", "servicios", postgresql_using="gin"),
+        UniqueConstraint("nombre", "pueblo", name="uq_beaches_nombre_pueblo"),
+        # Filtros de /playas, todos ordenados por (nombre, id) como la paginación
+        Index("ix_beaches_nombre_id", "nombre", "id"),
+        Index("ix_beaches_zona_nombre_id", "zona", "nombre", "id"),
+        Index(
+            "ix_beaches_destacado_nombre_id", "nombre", "id",
+            postgresql_where=text("destacado = true"), sqlite_where=text("destacado = 1"),
+        ),
+        Index(
+            "ix_beaches_zona_destacado_nombre_id", "zona", "nombre", "id",
+            postgresql_where=text("destacado = true"), sqlite_where=text("destacado = 1"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(100), nullable=False)
@@ -24,7 +47,7 @@ class Beach(Base):
     zona = Column(String(100))
     pueblo = Column(String(100))
     tipo = Column(String(50))
-    servicios = Column(Text)  # Almacenado como string separado por comas
+    servicios = Column(StringList, nullable=False, default=list)
     acceso = Column(String(100))
     destacado = Column(Boolean, default=False)
     latitud = Column(Float)
@@ -32,6 +55,8 @@ class Beach(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     is_active = Column(Boolean, default=True)
+    # Huella de los datos de origen (ver refresh.py)
+    content_hash = Column(String(64))
 
 class Monument(Base):
     __tablename__ = "monuments"
@@ -48,12 +73,20 @@ class Monument(Base):
 
 class Food(Base):
     __tablename__ = "food"
+    __table_args__ = (
+        Index("ix_food_latitud_longitud", "latitud", "longitud"),
+        Index("ix_food_ingredientes", "ingredientes", postgresql_using="gin"),
+        Index("ix_food_categoria_nombre_id", "categoria", "nombre", "id"),
+        # También sirve el listado sin filtros: nombre es único, así que el orden
+        # (nombre, id) no necesita otro índice
+        UniqueConstraint("nombre", name="uq_food_nombre"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(100), nullable=False)
     categoria = Column(String(100))
     descripcion = Column(Text)
-    ingredientes = Column(Text)  # Almacenado como string separado por comas
+    ingredientes = Column(StringList, nullable=False, default=list)
     imagen = Column(String(255))
     preparacion = Column(Text)
     donde_probar = Column(String(255))
@@ -62,9 +95,22 @@ class Food(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     is_active = Column(Boolean, default=True)
+    content_hash = Column(String(64))
 
 class Restaurant(Base):
     __tablename__ = "restaurants"
+    __table_args__ = (
+        Index("ix_restaurants_latitud_longitud", "latitud", "longitud"),
+        UniqueConstraint("nombre", "ubicacion", name="uq_restaurants_nombre_ubicacion"),
+        Index("ix_restaurants_nombre_id", "nombre", "id"),
+        Index("ix_restaurants_ubicacion_nombre_id", "ubicacion", "nombre", "id"),
+        Index("ix_restaurants_tipo_nombre_id", "tipo", "nombre", "id"),
+        Index("ix_restaurants_precio_nombre_id", "precio", "nombre", "id"),
+        Index("ix_restaurants_ubicacion_tipo_nombre_id", "ubicacion", "tipo", "nombre", "id"),
+        Index("ix_restaurants_ubicacion_precio_nombre_id", "ubicacion", "precio", "nombre", "id"),
+        Index("ix_restaurants_tipo_precio_nombre_id", "tipo", "precio", "nombre", "id"),
+        Index("ix_restaurants_ubicacion_tipo_precio_nombre_id", "ubicacion", "tipo", "precio", "nombre", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(100), nullable=False)
@@ -83,20 +129,56 @@ class Restaurant(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     is_active = Column(Boolean, default=True)
+    content_hash = Column(String(64))
 
 class Category(Base):
     __tablename__ = "categories"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
     description = Column(String)
     items = relationship("Item", secondary=category_association, back_populates="categories")
 
 class Item(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        # Ranking de /reviews/top: solo items con reseñas; el índice se recorre
+        # hacia atrás para ORDER BY rating_avg DESC, id DESC
+        Index(
+            "ix_items_tipo_rating_avg_id", "tipo", "rating_avg", "id",
+            postgresql_where=text("rating_count > 0"), sqlite_where=text("rating_count > 0"),
+        ),
+        Index(
+            "ix_items_rating_avg_id", "rating_avg", "id",
+            postgresql_where=text("rating_count > 0"), sqlite_where=text("rating_count > 0"),
+        ),
+        # Proyección del catálogo (projection.py): una fila por recurso y
+        # listado mixto de /catalog ordenado por (nombre, id) como la paginación
+        UniqueConstraint("tipo", "ref_id", name="uq_items_tipo_ref_id"),
+        Index(
+            "ix_items_catalog_nombre_id", "nombre", "id",
+            postgresql_where=text("ref_id IS NOT NULL"), sqlite_where=text("ref_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_items_catalog_tipo_nombre_id", "tipo", "nombre", "id",
+            postgresql_where=text("ref_id IS NOT NULL"), sqlite_where=text("ref_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_items_catalog_pueblo_nombre_id", "pueblo", "nombre", "id",
+            postgresql_where=text("ref_id IS NOT NULL"), sqlite_where=text("ref_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_items_catalog_zona_nombre_id", "zona", "nombre", "id",
+            postgresql_where=text("ref_id IS NOT NULL"), sqlite_where=text("ref_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_items_catalog_categoria_nombre_id", "categoria", "nombre", "id",
+            postgresql_where=text("ref_id IS NOT NULL"), sqlite_where=text("ref_id IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    nombre = Column(String, index=True)
+    nombre = Column(String, index=True, nullable=False)
     imagen = Column(String)
     descripcion = Column(String)
     zona = Column(String)
@@ -107,6 +189,20 @@ class Item(Base):
     destacado = Column(Boolean, default=False)
     categoria = Column(String)  # Para platos típicos
     ingredientes = Column(String)  # Para platos típicos, almacenado como string separado por comas
+    # Id en la tabla del recurso (beaches, food, ...) según el tipo; NULL en
+    # los items que no vienen de un recurso o cuyo recurso se ha borrado
+    ref_id = Column(Integer)
+    latitud = Column(Float)
+    longitud = Column(Float)
+    # Agregados de las reseñas, actualizados al crear y borrar cada reseña
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_avg = Column(Float)
+    stars_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    stars_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    stars_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    stars_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    stars_5 = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     is_active = Column(Boolean, default=True)
@@ -117,6 +213,9 @@ class Item(Base):
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_item_id_id", "item_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     item_id = Column(Integer, ForeignKey("items.id"))
@@ -137,6 +236,12 @@ class User(Base):
 
 class LocalMarket(Base):
     __tablename__ = "local_markets"
+    __table_args__ = (
+        Index("ix_local_markets_latitude_longitude", "latitude", "longitude"),
+        UniqueConstraint("name", "location", name="uq_local_markets_name_location"),
+        Index("ix_local_markets_name_id", "name", "id"),
+        Index("ix_local_markets_location_name_id", "location", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -152,9 +257,15 @@ class LocalMarket(Base):
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     is_active = Column(Boolean, default=True)
+    content_hash = Column(String(64))
 
 class Heritage(Base):
     __tablename__ = "heritage_sites"
+    __table_args__ = (
+        Index("ix_heritage_sites_latitude_longitude", "latitude", "longitude"),
+        UniqueConstraint("name", name="uq_heritage_sites_name"),
+        Index("ix_heritage_sites_period_name_id", "period", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -173,4 +284,5 @@ class Heritage(Base):
     guided_tours = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
-    is_active = Column(Boolean, default=True) 
\ No newline at end of file
+    is_active = Column(Boolean, default=True) 
+    content_hash = Column(String(64))
\ No newline at end of file
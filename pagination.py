@@ -0,0 +1,105 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# Cabecera con el cursor de la página siguiente (ausente en la última página)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable en cursor: {type(value)!r}")
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=_json_default, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, columns):
+    """Decodifica un cursor opaco en los valores de las columnas de ordenación."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        try:
+            if value is None:
+                raise ValueError
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif not isinstance(value, python_type):
+                value = python_type(value)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        decoded.append(value)
+    return decoded
+
+
+def keyset(sort_column, id_column):
+    """Columnas de orden de un listado paginado; los routers lo llaman al definir la ruta.
+
+    La columna de orden no puede admitir NULL: un cursor con null no cumpliría
+    `(sort_column, id) > cursor` y el orden de los NULL cambia entre PostgreSQL
+    y SQLite. Pasar `None` ordena solo por id.
+    """
+    if sort_column is not None and sort_column.nullable:
+        raise ValueError(f"La columna de orden {sort_column} admite NULL y no sirve para paginar por clave")
+    return sort_column, id_column
+
+
+def _sort_columns(sort_column, id_column):
+    sort_column, id_column = keyset(sort_column, id_column)
+    if sort_column is None:
+        return [id_column]
+    return [sort_column, id_column]
+
+
+def paginate(query, sort_column, id_column, limit, skip=0, cursor=None):
+    """Ordena la consulta por (sort_column, id) y aplica la paginación.
+
+    Con `cursor` se usa paginación por clave (keyset): la condición
+    `(sort_column, id) > cursor` permite al índice saltar directamente a la
+    página pedida. Sin cursor se mantiene `skip` para los clientes antiguos.
+    Se pide una fila de más para saber si existe una página siguiente.
+    """
+    columns = _sort_columns(sort_column, id_column)
+    query = query.order_by(*columns)
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if len(columns) == 1:
+            query = query.filter(id_column > values[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(max(limit, 0) + 1)
+
+
+def set_next_cursor(response, rows, limit, sort_column, id_column):
+    """Recorta la fila extra y publica el cursor siguiente en la respuesta."""
+    limit = max(limit, 0)
+    if len(rows) <= limit or limit == 0:
+        return rows[:limit]
+
+    rows = rows[:limit]
+    last = rows[-1]
+    values = [getattr(last, column.key) for column in _sort_columns(sort_column, id_column)]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(values)
+    return rows
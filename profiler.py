@@ -0,0 +1,186 @@
+"""Perfilado bajo demanda de peticiones concretas.
+
+Con PROFILER_TOKEN definido, una petición con la cabecera `X-Profile: <token>`
+se ejecuta bajo un perfilador de muestreo (pyinstrument en modo asíncrono,
+que solo atribuye las muestras a la propia petición) y el informe se guarda en
+PROFILER_DIR. La respuesta lleva el nombre del fichero en `X-Profile-Report`.
+Con `X-Profile-Output: inline` el informe sustituye al cuerpo de la respuesta.
+
+Formatos (`X-Profile-Format` o PROFILER_FORMAT):
+
+- `folded`: pilas plegadas (`a;b;c microsegundos`), para flamegraph.pl,
+  inferno o speedscope.
+- `speedscope`: JSON de speedscope.
+- `html`: informe interactivo de pyinstrument.
+
+Sin PROFILER_TOKEN el middleware no se instala y las peticiones no pagan nada.
+"""
+import hmac
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "1"))
+PROFILER_DIR = os.getenv("PROFILER_DIR", "profiles")
+PROFILER_FORMAT = os.getenv("PROFILER_FORMAT", "folded")
+
+FORMATS = {
+    "folded": ("txt", "text/plain; charset=utf-8"),
+    "speedscope": ("speedscope.json", "application/json"),
+    "html": ("html", "text/html; charset=utf-8"),
+}
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def frame_label(frame):
+    label = f"{frame.function} ({frame.file_path_short}:{frame.line_no})" if not frame.is_synthetic else frame.function
+    # ";" separa los marcos y el espacio final separa el valor en el formato plegado
+    return label.replace(";", ",")
+
+
+def folded_stacks(session):
+    """Pilas plegadas con el tiempo propio de cada pila en microsegundos."""
+    lines = []
+
+    def walk(frame, path):
+        if frame.function != "[self]":
+            path = path + [frame_label(frame)]
+        own = frame.time - sum(child.time for child in frame.children)
+        microseconds = round(own * 1_000_000)
+        if microseconds > 0:
+            lines.append(f"{';'.join(path)} {microseconds}")
+        for child in frame.children:
+            walk(child, path)
+
+    root = session.root_frame()
+    if root is not None:
+        walk(root, [])
+    return "\n".join(lines) + "\n"
+
+
+def render(session, fmt):
+    if fmt == "speedscope":
+        from pyinstrument.renderers import SpeedscopeRenderer
+        return SpeedscopeRenderer().render(session)
+    if fmt == "html":
+        from pyinstrument.renderers import HTMLRenderer
+        return HTMLRenderer().render(session)
+    return folded_stacks(session)
+
+
+def report_name(scope, fmt):
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    path = _UNSAFE.sub("_", scope["path"]).strip("_") or "root"
+    return f"{stamp}-{scope['method']}-{path[:80]}.{FORMATS[fmt][0]}"
+
+
+def _header(scope, name):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _plain_response(status, body, content_type, extra_headers=()):
+    body = body.encode("utf-8")
+    headers = [
+        (b"content-type", content_type.encode("latin-1")),
+        (b"content-length", str(len(body)).encode("latin-1")),
+        (b"cache-control", b"no-store"),
+        *extra_headers,
+    ]
+    return [
+        {"type": "http.response.start", "status": status, "headers": headers},
+        {"type": "http.response.body", "body": body},
+    ]
+
+
+class ProfilerMiddleware:
+    """Perfila las peticiones que traen `X-Profile` con el token de administración."""
+
+    def __init__(self, app):
+        self.app = app
+        self.token = PROFILER_TOKEN.encode("latin-1")
+        # Un solo perfil a la vez por proceso: pyinstrument no admite varios en el mismo hilo
+        self.busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = next((value for key, value in scope["headers"] if key == b"x-profile"), None)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if not hmac.compare_digest(token, self.token):
+            for message in _plain_response(403, json.dumps({"detail": "Token de perfilado no válido"}),
+                                           "application/json"):
+                await send(message)
+            return
+
+        fmt = (_header(scope, b"x-profile-format") or PROFILER_FORMAT).lower()
+        if fmt not in FORMATS:
+            detail = f"Formato de perfil no válido; opciones: {', '.join(FORMATS)}"
+            for message in _plain_response(400, json.dumps({"detail": detail}), "application/json"):
+                await send(message)
+            return
+        if self.busy:
+            for message in _plain_response(409, json.dumps({"detail": "Ya hay otra petición perfilándose"}),
+                                           "application/json"):
+                await send(message)
+            return
+
+        inline = (_header(scope, b"x-profile-output") or "").lower() == "inline"
+        await self._profile(scope, receive, send, fmt, inline)
+
+    async def _profile(self, scope, receive, send, fmt, inline):
+        from pyinstrument import Profiler
+
+        name = report_name(scope, fmt)
+        # La caché de respuestas no atiende las peticiones perfiladas: se mide el trabajo real
+        scope = dict(scope, profiling=True)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-report", name.encode("latin-1"))
+                ]
+            if not inline:
+                await send(message)
+
+        self.busy = True
+        profiler = Profiler(interval=PROFILER_INTERVAL_MS / 1000, async_mode="enabled")
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            self.busy = False
+
+        report = render(session, fmt)
+        path = Path(PROFILER_DIR)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(report, encoding="utf-8")
+
+        if inline:
+            extra = [
+                (b"x-profile-report", name.encode("latin-1")),
+                (b"x-profiled-status", str(status).encode("latin-1")),
+                (b"x-profile-duration", f"{(time.perf_counter() - start) * 1000:.1f}".encode("latin-1")),
+            ]
+            for message in _plain_response(200, report, FORMATS[fmt][1], extra):
+                await send(message)
@@ -0,0 +1,151 @@
+"""Proyección del catálogo en la tabla items.
+
+Cada playa, plato, restaurante, mercado y monumento tiene una fila en items
+(clave única `tipo, ref_id`) con los campos que necesita el listado mixto de
+/api/v1/catalog. La fila se escribe en la misma transacción que el recurso:
+los routers llaman a `sync_catalog` y los upserts masivos de bulk.py, la carga
+inicial y el refresco usan `catalog_upsert` con los ids que han cambiado.
+
+Como las reseñas y las categorías apuntan a items, al borrar un recurso su
+fila no se borra: se desvincula (`ref_id = NULL`) y sale del catálogo.
+
+Para reconstruir la proyección desde cero: python projection.py
+"""
+from sqlalchemy import func, literal, null, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import SessionLocal
+import models
+
+# Modelo -> (tipo en items, columna de items -> columna del recurso)
+CATALOG_SOURCES = {
+    models.Beach: ("Playa", {
+        "nombre": models.Beach.nombre,
+        "imagen": models.Beach.imagen,
+        "descripcion": models.Beach.descripcion,
+        "zona": models.Beach.zona,
+        "pueblo": models.Beach.pueblo,
+        "acceso": models.Beach.acceso,
+        "destacado": models.Beach.destacado,
+        "latitud": models.Beach.latitud,
+        "longitud": models.Beach.longitud,
+        "is_active": models.Beach.is_active,
+    }),
+    models.Food: ("Plato", {
+        "nombre": models.Food.nombre,
+        "imagen": models.Food.imagen,
+        "descripcion": models.Food.descripcion,
+        "categoria": models.Food.categoria,
+        "latitud": models.Food.latitud,
+        "longitud": models.Food.longitud,
+        "is_active": models.Food.is_active,
+    }),
+    models.Restaurant: ("Restaurante", {
+        "nombre": models.Restaurant.nombre,
+        "imagen": models.Restaurant.imagen,
+        "descripcion": models.Restaurant.descripcion,
+        "pueblo": models.Restaurant.ubicacion,
+        "categoria": models.Restaurant.tipo,
+        "latitud": models.Restaurant.latitud,
+        "longitud": models.Restaurant.longitud,
+        "is_active": models.Restaurant.is_active,
+    }),
+    models.LocalMarket: ("Mercado", {
+        "nombre": models.LocalMarket.name,
+        "imagen": models.LocalMarket.image,
+        "descripcion": models.LocalMarket.description,
+        "pueblo": models.LocalMarket.location,
+        "latitud": models.LocalMarket.latitude,
+        "longitud": models.LocalMarket.longitude,
+        "is_active": models.LocalMarket.is_active,
+    }),
+    models.Heritage: ("Monumento", {
+        "nombre": models.Heritage.name,
+        "imagen": models.Heritage.image,
+        "descripcion": models.Heritage.description,
+        "categoria": models.Heritage.period,
+        "latitud": models.Heritage.latitude,
+        "longitud": models.Heritage.longitude,
+        "is_active": models.Heritage.is_active,
+    }),
+}
+
+# Columnas de items que escribe la proyección (las que no tiene un recurso quedan a NULL)
+PROJECTED_COLUMNS = sorted({name for _, columns in CATALOG_SOURCES.values() for name in columns})
+
+
+def catalog_upsert(model, dialect_name, ids=None):
+    """INSERT ... SELECT ... ON CONFLICT (tipo, ref_id) DO UPDATE de los ids dados (o de todos).
+
+    El id del item no cambia al actualizar, así que sus reseñas y categorías se conservan.
+    """
+    tipo, columns = CATALOG_SOURCES[model]
+    source = select(
+        literal(tipo).label("tipo"),
+        model.id.label("ref_id"),
+        *(columns[name].label(name) if name in columns else null().label(name) for name in PROJECTED_COLUMNS),
+    )
+    # SQLite necesita un WHERE para no confundir el ON CONFLICT con un JOIN
+    source = source.where(model.id.in_(ids) if ids is not None else true())
+
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    stmt = insert(models.Item).from_select(["tipo", "ref_id", *PROJECTED_COLUMNS], source)
+    return stmt.on_conflict_do_update(
+        index_elements=["tipo", "ref_id"],
+        set_={
+            **{name: stmt.excluded[name] for name in PROJECTED_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def catalog_detach(model, ids):
+    """Saca del catálogo los items de recursos borrados sin perder sus reseñas."""
+    tipo, _ = CATALOG_SOURCES[model]
+    return (
+        update(models.Item)
+        .where(models.Item.tipo == tipo, models.Item.ref_id.in_(ids))
+        .values(ref_id=None, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def sync_catalog(db, model, ids):
+    """Actualiza la proyección de los recursos `ids` en la transacción de la sesión."""
+    if ids:
+        await db.execute(catalog_upsert(model, db.bind.dialect.name, ids))
+
+
+async def detach_catalog(db, model, ids):
+    if ids:
+        await db.execute(catalog_detach(model, ids))
+
+
+def rebuild_catalog():
+    """Vuelve a proyectar todos los recursos en items."""
+    db = SessionLocal()
+    try:
+        for model, (tipo, _) in CATALOG_SOURCES.items():
+            db.execute(catalog_upsert(model, db.bind.dialect.name))
+            # Items de recursos que ya no existen
+            orphans = select(models.Item.ref_id).where(
+                models.Item.tipo == tipo,
+                models.Item.ref_id.is_not(None),
+                models.Item.ref_id.not_in(select(model.id)),
+            )
+            db.execute(catalog_detach(model, orphans))
+        db.commit()
+        total = db.execute(
+            select(func.count()).select_from(models.Item).where(models.Item.ref_id.is_not(None))
+        ).scalar()
+        print(f"Catálogo reconstruido: {total} items")
+    except Exception as e:
+        print(f"Error al reconstruir el catálogo: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_catalog()
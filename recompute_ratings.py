@@ -0,0 +1,57 @@
+from sqlalchemy import case, func, select, update
+
+from database import SessionLocal
+import models
+
+
+def recompute_ratings():
+    """Recalcula desde cero los agregados de reseñas de todos los items."""
+    item = models.Item
+    review = models.Review
+    stars = {
+        f"stars_{n}": func.coalesce(func.sum(case((review.rating == n, 1), else_=0)), 0)
+        for n in range(1, 6)
+    }
+    aggregates = (
+        select(
+            review.item_id,
+            func.count().label("rating_count"),
+            func.sum(review.rating).label("rating_sum"),
+            *(value.label(name) for name, value in stars.items()),
+        )
+        .where(review.item_id.is_not(None), review.rating.between(1, 5))
+        .group_by(review.item_id)
+        .subquery()
+    )
+
+    db = SessionLocal()
+    try:
+        # Todo en una transacción: primero se ponen a cero y después se
+        # aplican los totales de los items con reseñas (UPDATE ... FROM)
+        db.execute(update(item).values(
+            rating_count=0, rating_sum=0, rating_avg=None,
+            **{f"stars_{n}": 0 for n in range(1, 6)}
+        ))
+        result = db.execute(
+            update(item)
+            .where(item.id == aggregates.c.item_id)
+            .values(
+                rating_count=aggregates.c.rating_count,
+                rating_sum=aggregates.c.rating_sum,
+                rating_avg=aggregates.c.rating_sum * 1.0 / aggregates.c.rating_count,
+                **{name: aggregates.c[name] for name in stars},
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        print(f"Agregados recalculados para {result.rowcount} items")
+    except Exception as e:
+        print(f"Error al recalcular los agregados: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    recompute_ratings()
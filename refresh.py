@@ -0,0 +1,102 @@
+"""Refresco incremental del catálogo.
+
+Vuelve a leer las fuentes de datos y las escribe con el upsert por huella de
+bulk.py: solo se actualizan las filas cuyo contenido ha cambiado y solo se
+invalidan en caché esas filas (y los listados de su recurso).
+"""
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+from bulk import dedupe_rows, upsert_rows
+from cache import CACHED_RESOURCES, invalidate, list_tag, row_tag
+from database import AsyncSessionLocal
+from initial_data_load import (
+    FIXTURES_DIR, LOAD_BATCH_SIZE, RESOURCES, SCRAPER_SECTIONS, SOURCES,
+    iter_batches, resource_for,
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_ENABLED = os.getenv("REFRESH_ENABLED", "false").lower() == "true"
+REFRESH_INTERVAL_MINUTES = int(os.getenv("REFRESH_INTERVAL_MINUTES", "60"))
+# Fuentes separadas por comas: "fixtures", "scraper" o rutas de ficheros
+REFRESH_SOURCES = os.getenv("REFRESH_SOURCES", "fixtures")
+
+# Recursos con respuestas en caché (la etiqueta coincide con el recurso)
+CACHED_TAGS = {tag for tag, _ in CACHED_RESOURCES.values()}
+
+
+def _read_file(path, resource):
+    return list(SOURCES[path.suffix.lower()](path, RESOURCES[resource][1]))
+
+
+async def iter_sources(sources=None):
+    """Pares (recurso, registros) de las fuentes configuradas."""
+    for name in (sources or REFRESH_SOURCES).split(","):
+        name = name.strip()
+        if name == "fixtures":
+            paths = sorted(p for p in FIXTURES_DIR.iterdir() if p.suffix.lower() in SOURCES)
+        elif name == "scraper":
+            from scraper import MallorcaScraper
+
+            with MallorcaScraper() as scraper:
+                results = await scraper.scrape(*SCRAPER_SECTIONS)
+            for section, items in results.items():
+                yield SCRAPER_SECTIONS[section], items
+            continue
+        elif name:
+            paths = [Path(name)]
+        else:
+            continue
+        for path in paths:
+            resource = resource_for(path)
+            # La lectura del fichero no debe bloquear el event loop
+            yield resource, await asyncio.to_thread(_read_file, path, resource)
+
+
+async def refresh_resource(db, resource, records, batch_size=LOAD_BATCH_SIZE):
+    """Escribe los registros de un recurso y devuelve los ids que han cambiado."""
+    model, schema = RESOURCES[resource]
+    stats = {"read": 0, "invalid": 0}
+    changed = []
+    for batch in iter_batches(records, schema, batch_size, stats):
+        unique, _ = dedupe_rows(model, batch)
+        changed.extend((await upsert_rows(db, model, unique)).values())
+        await db.commit()
+    return changed, stats
+
+
+async def refresh_catalog(sources=None):
+    start = time.perf_counter()
+    summary = {}
+    async with AsyncSessionLocal() as db:
+        async for resource, records in iter_sources(sources):
+            changed, stats = await refresh_resource(db, resource, records)
+            if changed and resource in CACHED_TAGS:
+                await invalidate(list_tag(resource), *(row_tag(resource, row_id) for row_id in changed))
+            totals = summary.setdefault(resource, {"read": 0, "invalid": 0, "changed": 0})
+            totals["read"] += stats["read"]
+            totals["invalid"] += stats["invalid"]
+            totals["changed"] += len(changed)
+    logger.info("Refresco del catálogo en %.2fs: %s", time.perf_counter() - start, summary)
+    return summary
+
+
+def create_scheduler():
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    scheduler = AsyncIOScheduler()
+    # Una sola ejecución a la vez; si se acumulan, se agrupan en una
+    scheduler.add_job(
+        refresh_catalog, "interval", minutes=REFRESH_INTERVAL_MINUTES,
+        id="refresh_catalog", max_instances=1, coalesce=True,
+    )
+    return scheduler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(refresh_catalog()))
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_rows, fields_response, parse_fields, select_fields
+from projection import CATALOG_SOURCES
+import models
+from pydantic import BaseModel
+
+router = APIRouter()
+
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.Item.nombre, models.Item.id)
+
+CATALOG_TIPOS = [tipo for tipo, _ in CATALOG_SOURCES.values()]
+
+class CatalogItem(BaseModel):
+    id: int
+    tipo: str
+    ref_id: int
+    nombre: str
+    imagen: Optional[str] = None
+    descripcion: Optional[str] = None
+    zona: Optional[str] = None
+    pueblo: Optional[str] = None
+    categoria: Optional[str] = None
+    destacado: Optional[bool] = None
+    latitud: Optional[float] = None
+    longitud: Optional[float] = None
+    rating_count: int
+    rating_avg: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+@router.get("/", response_model=List[CatalogItem])
+async def get_catalog(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    tipo: Optional[List[str]] = Query(None, description=f"Tipo (repetible): {', '.join(CATALOG_TIPOS)}"),
+    pueblo: Optional[str] = None,
+    zona: Optional[str] = None,
+    categoria: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Listado mixto de playas, platos, restaurantes, mercados y monumentos.
+
+    Se sirve con una consulta sobre la proyección en items (projection.py);
+    `ref_id` es el id del recurso en su propio endpoint.
+    """
+    unknown = [t for t in tipo or [] if t not in CATALOG_TIPOS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipos no válidos: {', '.join(unknown)}. Valores posibles: {', '.join(CATALOG_TIPOS)}"
+        )
+
+    names = parse_fields(fields, CatalogItem, models.Item)
+    # Solo items proyectados: los índices parciales ix_items_catalog_* sirven filtro y orden
+    query = select_fields(models.Item, names, models.Item.nombre, models.Item.id).filter(
+        models.Item.ref_id.is_not(None)
+    )
+
+    if tipo:
+        query = query.filter(models.Item.tipo.in_(tipo) if len(tipo) > 1 else models.Item.tipo == tipo[0])
+    if pueblo:
+        query = query.filter(models.Item.pueblo == pueblo)
+    if zona:
+        query = query.filter(models.Item.zona == zona)
+    if categoria:
+        query = query.filter(models.Item.categoria == categoria)
+
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    items = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return items if names is None else fields_response(names, items, response)
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_rows, fields_response, parse_fields, select_fields
 import models
 from pydantic import BaseModel
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.Category.name, models.Category.id)
+ITEMS_PAGE_ORDER = keyset(models.Item.nombre, models.Item.id)
+
 class CategoryBase(BaseModel):
     name: str
     description: str
@@ -21,45 +28,128 @@ class Category(CategoryBase):
     class Config:
         from_attributes = True
 
+class CategoryItem(BaseModel):
+    id: int
+    nombre: Optional[str] = None
+    imagen: Optional[str] = None
+    descripcion: Optional[str] = None
+    tipo: Optional[str] = None
+    zona: Optional[str] = None
+    pueblo: Optional[str] = None
+    destacado: Optional[bool] = None
+    rating_count: int = 0
+    rating_avg: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+async def item_ids_by_category(db, category_ids):
+    """Ids de los items de varias categorías en una sola consulta sobre la tabla de asociación."""
+    ids = {category_id: [] for category_id in category_ids}
+    if not category_ids:
+        return ids
+    association = models.category_association
+    query = (
+        select(association.c.category_id, association.c.item_id)
+        .where(association.c.category_id.in_(category_ids))
+        .order_by(association.c.category_id, association.c.item_id)
+    )
+    for category_id, item_id in (await db.execute(query)).all():
+        ids[category_id].append(item_id)
+    return ids
+
+async def with_item_ids(db, categories):
+    ids = await item_ids_by_category(db, [category.id for category in categories])
+    return [
+        Category(id=category.id, name=category.name, description=category.description,
+                 items=ids[category.id])
+        for category in categories
+    ]
+
 @router.get("/", response_model=List[Category])
-def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    categories = db.query(models.Category).offset(skip).limit(limit).all()
-    return categories
+async def read_categories(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # `items` no es una columna de la tabla y no se puede pedir con ?fields=:
+    # con fields la página se lee con una sola consulta, sin la de los items
+    names = parse_fields(fields, Category, models.Category)
+    query = select_fields(models.Category, names, *PAGE_ORDER)
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    categories = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    if names is not None:
+        return fields_response(names, categories, response)
+    # Dos consultas por página: las categorías y los ids de todos sus items
+    return await with_item_ids(db, categories)
 
 @router.post("/", response_model=Category)
-def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
     db_category = models.Category(**category.dict())
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
-    return db_category
+    await db.commit()
+    await db.refresh(db_category)
+    return Category(id=db_category.id, name=db_category.name, description=db_category.description)
 
 @router.get("/{category_id}", response_model=Category)
-def read_category(category_id: int, db: Session = Depends(get_db)):
-    db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
+async def read_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_category = await db.get(models.Category, category_id)
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    return db_category
+    return (await with_item_ids(db, [db_category]))[0]
+
+@router.get("/{category_id}/items", response_model=List[CategoryItem])
+async def read_category_items(
+    category_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
+):
+    names = parse_fields(fields, CategoryItem, models.Item)
+    if await db.get(models.Category, category_id) is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    association = models.category_association
+    query = (
+        select_fields(models.Item, names, *ITEMS_PAGE_ORDER)
+        .join(association, association.c.item_id == models.Item.id)
+        .where(association.c.category_id == category_id)
+    )
+    query = paginate(query, *ITEMS_PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    items = set_next_cursor(response, rows, limit, *ITEMS_PAGE_ORDER)
+    return items if names is None else fields_response(names, items, response)
 
 @router.put("/{category_id}", response_model=Category)
-def update_category(category_id: int, category: CategoryCreate, db: Session = Depends(get_db)):
-    db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
+async def update_category(category_id: int, category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    db_category = await db.get(models.Category, category_id)
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    
+
     for key, value in category.dict().items():
         setattr(db_category, key, value)
-    
-    db.commit()
-    db.refresh(db_category)
-    return db_category
+
+    await db.commit()
+    return (await with_item_ids(db, [db_category]))[0]
 
 @router.delete("/{category_id}")
-def delete_category(category_id: int, db: Session = Depends(get_db)):
-    db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
-    if db_category is None:
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Asociaciones y categoría se borran con dos sentencias, sin cargar los items
+    association = models.category_association
+    await db.execute(delete(association).where(association.c.category_id == category_id))
+    deleted = (await db.execute(
+        delete(models.Category).where(models.Category.id == category_id).returning(models.Category.id)
+    )).first()
+    if deleted is None:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Category not found")
-    
-    db.delete(db_category)
-    db.commit()
-    return {"message": "Category deleted successfully"} 
\ No newline at end of file
+
+    await db.commit()
+    return {"message": "Category deleted successfully"}
@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_one, fetch_rows, fields_response, parse_fields, select_fields
+from bulk import BulkResult, bulk_upsert, content_hash
+from projection import detach_catalog, sync_catalog
+from filters import MATCH_PATTERN, array_filter
 import models
 from pydantic import BaseModel
 from datetime import datetime
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.Food.nombre, models.Food.id)
+
 class PlatoTipicoBase(BaseModel):
     nombre: str
     categoria: str
@@ -29,93 +38,101 @@ class PlatoTipico(PlatoTipicoBase):
         from_attributes = True
 
 @router.get("/", response_model=List[PlatoTipico])
-def get_platos(
+async def get_platos(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     categoria: Optional[str] = None,
-    db: Session = Depends(get_db)
+    ingrediente: Optional[List[str]] = Query(None, description="Ingrediente requerido (repetible)"),
+    match: str = Query("all", pattern=MATCH_PATTERN, description="all: todos los ingredientes, any: alguno"),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(models.Food)
+    names = parse_fields(fields, PlatoTipico, models.Food)
+    query = select_fields(models.Food, names, models.Food.nombre, models.Food.id)
     
     if categoria:
         query = query.filter(models.Food.categoria == categoria)
+    if ingrediente:
+        query = query.filter(array_filter(models.Food.ingredientes, ingrediente, match, db.bind.dialect.name))
         
-    platos = query.offset(skip).limit(limit).all()
-    
-    # Convertir los ingredientes de string a lista
-    for plato in platos:
-        if isinstance(plato.ingredientes, str):
-            plato.ingredientes = plato.ingredientes.split(",")
-    
-    return platos
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    platos = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return platos if names is None else fields_response(names, platos, response)
 
 @router.post("/", response_model=PlatoTipico)
-def create_plato(plato: PlatoTipicoCreate, db: Session = Depends(get_db)):
-    # Convertir la lista de ingredientes a string para almacenamiento
-    ingredientes_str = ",".join(plato.ingredientes)
-    
+async def create_plato(plato: PlatoTipicoCreate, db: AsyncSession = Depends(get_async_db)):
     db_plato = models.Food(
         nombre=plato.nombre,
         categoria=plato.categoria,
         descripcion=plato.descripcion,
-        ingredientes=ingredientes_str,
+        ingredientes=plato.ingredientes,
         imagen=plato.imagen,
         preparacion=plato.preparacion,
         donde_probar=plato.donde_probar,
         latitud=plato.latitud,
-        longitud=plato.longitud
+        longitud=plato.longitud,
+        # Misma huella que las cargas masivas (bulk.py), para que su upsert detecte cambios
+        content_hash=content_hash(plato.model_dump(mode="json"))
     )
     db.add(db_plato)
-    db.commit()
-    db.refresh(db_plato)
-    
-    # Convertir ingredientes de vuelta a lista para la respuesta
-    db_plato.ingredientes = db_plato.ingredientes.split(",")
+    # La clave natural es única (ver bulk.NATURAL_KEYS): un duplicado es un conflicto
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Food, [db_plato.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Ya existe un plato con ese nombre")
+    await db.refresh(db_plato)
     return db_plato
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_platos(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Crea o actualiza platos en bloque (array JSON o NDJSON) por su clave natural."""
+    return await bulk_upsert(request, db, models.Food, PlatoTipicoCreate)
+
 @router.get("/{plato_id}", response_model=PlatoTipico)
-def get_plato(plato_id: int, db: Session = Depends(get_db)):
-    plato = db.query(models.Food).filter(models.Food.id == plato_id).first()
+async def get_plato(plato_id: int, fields: Optional[str] = FIELDS_QUERY, db: AsyncSession = Depends(get_async_db)):
+    names = parse_fields(fields, PlatoTipico, models.Food)
+    plato = await fetch_one(db, models.Food, plato_id, names)
     
     if plato is None:
         raise HTTPException(status_code=404, detail="Plato no encontrado")
     
-    # Convertir ingredientes de string a lista
-    if isinstance(plato.ingredientes, str):
-        plato.ingredientes = plato.ingredientes.split(",")
-    
-    return plato
+    return plato if names is None else fields_response(names, plato)
 
 @router.put("/{plato_id}", response_model=PlatoTipico)
-def update_plato(plato_id: int, plato: PlatoTipicoCreate, db: Session = Depends(get_db)):
-    db_plato = db.query(models.Food).filter(models.Food.id == plato_id).first()
+async def update_plato(plato_id: int, plato: PlatoTipicoCreate, db: AsyncSession = Depends(get_async_db)):
+    db_plato = await db.get(models.Food, plato_id)
     
     if db_plato is None:
         raise HTTPException(status_code=404, detail="Plato no encontrado")
     
-    # Convertir la lista de ingredientes a string
-    ingredientes_str = ",".join(plato.ingredientes)
-    
     for key, value in plato.dict().items():
-        if key == "ingredientes":
-            setattr(db_plato, key, ingredientes_str)
-        else:
-            setattr(db_plato, key, value)
-    
-    db.commit()
-    db.refresh(db_plato)
+        setattr(db_plato, key, value)
+    db_plato.content_hash = content_hash(plato.model_dump(mode="json"))
     
-    # Convertir ingredientes de vuelta a lista para la respuesta
-    db_plato.ingredientes = db_plato.ingredientes.split(",")
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Food, [db_plato.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Ya existe un plato con ese nombre")
+    await db.refresh(db_plato)
     return db_plato
 
 @router.delete("/{plato_id}")
-def delete_plato(plato_id: int, db: Session = Depends(get_db)):
-    db_plato = db.query(models.Food).filter(models.Food.id == plato_id).first()
+async def delete_plato(plato_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_plato = await db.get(models.Food, plato_id)
     
     if db_plato is None:
         raise HTTPException(status_code=404, detail="Plato no encontrado")
     
-    db.delete(db_plato)
-    db.commit()
+    await db.delete(db_plato)
+    await detach_catalog(db, models.Food, [db_plato.id])
+    await db.commit()
     return {"message": "Plato eliminado correctamente"} 
\ No newline at end of file
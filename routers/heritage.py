@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_one, fetch_rows, fields_response, parse_fields, select_fields
+from bulk import BulkResult, bulk_upsert, content_hash
+from projection import detach_catalog, sync_catalog
 import models
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.Heritage.name, models.Heritage.id)
+
 class HeritageBase(BaseModel):
     name: str
     description: str
@@ -37,22 +45,28 @@ class Heritage(HeritageBase):
         from_attributes = True
 
 @router.get("/", response_model=List[Heritage])
-def get_heritage_sites(
+async def get_heritage_sites(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     period: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(models.Heritage)
+    names = parse_fields(fields, Heritage, models.Heritage)
+    query = select_fields(models.Heritage, names, models.Heritage.name, models.Heritage.id)
     
     if period:
         query = query.filter(models.Heritage.period == period)
         
-    sites = query.offset(skip).limit(limit).all()
-    return sites
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    sites = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return sites if names is None else fields_response(names, sites, response)
 
 @router.post("/", response_model=Heritage)
-def create_heritage_site(site: HeritageCreate, db: Session = Depends(get_db)):
+async def create_heritage_site(site: HeritageCreate, db: AsyncSession = Depends(get_async_db)):
     db_site = models.Heritage(
         name=site.name,
         description=site.description,
@@ -67,23 +81,38 @@ def create_heritage_site(site: HeritageCreate, db: Session = Depends(get_db)):
         longitude=site.longitude,
         entrance_fee=site.entrance_fee,
         accessibility=site.accessibility,
-        guided_tours=site.guided_tours
+        guided_tours=site.guided_tours,
+        # Misma huella que las cargas masivas (bulk.py), para que su upsert detecte cambios
+        content_hash=content_hash(site.model_dump(mode="json"))
     )
     db.add(db_site)
-    db.commit()
-    db.refresh(db_site)
+    # La clave natural es única (ver bulk.NATURAL_KEYS): un duplicado es un conflicto
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Heritage, [db_site.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A heritage site with that name already exists")
+    await db.refresh(db_site)
     return db_site
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_heritage_sites(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Crea o actualiza lugares de patrimonio en bloque (array JSON o NDJSON) por su clave natural."""
+    return await bulk_upsert(request, db, models.Heritage, HeritageCreate)
+
 @router.get("/{site_id}", response_model=Heritage)
-def get_heritage_site(site_id: int, db: Session = Depends(get_db)):
-    site = db.query(models.Heritage).filter(models.Heritage.id == site_id).first()
+async def get_heritage_site(site_id: int, fields: Optional[str] = FIELDS_QUERY, db: AsyncSession = Depends(get_async_db)):
+    names = parse_fields(fields, Heritage, models.Heritage)
+    site = await fetch_one(db, models.Heritage, site_id, names)
     if site is None:
         raise HTTPException(status_code=404, detail="Heritage site not found")
-    return site
+    return site if names is None else fields_response(names, site)
 
 @router.put("/{site_id}", response_model=Heritage)
-def update_heritage_site(site_id: int, site: HeritageCreate, db: Session = Depends(get_db)):
-    db_site = db.query(models.Heritage).filter(models.Heritage.id == site_id).first()
+async def update_heritage_site(site_id: int, site: HeritageCreate, db: AsyncSession = Depends(get_async_db)):
+    db_site = await db.get(models.Heritage, site_id)
     if db_site is None:
         raise HTTPException(status_code=404, detail="Heritage site not found")
     
@@ -92,17 +121,25 @@ def update_heritage_site(site_id: int, site: HeritageCreate, db: Session = Depen
             setattr(db_site, key, str(value))
         else:
             setattr(db_site, key, value)
+    db_site.content_hash = content_hash(site.model_dump(mode="json"))
     
-    db.commit()
-    db.refresh(db_site)
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Heritage, [db_site.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A heritage site with that name already exists")
+    await db.refresh(db_site)
     return db_site
 
 @router.delete("/{site_id}")
-def delete_heritage_site(site_id: int, db: Session = Depends(get_db)):
-    db_site = db.query(models.Heritage).filter(models.Heritage.id == site_id).first()
+async def delete_heritage_site(site_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_site = await db.get(models.Heritage, site_id)
     if db_site is None:
         raise HTTPException(status_code=404, detail="Heritage site not found")
     
-    db.delete(db_site)
-    db.commit()
+    await db.delete(db_site)
+    await detach_catalog(db, models.Heritage, [db_site.id])
+    await db.commit()
     return {"message": "Heritage site deleted successfully"} 
\ No newline at end of file
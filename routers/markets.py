@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_one, fetch_rows, fields_response, parse_fields, select_fields
+from bulk import BulkResult, bulk_upsert, content_hash
+from projection import detach_catalog, sync_catalog
 import models
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.LocalMarket.name, models.LocalMarket.id)
+
 class LocalMarketBase(BaseModel):
     name: str
     location: str
@@ -33,22 +41,28 @@ class LocalMarket(LocalMarketBase):
         from_attributes = True
 
 @router.get("/", response_model=List[LocalMarket])
-def get_markets(
+async def get_markets(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(models.LocalMarket)
+    names = parse_fields(fields, LocalMarket, models.LocalMarket)
+    query = select_fields(models.LocalMarket, names, models.LocalMarket.name, models.LocalMarket.id)
     
     if location:
         query = query.filter(models.LocalMarket.location == location)
         
-    markets = query.offset(skip).limit(limit).all()
-    return markets
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    markets = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return markets if names is None else fields_response(names, markets, response)
 
 @router.post("/", response_model=LocalMarket)
-def create_market(market: LocalMarketCreate, db: Session = Depends(get_db)):
+async def create_market(market: LocalMarketCreate, db: AsyncSession = Depends(get_async_db)):
     db_market = models.LocalMarket(
         name=market.name,
         location=market.location,
@@ -59,23 +73,38 @@ def create_market(market: LocalMarketCreate, db: Session = Depends(get_db)):
         description=market.description,
         image=market.image,
         latitude=market.latitude,
-        longitude=market.longitude
+        longitude=market.longitude,
+        # Misma huella que las cargas masivas (bulk.py), para que su upsert detecte cambios
+        content_hash=content_hash(market.model_dump(mode="json"))
     )
     db.add(db_market)
-    db.commit()
-    db.refresh(db_market)
+    # La clave natural es única (ver bulk.NATURAL_KEYS): un duplicado es un conflicto
+    try:
+        await db.flush()
+        await sync_catalog(db, models.LocalMarket, [db_market.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A local market with that name already exists in that location")
+    await db.refresh(db_market)
     return db_market
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_markets(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Crea o actualiza mercados en bloque (array JSON o NDJSON) por su clave natural."""
+    return await bulk_upsert(request, db, models.LocalMarket, LocalMarketCreate)
+
 @router.get("/{market_id}", response_model=LocalMarket)
-def get_market(market_id: int, db: Session = Depends(get_db)):
-    market = db.query(models.LocalMarket).filter(models.LocalMarket.id == market_id).first()
+async def get_market(market_id: int, fields: Optional[str] = FIELDS_QUERY, db: AsyncSession = Depends(get_async_db)):
+    names = parse_fields(fields, LocalMarket, models.LocalMarket)
+    market = await fetch_one(db, models.LocalMarket, market_id, names)
     if market is None:
         raise HTTPException(status_code=404, detail="Local market not found")
-    return market
+    return market if names is None else fields_response(names, market)
 
 @router.put("/{market_id}", response_model=LocalMarket)
-def update_market(market_id: int, market: LocalMarketCreate, db: Session = Depends(get_db)):
-    db_market = db.query(models.LocalMarket).filter(models.LocalMarket.id == market_id).first()
+async def update_market(market_id: int, market: LocalMarketCreate, db: AsyncSession = Depends(get_async_db)):
+    db_market = await db.get(models.LocalMarket, market_id)
     if db_market is None:
         raise HTTPException(status_code=404, detail="Local market not found")
     
@@ -84,17 +113,25 @@ def update_market(market_id: int, market: LocalMarketCreate, db: Session = Depen
             setattr(db_market, key, str(value))
         else:
             setattr(db_market, key, value)
+    db_market.content_hash = content_hash(market.model_dump(mode="json"))
     
-    db.commit()
-    db.refresh(db_market)
+    try:
+        await db.flush()
+        await sync_catalog(db, models.LocalMarket, [db_market.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A local market with that name already exists in that location")
+    await db.refresh(db_market)
     return db_market
 
 @router.delete("/{market_id}")
-def delete_market(market_id: int, db: Session = Depends(get_db)):
-    db_market = db.query(models.LocalMarket).filter(models.LocalMarket.id == market_id).first()
+async def delete_market(market_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_market = await db.get(models.LocalMarket, market_id)
     if db_market is None:
         raise HTTPException(status_code=404, detail="Local market not found")
     
-    db.delete(db_market)
-    db.commit()
+    await db.delete(db_market)
+    await detach_catalog(db, models.LocalMarket, [db_market.id])
+    await db.commit()
     return {"message": "Local market deleted successfully"} 
\ No newline at end of file
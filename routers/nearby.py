@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+import models
+from pydantic import BaseModel
+import math
+
+router = APIRouter()
+
+EARTH_RADIUS_M = 6371008.8
+
+# Tipo de POI -> (modelo, nombre, imagen, latitud, longitud)
+POI_SOURCES = {
+    "playas": (models.Beach, models.Beach.nombre, models.Beach.imagen,
+               models.Beach.latitud, models.Beach.longitud),
+    "food": (models.Food, models.Food.nombre, models.Food.imagen,
+             models.Food.latitud, models.Food.longitud),
+    "restaurants": (models.Restaurant, models.Restaurant.nombre, models.Restaurant.imagen,
+                    models.Restaurant.latitud, models.Restaurant.longitud),
+    "markets": (models.LocalMarket, models.LocalMarket.name, models.LocalMarket.image,
+                models.LocalMarket.latitude, models.LocalMarket.longitude),
+    "heritage": (models.Heritage, models.Heritage.name, models.Heritage.image,
+                 models.Heritage.latitude, models.Heritage.longitude),
+}
+
+class NearbyPlace(BaseModel):
+    tipo: str
+    id: int
+    nombre: str
+    imagen: Optional[str] = None
+    latitud: float
+    longitud: float
+    distancia: float  # metros
+
+def parse_types(types):
+    if not types:
+        return list(POI_SOURCES)
+    tipos = [t.strip() for t in types.split(",") if t.strip()]
+    unknown = [t for t in tipos if t not in POI_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipos no válidos: {', '.join(unknown)}. Valores posibles: {', '.join(POI_SOURCES)}"
+        )
+    return tipos
+
+def bounding_box(lat, lon, radius):
+    # Rectángulo que contiene el círculo de búsqueda, en grados
+    lat_delta = math.degrees(radius / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    lon_delta = min(math.degrees(radius / (EARTH_RADIUS_M * cos_lat)), 180.0)
+    return lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta
+
+def haversine_distance(dialect_name, lat, lon, latitud, longitud):
+    """Distancia en metros desde (lat, lon), calculada por la base de datos.
+
+    En SQLite necesita las funciones matemáticas (3.35+, activas en las
+    compilaciones habituales).
+    """
+    lat0 = math.radians(lat)
+    lon0 = math.radians(lon)
+    plat = func.radians(latitud)
+    a = (
+        func.power(func.sin((plat - lat0) * 0.5), 2)
+        + math.cos(lat0) * func.cos(plat) * func.power(func.sin((func.radians(longitud) - lon0) * 0.5), 2)
+    )
+    # min() de dos argumentos es el least() de SQLite
+    clamp = func.least if dialect_name == "postgresql" else func.min
+    return 2 * EARTH_RADIUS_M * func.asin(func.sqrt(clamp(a, 1.0)))
+
+@router.get("/", response_model=List[NearbyPlace])
+async def get_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: float = Query(2000, gt=0, le=50000, description="Radio en metros"),
+    types: Optional[str] = Query(None, description="Tipos separados por comas"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    tipos = parse_types(types)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius)
+
+    # Prefiltro por bounding box sobre los índices (latitud, longitud) de cada
+    # tabla; la distancia, el radio, el orden y el límite se resuelven en la
+    # misma consulta y solo llegan a Python las filas de la respuesta
+    dialect_name = db.bind.dialect.name
+    selects = []
+    for tipo in tipos:
+        model, nombre, imagen, latitud, longitud = POI_SOURCES[tipo]
+        selects.append(
+            select(
+                literal(tipo).label("tipo"),
+                model.id.label("id"),
+                nombre.label("nombre"),
+                imagen.label("imagen"),
+                latitud.label("latitud"),
+                longitud.label("longitud"),
+                haversine_distance(dialect_name, lat, lon, latitud, longitud).label("distancia"),
+            ).where(
+                latitud.between(min_lat, max_lat),
+                longitud.between(min_lon, max_lon),
+            )
+        )
+    candidates = union_all(*selects).subquery()
+    query = (
+        select(candidates)
+        .where(candidates.c.distancia <= radius)
+        .order_by(candidates.c.distancia, candidates.c.tipo, candidates.c.id)
+        .limit(limit)
+    )
+    rows = (await db.execute(query)).all()
+
+    return [dict(row._mapping, distancia=round(row.distancia, 1)) for row in rows]
@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_one, fetch_rows, fields_response, parse_fields, select_fields
+from bulk import BulkResult, bulk_upsert, content_hash
+from projection import detach_catalog, sync_catalog
+from filters import MATCH_PATTERN, array_filter
 import models
 from pydantic import BaseModel
 from datetime import datetime
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.Beach.nombre, models.Beach.id)
+
 class BeachBase(BaseModel):
     nombre: str
     imagen: str
@@ -34,34 +43,35 @@ class Beach(BeachBase):
         from_attributes = True
 
 @router.get("/", response_model=List[Beach])
-def get_playas(
+async def get_playas(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     zona: Optional[str] = None,
     destacado: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    servicio: Optional[List[str]] = Query(None, description="Servicio requerido (repetible)"),
+    match: str = Query("all", pattern=MATCH_PATTERN, description="all: todos los servicios, any: alguno"),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(models.Beach)
+    names = parse_fields(fields, Beach, models.Beach)
+    query = select_fields(models.Beach, names, models.Beach.nombre, models.Beach.id)
     
     if zona:
         query = query.filter(models.Beach.zona == zona)
     if destacado is not None:
         query = query.filter(models.Beach.destacado == destacado)
+    if servicio:
+        query = query.filter(array_filter(models.Beach.servicios, servicio, match, db.bind.dialect.name))
         
-    playas = query.offset(skip).limit(limit).all()
-    
-    # Convertir los servicios de string a lista
-    for playa in playas:
-        if isinstance(playa.servicios, str):
-            playa.servicios = playa.servicios.split(",")
-    
-    return playas
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    playas = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return playas if names is None else fields_response(names, playas, response)
 
 @router.post("/", response_model=Beach)
-def create_playa(playa: BeachCreate, db: Session = Depends(get_db)):
-    # Convertir la lista de servicios a string para almacenamiento
-    servicios_str = ",".join(playa.servicios)
-    
+async def create_playa(playa: BeachCreate, db: AsyncSession = Depends(get_async_db)):
     db_playa = models.Beach(
         nombre=playa.nombre,
         imagen=playa.imagen,
@@ -69,63 +79,70 @@ def create_playa(playa: BeachCreate, db: Session = Depends(get_db)):
         zona=playa.zona,
         pueblo=playa.pueblo,
         tipo=playa.tipo,
-        servicios=servicios_str,
+        servicios=playa.servicios,
         acceso=playa.acceso,
         destacado=playa.destacado,
         latitud=playa.latitud,
-        longitud=playa.longitud
+        longitud=playa.longitud,
+        # Misma huella que las cargas masivas (bulk.py), para que su upsert detecte cambios
+        content_hash=content_hash(playa.model_dump(mode="json"))
     )
     db.add(db_playa)
-    db.commit()
-    db.refresh(db_playa)
-    
-    # Convertir servicios de vuelta a lista para la respuesta
-    db_playa.servicios = db_playa.servicios.split(",")
+    # La clave natural es única (ver bulk.NATURAL_KEYS): un duplicado es un conflicto
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Beach, [db_playa.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Ya existe una playa con ese nombre en ese pueblo")
+    await db.refresh(db_playa)
     return db_playa
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_playas(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Crea o actualiza playas en bloque (array JSON o NDJSON) por su clave natural."""
+    return await bulk_upsert(request, db, models.Beach, BeachCreate)
+
 @router.get("/{playa_id}", response_model=Beach)
-def get_playa(playa_id: int, db: Session = Depends(get_db)):
-    playa = db.query(models.Beach).filter(models.Beach.id == playa_id).first()
+async def get_playa(playa_id: int, fields: Optional[str] = FIELDS_QUERY, db: AsyncSession = Depends(get_async_db)):
+    names = parse_fields(fields, Beach, models.Beach)
+    playa = await fetch_one(db, models.Beach, playa_id, names)
     
     if playa is None:
         raise HTTPException(status_code=404, detail="Playa no encontrada")
     
-    # Convertir servicios de string a lista
-    if isinstance(playa.servicios, str):
-        playa.servicios = playa.servicios.split(",")
-    
-    return playa
+    return playa if names is None else fields_response(names, playa)
 
 @router.put("/{playa_id}", response_model=Beach)
-def update_playa(playa_id: int, playa: BeachCreate, db: Session = Depends(get_db)):
-    db_playa = db.query(models.Beach).filter(models.Beach.id == playa_id).first()
+async def update_playa(playa_id: int, playa: BeachCreate, db: AsyncSession = Depends(get_async_db)):
+    db_playa = await db.get(models.Beach, playa_id)
     
     if db_playa is None:
         raise HTTPException(status_code=404, detail="Playa no encontrada")
     
-    # Convertir la lista de servicios a string
-    servicios_str = ",".join(playa.servicios)
-    
     for key, value in playa.dict().items():
-        if key == "servicios":
-            setattr(db_playa, key, servicios_str)
-        else:
-            setattr(db_playa, key, value)
-    
-    db.commit()
-    db.refresh(db_playa)
+        setattr(db_playa, key, value)
+    db_playa.content_hash = content_hash(playa.model_dump(mode="json"))
     
-    # Convertir servicios de vuelta a lista para la respuesta
-    db_playa.servicios = db_playa.servicios.split(",")
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Beach, [db_playa.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Ya existe una playa con ese nombre en ese pueblo")
+    await db.refresh(db_playa)
     return db_playa
 
 @router.delete("/{playa_id}")
-def delete_playa(playa_id: int, db: Session = Depends(get_db)):
-    db_playa = db.query(models.Beach).filter(models.Beach.id == playa_id).first()
+async def delete_playa(playa_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_playa = await db.get(models.Beach, playa_id)
     
     if db_playa is None:
         raise HTTPException(status_code=404, detail="Playa no encontrada")
     
-    db.delete(db_playa)
-    db.commit()
+    await db.delete(db_playa)
+    await detach_catalog(db, models.Beach, [db_playa.id])
+    await db.commit()
     return {"message": "Playa eliminada correctamente"} 
\ No newline at end of file
@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_one, fetch_rows, fields_response, parse_fields, select_fields
+from bulk import BulkResult, bulk_upsert, content_hash
+from projection import detach_catalog, sync_catalog
 import models
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(models.Restaurant.nombre, models.Restaurant.id)
+
 class RestaurantBase(BaseModel):
     nombre: str
     ubicacion: str
@@ -36,15 +44,19 @@ class Restaurant(RestaurantBase):
         from_attributes = True
 
 @router.get("/", response_model=List[Restaurant])
-def get_restaurants(
+async def get_restaurants(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ubicacion: Optional[str] = None,
     tipo: Optional[str] = None,
     precio: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(models.Restaurant)
+    names = parse_fields(fields, Restaurant, models.Restaurant)
+    query = select_fields(models.Restaurant, names, models.Restaurant.nombre, models.Restaurant.id)
     
     if ubicacion:
         query = query.filter(models.Restaurant.ubicacion == ubicacion)
@@ -53,11 +65,13 @@ def get_restaurants(
     if precio:
         query = query.filter(models.Restaurant.precio == precio)
         
-    restaurants = query.offset(skip).limit(limit).all()
-    return restaurants
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    restaurants = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return restaurants if names is None else fields_response(names, restaurants, response)
 
 @router.post("/", response_model=Restaurant)
-def create_restaurant(restaurant: RestaurantCreate, db: Session = Depends(get_db)):
+async def create_restaurant(restaurant: RestaurantCreate, db: AsyncSession = Depends(get_async_db)):
     db_restaurant = models.Restaurant(
         nombre=restaurant.nombre,
         ubicacion=restaurant.ubicacion,
@@ -71,23 +85,38 @@ def create_restaurant(restaurant: RestaurantCreate, db: Session = Depends(get_db
         telefono=restaurant.telefono,
         imagen=restaurant.imagen,
         latitud=restaurant.latitud,
-        longitud=restaurant.longitud
+        longitud=restaurant.longitud,
+        # Misma huella que las cargas masivas (bulk.py), para que su upsert detecte cambios
+        content_hash=content_hash(restaurant.model_dump(mode="json"))
     )
     db.add(db_restaurant)
-    db.commit()
-    db.refresh(db_restaurant)
+    # La clave natural es única (ver bulk.NATURAL_KEYS): un duplicado es un conflicto
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Restaurant, [db_restaurant.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A restaurant with that name already exists in that location")
+    await db.refresh(db_restaurant)
     return db_restaurant
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_restaurants(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Crea o actualiza restaurantes en bloque (array JSON o NDJSON) por su clave natural."""
+    return await bulk_upsert(request, db, models.Restaurant, RestaurantCreate)
+
 @router.get("/{restaurant_id}", response_model=Restaurant)
-def get_restaurant(restaurant_id: int, db: Session = Depends(get_db)):
-    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+async def get_restaurant(restaurant_id: int, fields: Optional[str] = FIELDS_QUERY, db: AsyncSession = Depends(get_async_db)):
+    names = parse_fields(fields, Restaurant, models.Restaurant)
+    restaurant = await fetch_one(db, models.Restaurant, restaurant_id, names)
     if restaurant is None:
         raise HTTPException(status_code=404, detail="Restaurant not found")
-    return restaurant
+    return restaurant if names is None else fields_response(names, restaurant)
 
 @router.put("/{restaurant_id}", response_model=Restaurant)
-def update_restaurant(restaurant_id: int, restaurant: RestaurantCreate, db: Session = Depends(get_db)):
-    db_restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+async def update_restaurant(restaurant_id: int, restaurant: RestaurantCreate, db: AsyncSession = Depends(get_async_db)):
+    db_restaurant = await db.get(models.Restaurant, restaurant_id)
     if db_restaurant is None:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
@@ -96,17 +125,25 @@ def update_restaurant(restaurant_id: int, restaurant: RestaurantCreate, db: Sess
             setattr(db_restaurant, key, str(value))
         else:
             setattr(db_restaurant, key, value)
+    db_restaurant.content_hash = content_hash(restaurant.model_dump(mode="json"))
     
-    db.commit()
-    db.refresh(db_restaurant)
+    try:
+        await db.flush()
+        await sync_catalog(db, models.Restaurant, [db_restaurant.id])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A restaurant with that name already exists in that location")
+    await db.refresh(db_restaurant)
     return db_restaurant
 
 @router.delete("/{restaurant_id}")
-def delete_restaurant(restaurant_id: int, db: Session = Depends(get_db)):
-    db_restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+async def delete_restaurant(restaurant_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_restaurant = await db.get(models.Restaurant, restaurant_id)
     if db_restaurant is None:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
-    db.delete(db_restaurant)
-    db.commit()
+    await db.delete(db_restaurant)
+    await detach_catalog(db, models.Restaurant, [db_restaurant.id])
+    await db.commit()
     return {"message": "Restaurant deleted successfully"} 
\ No newline at end of file
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from database import get_async_db
+from pagination import keyset, paginate, set_next_cursor
+from fields import FIELDS_QUERY, fetch_rows, fields_response, parse_fields, select_fields
 import models
 from pydantic import BaseModel
 from datetime import datetime
 
 router = APIRouter()
 
+# Orden de la paginación por clave (ver pagination.keyset)
+PAGE_ORDER = keyset(None, models.Review.id)
+
 class ReviewBase(BaseModel):
     rating: int
     comment: str
@@ -23,48 +29,151 @@ class Review(ReviewBase):
     class Config:
         from_attributes = True
 
+class ItemRating(BaseModel):
+    item_id: int
+    nombre: Optional[str] = None
+    tipo: Optional[str] = None
+    rating_count: int
+    rating_avg: Optional[float] = None
+    histogram: Dict[int, int]
+
+def item_rating(item):
+    return ItemRating(
+        item_id=item.id,
+        nombre=item.nombre,
+        tipo=item.tipo,
+        rating_count=item.rating_count,
+        rating_avg=item.rating_avg,
+        histogram={stars: getattr(item, f"stars_{stars}") for stars in range(1, 6)},
+    )
+
+def rating_delta(item_id, rating, sign):
+    """UPDATE atómico de los agregados de un item al añadir (+1) o quitar (-1) una reseña."""
+    item = models.Item
+    count = item.rating_count + sign
+    total = item.rating_sum + sign * rating
+    values = {
+        "rating_count": count,
+        "rating_sum": total,
+        # SET usa los valores previos de la fila, así que la media sale de los nuevos totales
+        "rating_avg": case((count > 0, total * 1.0 / count), else_=None),
+    }
+    if 1 <= rating <= 5:
+        star = f"stars_{rating}"
+        values[star] = getattr(item, star) + sign
+    return (
+        update(item).where(item.id == item_id).values(**values).returning(item.id)
+        .execution_options(synchronize_session=False)
+    )
+
 @router.get("/", response_model=List[Review])
-def read_reviews(
+async def read_reviews(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     item_id: int = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(models.Review)
+    names = parse_fields(fields, Review, models.Review)
+    query = select_fields(models.Review, names, *PAGE_ORDER)
     if item_id:
         query = query.filter(models.Review.item_id == item_id)
-    return query.offset(skip).limit(limit).all()
+    # Las reseñas se ordenan solo por id: el cursor es el último id devuelto
+    query = paginate(query, *PAGE_ORDER, limit, skip, cursor)
+    rows = await fetch_rows(db, query, names)
+    reviews = set_next_cursor(response, rows, limit, *PAGE_ORDER)
+    return reviews if names is None else fields_response(names, reviews, response)
 
-@router.post("/", response_model=Review)
-def create_review(review: ReviewCreate, db: Session = Depends(get_db)):
-    # Verificar que el item existe
-    db_item = db.query(models.Item).filter(models.Item.id == review.item_id).first()
+@router.get("/top", response_model=List[ItemRating])
+async def top_rated(
+    tipo: Optional[str] = None,
+    min_reviews: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Recorre hacia atrás el índice parcial (tipo, rating_avg, id) de los items con reseñas
+    query = select(models.Item).filter(models.Item.rating_count > 0)
+    if tipo:
+        query = query.filter(models.Item.tipo == tipo)
+    if min_reviews > 1:
+        query = query.filter(models.Item.rating_count >= min_reviews)
+    query = query.order_by(models.Item.rating_avg.desc(), models.Item.id.desc()).limit(limit)
+    items = (await db.execute(query)).scalars().all()
+    return [item_rating(item) for item in items]
+
+@router.get("/items/{item_id}", response_model=ItemRating)
+async def read_item_rating(item_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_item = await db.get(models.Item, item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
-    
+    return item_rating(db_item)
+
+@router.post("/", response_model=Review)
+async def create_review(review: ReviewCreate, db: AsyncSession = Depends(get_async_db)):
     # Verificar que la calificación está entre 1 y 5
     if not 1 <= review.rating <= 5:
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
-    
+
+    # Actualizar los agregados del item; si no devuelve fila, el item no existe
+    updated = (await db.execute(rating_delta(review.item_id, review.rating, 1))).first()
+    if updated is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Item not found")
+
     db_review = models.Review(**review.dict())
     db.add(db_review)
-    db.commit()
-    db.refresh(db_review)
+    await db.commit()
+    await db.refresh(db_review)
     return db_review
 
 @router.get("/{review_id}", response_model=Review)
-def read_review(review_id: int, db: Session = Depends(get_db)):
-    db_review = db.query(models.Review).filter(models.Review.id == review_id).first()
+async def read_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_review = await db.get(models.Review, review_id)
     if db_review is None:
         raise HTTPException(status_code=404, detail="Review not found")
     return db_review
 
-@router.delete("/{review_id}")
-def delete_review(review_id: int, db: Session = Depends(get_db)):
-    db_review = db.query(models.Review).filter(models.Review.id == review_id).first()
+@router.put("/{review_id}", response_model=Review)
+async def update_review(review_id: int, review: ReviewCreate, db: AsyncSession = Depends(get_async_db)):
+    if not 1 <= review.rating <= 5:
+        raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
+
+    # FOR UPDATE: con dos ediciones simultáneas, la segunda espera y descuenta
+    # la valoración que dejó la primera, no la original
+    query = select(models.Review).where(models.Review.id == review_id).with_for_update()
+    db_review = (await db.execute(query)).scalar_one_or_none()
     if db_review is None:
         raise HTTPException(status_code=404, detail="Review not found")
-    
-    db.delete(db_review)
-    db.commit()
-    return {"message": "Review deleted successfully"} 
\ No newline at end of file
+
+    # Se quita la valoración anterior y se suma la nueva (puede cambiar de item)
+    if db_review.item_id is not None and db_review.rating is not None:
+        await db.execute(rating_delta(db_review.item_id, db_review.rating, -1))
+    updated = (await db.execute(rating_delta(review.item_id, review.rating, 1))).first()
+    if updated is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    for key, value in review.dict().items():
+        setattr(db_review, key, value)
+    await db.commit()
+    await db.refresh(db_review)
+    return db_review
+
+@router.delete("/{review_id}")
+async def delete_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
+    # DELETE ... RETURNING: si dos peticiones borran la misma reseña, solo una descuenta
+    query = (
+        delete(models.Review).where(models.Review.id == review_id)
+        .returning(models.Review.item_id, models.Review.rating)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = (await db.execute(query)).first()
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+
+    if deleted.item_id is not None and deleted.rating is not None:
+        await db.execute(rating_delta(deleted.item_id, deleted.rating, -1))
+    await db.commit()
+    return {"message": "Review deleted successfully"}
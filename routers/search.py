@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, literal, literal_column, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from search_index import DEFAULT_TYPES, SEARCH_SOURCES
+from pydantic import BaseModel
+import re
+
+router = APIRouter()
+
+class SearchResult(BaseModel):
+    tipo: str
+    id: int
+    nombre: Optional[str] = None
+    imagen: Optional[str] = None
+    rank: float
+
+def parse_types(types):
+    if not types:
+        return DEFAULT_TYPES
+    tipos = [t.strip() for t in types.split(",") if t.strip()]
+    unknown = [t for t in tipos if t not in SEARCH_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipos no válidos: {', '.join(unknown)}. Valores posibles: {', '.join(SEARCH_SOURCES)}"
+        )
+    return tipos
+
+async def search_postgresql(db, q, tipos, limit):
+    # Columnas tsvector generadas con índice GIN (ver search_index.py)
+    tsquery = func.websearch_to_tsquery("spanish", func.immutable_unaccent(q))
+    selects = []
+    for tipo in tipos:
+        model, nombre, _, imagen, required_column = SEARCH_SOURCES[tipo]
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        query = select(
+            literal(tipo).label("tipo"),
+            model.id.label("id"),
+            nombre.label("nombre"),
+            imagen.label("imagen"),
+            func.ts_rank_cd(vector, tsquery).label("rank"),
+        ).where(vector.op("@@")(tsquery))
+        if required_column is not None:
+            # Misma condición que el índice GIN parcial
+            query = query.where(required_column.is_not(None))
+        selects.append(query)
+    query = union_all(*selects).subquery()
+    query = select(query).order_by(query.c.rank.desc(), query.c.tipo, query.c.id).limit(limit)
+    return (await db.execute(query)).all()
+
+# Respaldo para desarrollo y tests en SQLite: índice FTS5 mantenido con triggers
+# (lo crean la migración 5d56c41beaff o create_schema, ver search_index.py)
+async def search_sqlite(db, q, tipos, limit):
+    # Cada término se pasa entre comillas para que FTS5 no interprete su sintaxis
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return []
+    match = " ".join(f'"{term}"' for term in terms)
+    placeholders = ", ".join(f":tipo_{i}" for i in range(len(tipos)))
+    params = {f"tipo_{i}": tipo for i, tipo in enumerate(tipos)}
+    query = text(
+        "SELECT tipo, ref_id AS id, nombre, imagen, -bm25(search_index, 0, 0, 0, 10.0, 1.0) AS rank "
+        f"FROM search_index WHERE search_index MATCH :match AND tipo IN ({placeholders}) "
+        "ORDER BY rank DESC LIMIT :limit"
+    )
+    return (await db.execute(query, {"match": match, "limit": limit, **params})).all()
+
+@router.get("/", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    types: Optional[str] = Query(None, description="Tipos separados por comas (catalog solo si se pide)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    tipos = parse_types(types)
+    if db.bind.dialect.name == "postgresql":
+        rows = await search_postgresql(db, q, tipos, limit)
+    else:
+        rows = await search_sqlite(db, q, tipos, limit)
+    return [row._mapping for row in rows]
@@ -1,8 +1,13 @@
+import os
+import threading
+import time
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import get_db
+from database import AsyncSessionLocal, get_async_db
 import models
 from pydantic import BaseModel
 from datetime import datetime, timedelta
@@ -17,6 +22,13 @@ SECRET_KEY = "tu_clave_secreta_aqui"  # En producción, usar variable de entorno
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# bcrypt tarda decenas de ms por hash: se calcula en hilos, con un máximo de
+# hashes simultáneos para que una ráfaga de logins no acapare la CPU
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Usuarios autenticados que se reutilizan sin consultar la base de datos
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -48,6 +60,60 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+_hash_limiter = None
+
+async def run_password_hash(func, *args):
+    """Ejecuta `func` (verify_password o get_password_hash) fuera del bucle de eventos."""
+    global _hash_limiter
+    if _hash_limiter is None:
+        _hash_limiter = anyio.CapacityLimiter(PASSWORD_HASH_WORKERS)
+    return await anyio.to_thread.run_sync(func, *args, limiter=_hash_limiter)
+
+class UserCache:
+    """Usuarios por email con caducidad corta, compartidos por las peticiones del proceso."""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        # Los eventos del ORM pueden llegar desde hilos del pool de la sesión síncrona
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        entry = self._entries.get(email)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self.invalidate(email)
+            return None
+        return user
+
+    def set(self, email, user):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Se descarta la entrada más antigua
+                self._entries.pop(next(iter(self._entries)), None)
+            self._entries[email] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, email):
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache(AUTH_USER_CACHE_TTL, AUTH_USER_CACHE_SIZE)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # Cualquier cambio de un usuario por el ORM lo saca de la caché (también
+    # el email anterior si se ha cambiado)
+    for email in [target.email, *inspect(target).attrs.email.history.deleted]:
+        user_cache.invalidate(email)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -58,7 +124,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -72,15 +138,27 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    user = user_cache.get(token_data.email)
     if user is None:
-        raise credentials_exception
+        # La sesión solo se abre en un fallo de caché: un acierto no toca la base de datos
+        async with AsyncSessionLocal() as db:
+            query = select(models.User).filter(models.User.email == token_data.email)
+            db_user = (await db.execute(query)).scalars().first()
+            if db_user is None:
+                raise credentials_exception
+            # Se guarda una copia desligada de la sesión, sin el hash de la contraseña
+            user = User.model_validate(db_user)
+        user_cache.set(token_data.email, user)
     return user
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    query = select(models.User.email, models.User.hashed_password).filter(models.User.email == form_data.username)
+    user = (await db.execute(query)).first()
+    # La conexión vuelve al pool antes de esperar turno para bcrypt: una ráfaga
+    # de logins no debe agotar el pool mientras hace cola en los hilos
+    await db.close()
+    if not user or not await run_password_hash(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -93,22 +171,25 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/", response_model=User)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    query = select(models.User).filter(models.User.email == user.email)
+    db_user = (await db.execute(query)).scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    await db.close()
     
-    hashed_password = get_password_hash(user.password)
+    # bcrypt es costoso: se calcula fuera del bucle de eventos
+    hashed_password = await run_password_hash(get_password_hash, user.password)
     db_user = models.User(
         email=user.email,
         full_name=user.full_name,
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.get("/me", response_model=User)
-async def read_users_me(current_user: models.User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user 
\ No newline at end of file
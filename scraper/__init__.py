@@ -0,0 +1,3 @@
+from scraper.core import OFFLINE_FIXTURES, SECTIONS, MallorcaScraper
+
+__all__ = ["MallorcaScraper", "OFFLINE_FIXTURES", "SECTIONS"]
@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import json
+import time
+
+from scraper.core import OFFLINE_FIXTURES, SECTIONS, MallorcaScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper de la guía de Mallorca")
+    parser.add_argument("sections", nargs="*", help=f"Secciones ({', '.join(SECTIONS)}); por defecto todas")
+    parser.add_argument("--offline", action="store_true", help="Usar el HTML grabado en fixtures/html")
+    parser.add_argument("--cache-dir", help="Directorio de la caché HTTP")
+    parser.add_argument("--workers", type=int, help="Procesos para parsear (0 = sin pool)")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones para medir la caché")
+    parser.add_argument("--output", help="Guardar el resultado como JSON")
+    args = parser.parse_args()
+    unknown = [s for s in args.sections if s not in SECTIONS]
+    if unknown:
+        parser.error(f"secciones no válidas: {', '.join(unknown)}")
+
+    options = {}
+    if args.offline:
+        options["fixtures_dir"] = OFFLINE_FIXTURES
+    if args.cache_dir:
+        options["cache_dir"] = args.cache_dir
+    if args.workers is not None:
+        options["parse_workers"] = args.workers
+
+    with MallorcaScraper(**options) as scraper:
+        for run in range(args.repeat):
+            start = time.perf_counter()
+            results = asyncio.run(scraper.scrape(*args.sections))
+            elapsed = time.perf_counter() - start
+            counts = ", ".join(f"{section}: {len(items)}" for section, items in results.items())
+            print(f"Ejecución {run + 1}: {counts} en {elapsed:.2f}s {scraper.stats}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
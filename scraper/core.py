@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin
+
+import httpx
+
+from scraper.http import Fetcher, HttpCache, fixture_transport
+from scraper.parsers import parse_beach, parse_food, parse_links, parse_monument
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_BASE_URL = os.getenv("SCRAPER_BASE_URL", "https://guia.mallorcaparaiso.local")
+SCRAPER_FIXTURES_DIR = os.getenv("SCRAPER_FIXTURES_DIR")
+# HTML grabado para trabajar sin red
+OFFLINE_FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "html"
+# 0 = parsear en el propio proceso (útil para depurar)
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Sección -> (ruta del listado, parser de la ficha)
+SECTIONS = {
+    "playas": ("/playas/", parse_beach),
+    "monumentos": ("/monumentos/", parse_monument),
+    "gastronomia": ("/gastronomia/", parse_food),
+}
+
+
+class MallorcaScraper:
+    """Scraper de la guía de Mallorca.
+
+    Descarga en paralelo (con límite por host) y parsea en un pool de procesos.
+    Con `fixtures_dir` no usa la red y lee el HTML grabado en disco.
+    """
+
+    def __init__(self, base_url=SCRAPER_BASE_URL, fixtures_dir=SCRAPER_FIXTURES_DIR,
+                 cache_dir=None, parse_workers=SCRAPER_PARSE_WORKERS):
+        self.base_url = base_url
+        self.fixtures_dir = fixtures_dir
+        self.cache_dir = cache_dir
+        self.parse_workers = parse_workers
+        self._pool = None
+        self.stats = {}
+
+    def _executor(self):
+        if self.parse_workers and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._pool
+
+    async def _parse(self, parser, html, url):
+        if not self.parse_workers:
+            return parser(html, url)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), parser, html, url)
+
+    def _fetcher(self):
+        transport = fixture_transport(self.fixtures_dir) if self.fixtures_dir else None
+        cache = HttpCache(self.cache_dir) if self.cache_dir else HttpCache()
+        return Fetcher(transport=transport, cache=cache)
+
+    async def _scrape_detail(self, fetcher, parser, url):
+        try:
+            html = await fetcher.fetch(url)
+            return await self._parse(parser, html, url)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("No se pudo procesar %s: %s", url, e)
+            return None
+
+    async def scrape_section(self, fetcher, section):
+        """Recorre el listado paginado de una sección y procesa sus fichas."""
+        path, parser = SECTIONS[section]
+        url = urljoin(self.base_url, path)
+        details = []
+        try:
+            while url:
+                html = await fetcher.fetch(url)
+                links, url = await self._parse(parse_links, html, url)
+                # Las fichas de cada página se descargan mientras se pide la siguiente
+                details.extend(
+                    asyncio.ensure_future(self._scrape_detail(fetcher, parser, link)) for link in links
+                )
+        except BaseException:
+            for task in details:
+                task.cancel()
+            raise
+        results = await asyncio.gather(*details)
+        return [item for item in results if item]
+
+    async def scrape(self, *sections):
+        sections = sections or tuple(SECTIONS)
+        fetcher = self._fetcher()
+        try:
+            results = await asyncio.gather(*(self.scrape_section(fetcher, s) for s in sections))
+        finally:
+            await fetcher.aclose()
+            self.stats = dict(fetcher.stats)
+        return dict(zip(sections, results))
+
+    def _run(self, section):
+        return asyncio.run(self.scrape(section))[section]
+
+    def scrape_beaches(self):
+        return self._run("playas")
+
+    def scrape_monuments(self):
+        return self._run("monumentos")
+
+    def scrape_food(self):
+        return self._run("gastronomia")
+
+    def close(self):
+        if self._pool is not None:
+            # Sin esperar: al salir por un error (o Ctrl+C) los análisis pendientes se descartan
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
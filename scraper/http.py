@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+SCRAPER_CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", ".scraper_cache")
+SCRAPER_MAX_PER_HOST = int(os.getenv("SCRAPER_MAX_PER_HOST", "4"))
+SCRAPER_MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20"))
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "15"))
+# Reintentos tras el primer intento (0 o menos: un solo intento)
+SCRAPER_RETRIES = int(os.getenv("SCRAPER_RETRIES", "2"))
+SCRAPER_USER_AGENT = os.getenv("SCRAPER_USER_AGENT", "MallorcaParaisoBot/1.0")
+
+# Respuestas que merece la pena reintentar
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class HttpCache:
+    """Caché HTTP en disco: guarda el cuerpo junto con su ETag y Last-Modified."""
+
+    def __init__(self, directory=SCRAPER_CACHE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _read(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, url, meta, body):
+        meta_path, body_path = self._paths(url)
+        # Escritura atómica: primero el cuerpo, después los metadatos
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode())):
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+    async def get(self, url):
+        return await asyncio.to_thread(self._read, url)
+
+    async def set(self, url, meta, body):
+        await asyncio.to_thread(self._write, url, meta, body)
+
+
+def validators(meta):
+    """Cabeceras de petición condicional a partir de una entrada de la caché."""
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+class Fetcher:
+    """Cliente HTTP asíncrono con concurrencia limitada por host y caché condicional."""
+
+    def __init__(self, transport=None, cache=None, max_per_host=SCRAPER_MAX_PER_HOST):
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            timeout=SCRAPER_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": SCRAPER_USER_AGENT},
+            limits=httpx.Limits(max_connections=SCRAPER_MAX_CONNECTIONS),
+        )
+        self.cache = cache
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self.stats = {"requests": 0, "not_modified": 0, "cached": 0, "errors": 0}
+
+    def _semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+    async def fetch(self, url):
+        """Devuelve el HTML de `url`; con 304 se reutiliza el cuerpo de la caché."""
+        cached = await self.cache.get(url) if self.cache else None
+        headers = validators(cached[0]) if cached else {}
+
+        async with self._semaphore(url):
+            response = await self._request(url, headers)
+
+        if response.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            return cached[1].decode(cached[0].get("encoding") or "utf-8")
+        if response.is_error and cached:
+            # Si el origen falla se sirve la última copia conocida
+            self.stats["cached"] += 1
+            return cached[1].decode(cached[0].get("encoding") or "utf-8")
+        response.raise_for_status()
+
+        if self.cache and (response.headers.get("etag") or response.headers.get("last-modified")):
+            await self.cache.set(url, {
+                "url": url,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "encoding": response.encoding,
+            }, response.content)
+        return response.text
+
+    async def _request(self, url, headers):
+        retries = max(SCRAPER_RETRIES, 0)
+        for attempt in range(retries + 1):
+            self.stats["requests"] += 1
+            try:
+                response = await self.client.get(url, headers=headers)
+            except httpx.TransportError:
+                self.stats["errors"] += 1
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS or attempt == retries:
+                    return response
+                self.stats["errors"] += 1
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def fixture_transport(directory):
+    """Transporte sin red que sirve HTML grabado en `directory/<host>/<ruta>`.
+
+    Responde con ETag y 304 igual que un servidor real, para poder probar la
+    caché y medir el scraper sin conexión.
+    """
+    root = Path(directory)
+
+    def handler(request):
+        path = request.url.path.strip("/")
+        base = root / request.url.host / path
+        candidates = [base / "index.html", base.with_name(base.name + ".html")] if path else [base / "index.html"]
+        for candidate in candidates:
+            if candidate.is_file():
+                body = candidate.read_bytes()
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if request.headers.get("if-none-match") == etag:
+                    return httpx.Response(304, headers={"ETag": etag})
+                return httpx.Response(
+                    200, content=body,
+                    headers={"ETag": etag, "Content-Type": "text/html; charset=utf-8"},
+                )
+        return httpx.Response(404, text="Not found")
+
+    return httpx.MockTransport(handler)
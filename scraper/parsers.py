@@ -0,0 +1,112 @@
+"""Parsers de las páginas de origen.
+
+Son funciones puras de nivel de módulo para poder ejecutarse en un
+ProcessPoolExecutor: reciben HTML y devuelven datos serializables.
+"""
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+# Valores de texto que se interpretan como verdadero
+TRUE_VALUES = {"sí", "si", "yes", "true", "1"}
+
+
+def _soup(html):
+    return BeautifulSoup(html, "html.parser")
+
+
+def _text(node):
+    return node.get_text(" ", strip=True) if node else None
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_links(html, base_url):
+    """Enlaces a fichas (`a.ficha`) y a la siguiente página del listado."""
+    soup = _soup(html)
+    links = [urljoin(base_url, a["href"]) for a in soup.select("a.ficha[href]")]
+    next_link = soup.select_one("a[rel=next][href]")
+    return links, urljoin(base_url, next_link["href"]) if next_link else None
+
+
+def parse_ficha(html, base_url):
+    """Campos comunes de una ficha: `data-campo`, imagen principal y coordenadas."""
+    soup = _soup(html)
+    fields = {}
+    for node in soup.select("[data-campo]"):
+        name = node["data-campo"]
+        if node.name in ("ul", "ol"):
+            fields[name] = [_text(li) for li in node.find_all("li") if _text(li)]
+        elif node.name == "a" and node.get("href"):
+            fields[name] = urljoin(base_url, node["href"])
+        else:
+            fields[name] = _text(node)
+
+    title = soup.select_one("h1")
+    image = soup.select_one("img.principal[src]")
+    latitude = soup.select_one("meta[property='place:location:latitude']")
+    longitude = soup.select_one("meta[property='place:location:longitude']")
+    fields["nombre"] = _text(title)
+    fields["imagen"] = urljoin(base_url, image["src"]) if image else None
+    fields["latitud"] = _float(latitude.get("content")) if latitude else None
+    fields["longitud"] = _float(longitude.get("content")) if longitude else None
+    return fields
+
+
+def parse_beach(html, url):
+    fields = parse_ficha(html, url)
+    return {
+        "nombre": fields["nombre"],
+        "imagen": fields["imagen"],
+        "descripcion": fields.get("descripcion"),
+        "zona": fields.get("zona"),
+        "pueblo": fields.get("pueblo"),
+        "tipo": fields.get("tipo") or "Playa",
+        "servicios": fields.get("servicios", []),
+        "acceso": fields.get("acceso"),
+        "destacado": (fields.get("destacado") or "").lower() in TRUE_VALUES,
+        "latitud": fields["latitud"],
+        "longitud": fields["longitud"],
+    }
+
+
+def parse_food(html, url):
+    fields = parse_ficha(html, url)
+    return {
+        "nombre": fields["nombre"],
+        "categoria": fields.get("categoria"),
+        "descripcion": fields.get("descripcion"),
+        "ingredientes": fields.get("ingredientes", []),
+        "imagen": fields["imagen"],
+        "preparacion": fields.get("preparacion"),
+        "donde_probar": fields.get("donde_probar"),
+        "latitud": fields["latitud"],
+        "longitud": fields["longitud"],
+    }
+
+
+def parse_monument(html, url):
+    # Los monumentos se guardan como patrimonio (heritage_sites)
+    fields = parse_ficha(html, url)
+    visitas = fields.get("visitas_guiadas")
+    return {
+        "name": fields["nombre"],
+        "description": fields.get("descripcion"),
+        "period": fields.get("periodo"),
+        "highlight": fields.get("destacado"),
+        "schedule": fields.get("horario"),
+        "open_days": fields.get("dias"),
+        "image": fields["imagen"],
+        "address": fields.get("direccion"),
+        "google_maps_url": fields.get("mapa"),
+        "latitude": fields["latitud"],
+        "longitude": fields["longitud"],
+        "entrance_fee": fields.get("entrada"),
+        "accessibility": fields.get("accesibilidad"),
+        "guided_tours": visitas.lower() in TRUE_VALUES if visitas else None,
+    }
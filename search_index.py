@@ -0,0 +1,108 @@
+"""Índices de texto completo de /api/v1/search.
+
+En PostgreSQL cada tabla tiene una columna generada `search_vector` (tsvector
+con la configuración `spanish` sin acentos) y un índice GIN. En SQLite, para
+desarrollo y tests, una tabla virtual FTS5 `search_index` se mantiene con
+triggers en cada tabla.
+
+La columna `search_vector` no se declara en los modelos porque su tipo y su
+expresión solo existen en PostgreSQL. En las bases de datos migradas los
+índices los crean las migraciones (4e266f4c4380 y 5d56c41beaff, que tienen su
+propia copia del SQL); con DB_CREATE_ALL, `create_schema` llama a
+`create_search_index` después de create_all. Todas las sentencias de este
+módulo son idempotentes. Un cambio en `SEARCH_SOURCES` o en el SQL necesita
+también una migración nueva.
+"""
+from sqlalchemy import text
+
+import models
+
+# Tipo -> (modelo, nombre, descripción, imagen, columna que no puede ser NULL para indexar la fila)
+SEARCH_SOURCES = {
+    "playas": (models.Beach, models.Beach.nombre, models.Beach.descripcion, models.Beach.imagen, None),
+    "food": (models.Food, models.Food.nombre, models.Food.descripcion, models.Food.imagen, None),
+    "restaurants": (models.Restaurant, models.Restaurant.nombre,
+                    models.Restaurant.descripcion, models.Restaurant.imagen, None),
+    "markets": (models.LocalMarket, models.LocalMarket.name,
+                models.LocalMarket.description, models.LocalMarket.image, None),
+    "heritage": (models.Heritage, models.Heritage.name,
+                 models.Heritage.description, models.Heritage.image, None),
+    "monuments": (models.Monument, models.Monument.nombre,
+                  models.Monument.descripcion, models.Monument.imagen, None),
+    # Catálogo mixto (projection.py): devuelve el id del item, el que usan las reseñas.
+    # Los items desvinculados son recursos borrados y no se indexan
+    "catalog": (models.Item, models.Item.nombre, models.Item.descripcion, models.Item.imagen,
+                models.Item.ref_id),
+}
+
+# El catálogo repite los resultados de los recursos, así que solo se busca si se pide
+DEFAULT_TYPES = [tipo for tipo in SEARCH_SOURCES if tipo != "catalog"]
+
+
+def postgresql_statements():
+    statements = [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        # unaccent() no es IMMUTABLE y no puede usarse en columnas generadas
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS
+        $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        """,
+    ]
+    for model, nombre, descripcion, _, required_column in SEARCH_SOURCES.values():
+        table = model.__tablename__
+        where = f" WHERE {required_column.key} IS NOT NULL" if required_column is not None else ""
+        statements.append(f"""
+            ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', immutable_unaccent(coalesce({nombre.key}, ''))), 'A') ||
+                setweight(to_tsvector('spanish', immutable_unaccent(coalesce({descripcion.key}, ''))), 'B')
+            ) STORED
+        """)
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector){where}"
+        )
+    return statements
+
+
+def _sqlite_insert(tipo, table, nombre, descripcion, imagen, required_column, row=None):
+    """INSERT en search_index de la fila `row` de un trigger (new) o de toda la tabla."""
+    prefix = f"{row}." if row else ""
+    source = "" if row else f" FROM {table}"
+    condition = f"{prefix}{required_column.key} IS NOT NULL" if required_column is not None else "1"
+    return (
+        "INSERT INTO search_index (tipo, ref_id, imagen, nombre, descripcion) "
+        f"SELECT '{tipo}', {prefix}id, {prefix}{imagen.key}, {prefix}{nombre.key}, {prefix}{descripcion.key}"
+        f"{source} WHERE {condition}"
+    )
+
+
+def sqlite_statements():
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "tipo UNINDEXED, ref_id UNINDEXED, imagen UNINDEXED, nombre, descripcion, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    ]
+    for tipo, (model, *columns) in SEARCH_SOURCES.items():
+        table = model.__tablename__
+        insert = _sqlite_insert(tipo, table, *columns, row="new")
+        delete = f"DELETE FROM search_index WHERE tipo = '{tipo}' AND ref_id = old.id"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE ON {table} BEGIN "
+            f"{delete}; {insert}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete}; END",
+            # Relleno con las filas existentes
+            f"DELETE FROM search_index WHERE tipo = '{tipo}'",
+            _sqlite_insert(tipo, table, *columns),
+        ]
+    return statements
+
+
+def create_search_index(connection):
+    """Crea (o completa) los índices de búsqueda del dialecto de la conexión."""
+    if connection.dialect.name == "postgresql":
+        statements = postgresql_statements()
+    else:
+        statements = sqlite_statements()
+    for statement in statements:
+        connection.execute(text(statement))
@@ -0,0 +1,76 @@
+"""Tareas opcionales del arranque de la aplicación.
+
+Importar la aplicación no abre conexiones: el esquema lo gestiona Alembic y
+los motores conectan en la primera consulta. Estas tareas se ejecutan en el
+lifespan solo si se activan por entorno.
+"""
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+import models
+from database import DB_POOL_SIZE, async_engine, replicas
+from search_index import create_search_index
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# create_all al arrancar, solo para desarrollo con bases de datos sin migrar
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+# Calentamiento: conexiones abiertas de antemano y respuestas precargadas en caché
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() == "true"
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", str(DB_POOL_SIZE)))
+WARMUP_PATHS = [
+    path.strip() for path in os.getenv(
+        "WARMUP_PATHS",
+        "/api/v1/playas/,/api/v1/food/,/api/v1/restaurants/,/api/v1/markets/,/api/v1/heritage/",
+    ).split(",") if path.strip()
+]
+
+
+async def create_schema():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+        # Columnas search_vector (PostgreSQL) o índice FTS5 (SQLite), que no están en los modelos
+        await conn.run_sync(create_search_index)
+
+
+async def prefill_pool(engine, connections):
+    """Abre `connections` conexiones a la vez y las devuelve al pool."""
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+        await asyncio.gather(*(conn.start() for conn in opened))
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in opened), return_exceptions=True)
+
+
+async def preload_cache(app, paths):
+    # Las peticiones pasan por los middlewares, así que llenan la caché de respuestas
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for path in paths:
+            response = await client.get(path, headers={"accept-encoding": "br, gzip"})
+            if response.status_code != 200:
+                logger.warning("Calentamiento: %s devolvió %s", path, response.status_code)
+
+
+async def warm_up(app):
+    """Calentamiento del arranque; los fallos se registran pero no impiden arrancar."""
+    start = time.perf_counter()
+    try:
+        for engine in [async_engine, *(replica.engine for replica in replicas)]:
+            await prefill_pool(engine, WARMUP_CONNECTIONS)
+        await preload_cache(app, WARMUP_PATHS)
+    except Exception:
+        logger.exception("Error en el calentamiento del arranque")
+        return
+    logger.info("Calentamiento completado en %.0f ms", (time.perf_counter() - start) * 1000)
@@ -0,0 +1,38 @@
+import asyncio
+import os
+import tempfile
+
+# La aplicación lee la configuración al importarse: SQLite en un directorio
+# temporal, caché en memoria y esquema creado en el arranque
+_db_dir = tempfile.mkdtemp(prefix="mallorca-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}?check_same_thread=false"
+os.environ["CACHE_URL"] = "memory://"
+os.environ["DB_CREATE_ALL"] = "true"
+os.environ["STARTUP_WARMUP"] = "false"
+os.environ["REFRESH_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+import cache
+import database
+import main
+import models
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clean_state(client):
+    """Cada test empieza con las tablas vacías y la caché de respuestas limpia."""
+    with database.engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            conn.execute(delete(table))
+    asyncio.run(cache.get_backend().clear())
+    yield
+
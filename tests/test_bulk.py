@@ -0,0 +1,138 @@
+import json
+
+from sqlalchemy.exc import IntegrityError
+
+import bulk
+
+BULK = "/api/v1/food/bulk"
+
+
+def plato(**overrides):
+    data = {
+        "nombre": "Sobrasada",
+        "categoria": "Embutido",
+        "descripcion": "Embutido curado de cerdo con pimentón",
+        "ingredientes": ["Cerdo", "Pimentón"],
+        "imagen": "sobrasada.jpg",
+    }
+    return {**data, **overrides}
+
+
+def ndjson(records):
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+def post_ndjson(client, records):
+    return client.post(BULK, content=ndjson(records), headers={"content-type": "application/x-ndjson"})
+
+
+def test_json_array_and_ndjson_give_the_same_result(client):
+    records = [plato(), plato(nombre="Ensaimada", categoria="Repostería")]
+
+    from_array = client.post(BULK, json=records)
+    assert from_array.status_code == 200
+    client.delete(f"/api/v1/food/{from_array.json()['results'][0]['id']}")
+    from_ndjson = post_ndjson(client, records)
+
+    assert from_ndjson.status_code == 200
+    for result in (from_array.json(), from_ndjson.json()):
+        assert (result["total"], result["ok"], result["errors"]) == (2, 2, 0)
+    assert [r["changed"] for r in from_ndjson.json()["results"]] == [True, False]
+
+
+def test_identical_rows_are_reported_unchanged(client):
+    first = client.post(BULK, json=[plato()]).json()["results"][0]
+    again = client.post(BULK, json=[plato()]).json()["results"][0]
+    edited = client.post(BULK, json=[plato(descripcion="Con más pimentón")]).json()["results"][0]
+
+    assert first["changed"] is True
+    assert again == {**first, "changed": False}
+    assert edited["id"] == first["id"] and edited["changed"] is True
+    assert client.get(f"/api/v1/food/{first['id']}").json()["descripcion"] == "Con más pimentón"
+
+
+def test_duplicate_keys_in_one_request_keep_the_last_row(client):
+    result = client.post(BULK, json=[plato(), plato(categoria="Charcutería")]).json()
+
+    ids = {r["id"] for r in result["results"]}
+    assert len(ids) == 1
+    assert client.get(f"/api/v1/food/{ids.pop()}").json()["categoria"] == "Charcutería"
+
+
+def test_invalid_rows_are_reported_and_the_rest_written(client):
+    records = [plato(), {"nombre": "Sin categoría"}, plato(nombre="Tumbet", categoria="Verdura")]
+
+    result = post_ndjson(client, records).json()
+
+    assert (result["total"], result["ok"], result["errors"]) == (3, 2, 1)
+    error = result["results"][1]
+    assert error["status"] == "error" and error["id"] is None
+    assert {tuple(e["loc"]) for e in error["errors"]} >= {("categoria",), ("descripcion",)}
+    assert sorted(p["nombre"] for p in client.get("/api/v1/food/").json()) == ["Sobrasada", "Tumbet"]
+
+
+def test_malformed_bodies_are_rejected(client):
+    assert client.post(BULK, json={"nombre": "Sobrasada"}).status_code == 400
+    assert client.post(BULK, content="[{", headers={"content-type": "application/json"}).status_code == 400
+    response = client.post(BULK, content='{"nombre": 1}\n{', headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 400
+
+
+def test_rows_are_written_in_batches(client, monkeypatch):
+    batches = []
+    original = bulk.write_batch
+
+    async def recording(db, model, rows):
+        batches.append(len(rows))
+        return await original(db, model, rows)
+
+    monkeypatch.setattr(bulk, "BULK_BATCH_SIZE", 2)
+    monkeypatch.setattr(bulk, "write_batch", recording)
+    records = [plato(nombre=f"Plato {i}") for i in range(5)]
+
+    result = post_ndjson(client, records).json()
+
+    assert result["ok"] == 5
+    assert batches == [2, 2, 1]
+
+
+def test_max_rows(client, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_MAX_ROWS", 3)
+
+    response = client.post(BULK, json=[plato(nombre=f"Plato {i}") for i in range(4)])
+
+    assert response.status_code == 413
+    assert client.get("/api/v1/food/").json() == []
+
+
+def test_integrity_error_is_409_and_rolls_back_every_batch(client, monkeypatch):
+    calls = 0
+    original = bulk.upsert_rows
+
+    async def failing_second_batch(db, model, rows):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise IntegrityError("INSERT", {}, Exception("violación simulada"))
+        return await original(db, model, rows)
+
+    monkeypatch.setattr(bulk, "BULK_BATCH_SIZE", 2)
+    monkeypatch.setattr(bulk, "upsert_rows", failing_second_batch)
+
+    response = client.post(BULK, json=[plato(nombre=f"Plato {i}") for i in range(4)])
+
+    assert response.status_code == 409
+    assert "violación simulada" in response.json()["detail"]
+    assert client.get("/api/v1/food/").json() == []
+
+
+def test_catalog_follows_bulk_writes(client):
+    client.post(BULK, json=[plato(), plato(nombre="Tumbet", categoria="Verdura")])
+    client.post(BULK, json=[plato(categoria="Charcutería")])
+
+    catalog = client.get("/api/v1/catalog/", params={"tipo": "Plato"}).json()
+
+    assert [(item["nombre"], item["categoria"]) for item in catalog] == [
+        ("Sobrasada", "Charcutería"),
+        ("Tumbet", "Verdura"),
+    ]
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+import cache
+import compression
+from cache import ResponseCacheMiddleware
+
+PLAYAS = "/api/v1/playas/"
+
+
+def playa(**overrides):
+    data = {
+        "nombre": "Es Trenc",
+        "imagen": "es-trenc.jpg",
+        "descripcion": "Playa virgen de arena blanca",
+        "zona": "Sur",
+        "pueblo": "Campos",
+        "servicios": ["Parking"],
+        "acceso": "Fácil",
+    }
+    return {**data, **overrides}
+
+
+def test_get_miss_then_hit(client):
+    first = client.get(PLAYAS)
+    second = client.get(PLAYAS)
+
+    assert first.status_code == 200
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+
+
+def test_query_parameter_order_shares_entry(client):
+    assert client.get(PLAYAS, params=[("zona", "Sur"), ("limit", "5")]).headers["x-cache"] == "MISS"
+    assert client.get(PLAYAS, params=[("limit", "5"), ("zona", "Sur")]).headers["x-cache"] == "HIT"
+
+
+def test_non_200_responses_are_not_cached(client):
+    assert client.get(f"{PLAYAS}999").status_code == 404
+    assert client.get(f"{PLAYAS}999").headers["x-cache"] == "MISS"
+
+
+def test_create_invalidates_list(client):
+    client.get(PLAYAS)
+    assert client.get(PLAYAS).headers["x-cache"] == "HIT"
+
+    assert client.post(PLAYAS, json=playa()).status_code == 200
+
+    response = client.get(PLAYAS)
+    assert response.headers["x-cache"] == "MISS"
+    assert [p["nombre"] for p in response.json()] == ["Es Trenc"]
+
+
+def test_update_and_delete_invalidate_row(client):
+    playa_id = client.post(PLAYAS, json=playa()).json()["id"]
+    client.get(f"{PLAYAS}{playa_id}")
+    assert client.get(f"{PLAYAS}{playa_id}").headers["x-cache"] == "HIT"
+
+    assert client.put(f"{PLAYAS}{playa_id}", json=playa(acceso="Difícil")).status_code == 200
+    response = client.get(f"{PLAYAS}{playa_id}")
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json()["acceso"] == "Difícil"
+
+    assert client.delete(f"{PLAYAS}{playa_id}").status_code == 200
+    assert client.get(f"{PLAYAS}{playa_id}").status_code == 404
+
+
+def test_failed_write_keeps_cache(client):
+    client.post(PLAYAS, json=playa())
+    client.get(PLAYAS)
+
+    # Clave natural duplicada: 409, nada ha cambiado
+    assert client.post(PLAYAS, json=playa()).status_code == 409
+    assert client.get(PLAYAS).headers["x-cache"] == "HIT"
+
+
+def test_options_does_not_invalidate(client):
+    client.get(PLAYAS)
+
+    # Preflight de CORS (lo responde CORSMiddleware) y OPTIONS sin cabeceras de CORS
+    preflight = client.options(PLAYAS, headers={
+        "origin": "https://example.com",
+        "access-control-request-method": "POST",
+    })
+    assert preflight.status_code == 200
+    assert "x-cache" not in preflight.headers
+    client.options(PLAYAS)
+
+    assert client.get(PLAYAS).headers["x-cache"] == "HIT"
+
+
+def test_writes_only_invalidate_their_resource(client):
+    client.get(PLAYAS)
+    client.get("/api/v1/food/")
+
+    client.post(PLAYAS, json=playa())
+
+    assert client.get("/api/v1/food/").headers["x-cache"] == "HIT"
+    assert client.get(PLAYAS).headers["x-cache"] == "MISS"
+
+
+def test_middleware_only_invalidates_on_write_methods():
+    # Aplicación que responde 200 a cualquier método, para que un OPTIONS
+    # que llegase a invalidar se notara
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"[]"})
+
+    client = TestClient(ResponseCacheMiddleware(app))
+    client.get(PLAYAS)
+
+    assert client.options(PLAYAS).status_code == 200
+    assert client.get(PLAYAS).headers["x-cache"] == "HIT"
+
+    assert client.patch(PLAYAS).status_code == 200
+    assert client.get(PLAYAS).headers["x-cache"] == "MISS"
+
+
+def test_stored_variants_are_compressed_off_the_event_loop(client, monkeypatch):
+    threads = []
+    original = cache.cached_variants
+
+    def recording(headers, body):
+        threads.append(threading.current_thread())
+        return original(headers, body)
+
+    monkeypatch.setattr(cache, "cached_variants", recording)
+    for i in range(30):
+        client.post(PLAYAS, json=playa(nombre=f"Playa {i}", descripcion="Arena blanca " * 20))
+
+    miss = client.get(PLAYAS, headers={"accept-encoding": "br"})
+    hit = client.get(PLAYAS, headers={"accept-encoding": "gzip"})
+
+    assert threads and all(thread is not threading.main_thread() for thread in threads)
+    assert miss.headers["content-encoding"] == "br"
+    assert hit.headers["x-cache"] == "HIT"
+    assert hit.headers["content-encoding"] == "gzip"
+    assert hit.json() == miss.json()
+
+
+def test_uncached_responses_use_per_request_levels():
+    assert compression.route_compression("/api/v1/playas/bulk") == compression.DEFAULT_COMPRESSION
+    assert compression.route_compression("/api/v1/playas/999") == compression.DEFAULT_COMPRESSION
+    assert compression.route_compression("/health") is None
+
+
+def test_memory_backend_forgets_evicted_and_expired_keys():
+    backend = cache.MemoryBackend(max_entries=2)
+
+    async def run():
+        await backend.set("a", b"1", 60, ["playas"])
+        await backend.set("b", b"2", 60, ["playas", "food"])
+        await backend.set("c", b"3", 60, ["food"])
+        # "a" salió por el límite de entradas
+        assert backend._tags == {"playas": {"b"}, "food": {"b", "c"}}
+
+        await backend.set("c", b"3", -1, ["food"])
+        assert await backend.get("c") is None
+        assert backend._tags == {"playas": {"b"}, "food": {"b"}}
+
+        await backend.invalidate(["food"])
+        assert await backend.get("b") is None
+        assert backend._tags == {}
+
+    asyncio.run(run())
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import text
+
+import database
+from pagination import NEXT_CURSOR_HEADER
+
+CATALOG = "/api/v1/catalog/"
+
+
+def playa(nombre, zona="Sur"):
+    return {
+        "nombre": nombre,
+        "imagen": "playa.jpg",
+        "descripcion": "Arena blanca",
+        "zona": zona,
+        "pueblo": "Campos",
+        "servicios": [],
+        "acceso": "Fácil",
+    }
+
+
+def plato(nombre, categoria="Embutido"):
+    return {
+        "nombre": nombre,
+        "categoria": categoria,
+        "descripcion": "Receta tradicional",
+        "ingredientes": ["Cerdo"],
+        "imagen": "plato.jpg",
+    }
+
+
+def nombres(response):
+    assert response.status_code == 200, response.text
+    return [item["nombre"] for item in response.json()]
+
+
+@pytest.fixture
+def catalog(client):
+    client.post("/api/v1/playas/", json=playa("Es Trenc"))
+    client.post("/api/v1/playas/", json=playa("Formentor", zona="Norte"))
+    client.post("/api/v1/food/", json=plato("Sobrasada"))
+    client.post("/api/v1/food/", json=plato("Ensaimada", categoria="Repostería"))
+
+
+def test_lists_every_resource_by_name(client, catalog):
+    response = client.get(CATALOG)
+
+    assert nombres(response) == ["Ensaimada", "Es Trenc", "Formentor", "Sobrasada"]
+    es_trenc = response.json()[1]
+    assert es_trenc["tipo"] == "Playa"
+    assert client.get(f"/api/v1/playas/{es_trenc['ref_id']}").json()["nombre"] == "Es Trenc"
+
+
+def test_filters(client, catalog):
+    assert nombres(client.get(CATALOG, params={"zona": "Norte"})) == ["Formentor"]
+    assert nombres(client.get(CATALOG, params={"categoria": "Embutido"})) == ["Sobrasada"]
+    assert nombres(client.get(CATALOG, params={"pueblo": "Campos"})) == ["Es Trenc", "Formentor"]
+    assert nombres(client.get(CATALOG, params={"tipo": ["Plato"]})) == ["Ensaimada", "Sobrasada"]
+    assert nombres(client.get(CATALOG, params={"tipo": ["Plato", "Playa"], "zona": "Sur"})) == ["Es Trenc"]
+    assert client.get(CATALOG, params={"tipo": "Barco"}).status_code == 400
+
+
+def test_cursor_and_fields(client, catalog):
+    first = client.get(CATALOG, params={"limit": 3, "fields": "nombre"})
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    second = client.get(CATALOG, params={"limit": 3, "fields": "nombre", "cursor": cursor})
+
+    assert first.json() + second.json() == [
+        {"nombre": "Ensaimada"}, {"nombre": "Es Trenc"}, {"nombre": "Formentor"}, {"nombre": "Sobrasada"},
+    ]
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+
+def test_updates_and_deletes_follow_the_resource(client, catalog):
+    playa_id = next(item["ref_id"] for item in client.get(CATALOG).json() if item["nombre"] == "Formentor")
+
+    client.put(f"/api/v1/playas/{playa_id}", json=playa("Cap de Formentor", zona="Norte"))
+    assert "Cap de Formentor" in nombres(client.get(CATALOG, params={"zona": "Norte"}))
+
+    client.delete(f"/api/v1/playas/{playa_id}")
+    assert nombres(client.get(CATALOG, params={"zona": "Norte"})) == []
+
+
+@pytest.mark.parametrize("column, index", [
+    ("zona", "ix_items_catalog_zona_nombre_id"),
+    ("categoria", "ix_items_catalog_categoria_nombre_id"),
+    ("pueblo", "ix_items_catalog_pueblo_nombre_id"),
+])
+def test_filters_use_partial_indexes(column, index):
+    # Misma forma que la consulta de /catalog: filtro, ref_id IS NOT NULL y orden (nombre, id)
+    with database.engine.connect() as conn:
+        plan = conn.execute(text(
+            f"EXPLAIN QUERY PLAN SELECT id FROM items WHERE ref_id IS NOT NULL AND {column} = 'x' "
+            "ORDER BY nombre, id LIMIT 100"
+        )).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert index in detail
+    assert "TEMP B-TREE" not in detail
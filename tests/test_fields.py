@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+
+import cache
+import database
+import fields
+import models
+from fields import fields_response, parse_fields, select_fields
+from pagination import NEXT_CURSOR_HEADER
+from routers.categories import Category
+from routers.markets import LocalMarket
+from routers.playas import Beach
+from routers.reviews import Review
+
+
+def playa(nombre, **overrides):
+    data = {
+        "nombre": nombre,
+        "imagen": f"{nombre.lower()}.jpg",
+        "descripcion": "Arena blanca",
+        "zona": "Sur",
+        "pueblo": "Campos",
+        "servicios": ["Parking"],
+        "acceso": "Fácil",
+        "latitud": 39.35,
+        "longitud": 3.0,
+    }
+    return {**data, **overrides}
+
+
+@pytest.fixture
+def statements():
+    """SQL que ejecuta la API durante el test."""
+    executed = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(database.async_engine.sync_engine, "before_cursor_execute", capture)
+    yield executed
+    event.remove(database.async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("id,nombre,contraseña", Beach, models.Beach)
+    assert error.value.status_code == 400
+    assert "contraseña" in error.value.detail
+
+    with pytest.raises(HTTPException):
+        parse_fields(" , ", Beach, models.Beach)
+    # `items` está en el esquema pero no es una columna
+    with pytest.raises(HTTPException):
+        parse_fields("id,items", Category, models.Category)
+
+
+def test_parse_fields_keeps_order_without_duplicates():
+    assert parse_fields(" nombre, id ,nombre", Beach, models.Beach) == ["nombre", "id"]
+
+
+def test_parse_fields_fast_serialization(monkeypatch):
+    assert parse_fields(None, Beach, models.Beach) is None
+
+    monkeypatch.setattr(fields, "FAST_SERIALIZATION", True)
+    assert parse_fields(None, Beach, models.Beach) == list(Beach.model_fields)
+    # Con campos que no son columnas se mantiene el response_model
+    assert parse_fields(None, Category, models.Category) is None
+
+
+def test_select_fields_adds_only_sort_columns():
+    query = select_fields(models.Beach, ["imagen", "id"], models.Beach.nombre, models.Beach.id)
+    assert [column.key for column in query.selected_columns] == ["imagen", "id", "nombre"]
+
+    query = select_fields(models.Review, ["rating"], None, models.Review.id)
+    assert [column.key for column in query.selected_columns] == ["rating", "id"]
+
+    assert select_fields(models.Beach, None).selected_columns.keys() == list(models.Beach.__table__.columns.keys())
+
+
+def test_fields_response_drops_extra_columns():
+    response = fields_response(["imagen", "id"], [("a.jpg", 1, "Es Trenc"), ("b.jpg", 2, "Formentor")])
+    assert response.body == b'[{"imagen":"a.jpg","id":1},{"imagen":"b.jpg","id":2}]'
+    assert fields_response(["id"], (7, "Es Trenc")).body == b'{"id":7}'
+
+
+def test_list_selects_only_requested_columns(client, statements):
+    client.post("/api/v1/playas/", json=playa("Es Trenc"))
+    statements.clear()
+
+    response = client.get("/api/v1/playas/", params={"fields": "id,latitud,longitud"})
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": response.json()[0]["id"], "latitud": 39.35, "longitud": 3.0}]
+    select_sql = next(sql for sql in statements if "FROM beaches" in sql)
+    assert "descripcion" not in select_sql and "servicios" not in select_sql
+    assert client.get("/api/v1/playas/", params={"fields": "id,foo"}).status_code == 400
+
+
+def test_detail_with_fields(client):
+    playa_id = client.post("/api/v1/playas/", json=playa("Es Trenc")).json()["id"]
+
+    response = client.get(f"/api/v1/playas/{playa_id}", params={"fields": "nombre,zona"})
+
+    assert response.json() == {"nombre": "Es Trenc", "zona": "Sur"}
+    assert client.get("/api/v1/playas/999999", params={"fields": "nombre"}).status_code == 404
+
+
+def test_fields_with_cursor(client):
+    for nombre in ("Cala Mondragó", "Es Trenc", "Formentor", "Cala Agulla", "Sa Calobra"):
+        client.post("/api/v1/playas/", json=playa(nombre))
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "fields": "imagen", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/playas/", params=params)
+        assert all(list(row) == ["imagen"] for row in response.json())
+        seen += [row["imagen"] for row in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    # El cursor usa el nombre aunque no se devuelva
+    assert seen == ["cala agulla.jpg", "cala mondragó.jpg", "es trenc.jpg", "formentor.jpg", "sa calobra.jpg"]
+
+
+def test_fast_serialization_returns_the_same_json(client, monkeypatch):
+    client.post("/api/v1/playas/", json=playa("Es Trenc"))
+    client.post("/api/v1/markets/", json={
+        "name": "Mercat de l'Olivar", "location": "Palma", "address": "Plaça de l'Olivar",
+        "google_maps_url": "https://maps.google.com/?q=olivar", "days": "L-S", "hours": "7-14",
+    })
+    item_id = client.get("/api/v1/catalog/").json()[0]["id"]
+    client.post("/api/v1/reviews/", json={"item_id": item_id, "rating": 4, "comment": "Bien"})
+    urls = ["/api/v1/playas/", "/api/v1/markets/", "/api/v1/reviews/"]
+    expected = [client.get(url).json() for url in urls]
+
+    monkeypatch.setattr(fields, "FAST_SERIALIZATION", True)
+    assert parse_fields(None, LocalMarket, models.LocalMarket) is not None
+    assert parse_fields(None, Review, models.Review) is not None
+    asyncio.run(cache.get_backend().clear())
+    rendered = []
+    render = fields.FastJSONResponse.render
+
+    def spy(self, content):
+        rendered.append(content)
+        return render(self, content)
+
+    monkeypatch.setattr(fields.FastJSONResponse, "render", spy)
+
+    assert [client.get(url).json() for url in urls] == expected
+    # Las tres respuestas se serializaron con orjson, sin response_model
+    assert len(rendered) == 3
+
+
+def test_categories_and_reviews_accept_fields(client):
+    with database.engine.begin() as conn:
+        conn.execute(insert(models.Category), [
+            {"name": name, "description": ""} for name in ("Playas", "Gastronomía", "Cultura")
+        ])
+    response = client.get("/api/v1/categories/", params={"fields": "name", "limit": 2})
+    assert response.json() == [{"name": "Cultura"}, {"name": "Gastronomía"}]
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = client.get("/api/v1/categories/", params={"fields": "name", "cursor": cursor})
+    assert response.json() == [{"name": "Playas"}]
+    assert client.get("/api/v1/categories/", params={"fields": "items"}).status_code == 400
+
+    client.post("/api/v1/playas/", json=playa("Es Trenc"))
+    item_id = client.get("/api/v1/catalog/").json()[0]["id"]
+    for rating in (3, 5):
+        client.post("/api/v1/reviews/", json={"item_id": item_id, "rating": rating, "comment": ""})
+    response = client.get("/api/v1/reviews/", params={"fields": "rating", "limit": 1})
+    assert response.json() == [{"rating": 3}]
+    response = client.get("/api/v1/reviews/", params={"fields": "rating", "cursor": response.headers[NEXT_CURSOR_HEADER]})
+    assert response.json() == [{"rating": 5}]
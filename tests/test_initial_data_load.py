@@ -0,0 +1,34 @@
+import ijson
+import pytest
+
+from initial_data_load import read_json
+
+
+def test_read_json_yields_array_items(tmp_path):
+    path = tmp_path / "playas.json"
+    path.write_text('\n  [{"nombre": "Es Trenc", "latitud": 39.34, "servicios": ["Parking"]}, {"nombre": "Caló"}]',
+                    encoding="utf-8")
+
+    assert list(read_json(path, None)) == [
+        {"nombre": "Es Trenc", "latitud": 39.34, "servicios": ["Parking"]},
+        {"nombre": "Caló"},
+    ]
+
+
+def test_read_json_streams(tmp_path):
+    # El primer registro sale antes de leer el resto del fichero, que aquí está cortado
+    path = tmp_path / "playas.json"
+    path.write_text('[{"nombre": "Es Trenc"}, {"nombre": ' + " " * 100_000, encoding="utf-8")
+
+    records = read_json(path, None)
+    assert next(records) == {"nombre": "Es Trenc"}
+    with pytest.raises(ijson.JSONError):
+        next(records)
+
+
+def test_read_json_rejects_objects(tmp_path):
+    path = tmp_path / "playas.json"
+    path.write_text('{"nombre": "Es Trenc"}', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="array JSON"):
+        list(read_json(path, None))
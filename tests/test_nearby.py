@@ -0,0 +1,68 @@
+import math
+
+from sqlalchemy import insert
+
+import database
+import models
+
+NEARBY = "/api/v1/nearby/"
+# Catedral de Palma
+PALMA = (39.5675, 2.6483)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371008.8 * math.asin(math.sqrt(a))
+
+
+def add_places():
+    with database.engine.begin() as conn:
+        conn.execute(insert(models.Beach), [
+            {"nombre": "Can Pere Antoni", "pueblo": "Palma", "latitud": 39.5636, "longitud": 2.6563},
+            {"nombre": "Ciudad Jardín", "pueblo": "Palma", "latitud": 39.5531, "longitud": 2.6878},
+            {"nombre": "Es Trenc", "pueblo": "Campos", "latitud": 39.3433, "longitud": 2.9839},
+            {"nombre": "Sin coordenadas", "pueblo": "Palma", "latitud": None, "longitud": None},
+        ])
+        conn.execute(insert(models.LocalMarket), [
+            {"name": "Mercat de l'Olivar", "location": "Palma", "address": "Plaça de l'Olivar",
+             "google_maps_url": "https://maps.google.com/", "days": "L-S", "hours": "7:00-14:00",
+             "latitude": 39.5730, "longitude": 2.6530},
+        ])
+
+
+def nearby(client, **params):
+    response = client.get(NEARBY, params={"lat": PALMA[0], "lon": PALMA[1], **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_sorted_by_distance_within_radius(client):
+    add_places()
+
+    places = nearby(client, radius=5000)
+
+    assert [place["nombre"] for place in places] == ["Mercat de l'Olivar", "Can Pere Antoni", "Ciudad Jardín"]
+    for place in places:
+        expected = haversine(*PALMA, place["latitud"], place["longitud"])
+        assert abs(place["distancia"] - expected) < 0.1
+    assert all(place["distancia"] <= 5000 for place in places)
+
+
+def test_radius_excludes_bounding_box_corners(client):
+    add_places()
+
+    # Con el radio justo por debajo de su distancia, Ciudad Jardín queda dentro
+    # del rectángulo del prefiltro pero fuera del círculo
+    distance = haversine(*PALMA, 39.5531, 2.6878)
+    places = nearby(client, radius=distance - 10)
+
+    assert "Ciudad Jardín" not in [place["nombre"] for place in places]
+
+
+def test_limit_and_types(client):
+    add_places()
+
+    assert [place["nombre"] for place in nearby(client, radius=5000, limit=1)] == ["Mercat de l'Olivar"]
+    assert [place["tipo"] for place in nearby(client, radius=5000, types="playas")] == ["playas", "playas"]
+    assert client.get(NEARBY, params={"lat": 0, "lon": 0, "types": "castillos"}).status_code == 400
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import insert
+
+import database
+import models
+from pagination import NEXT_CURSOR_HEADER, keyset
+
+
+def test_keyset_rejects_nullable_sort_columns():
+    with pytest.raises(ValueError, match="NULL"):
+        keyset(models.Item.zona, models.Item.id)
+    assert keyset(models.Beach.nombre, models.Beach.id) == (models.Beach.nombre, models.Beach.id)
+    assert keyset(None, models.Review.id) == (None, models.Review.id)
+
+
+def test_cursor_walks_every_row_once(client):
+    # Varias páginas: ninguna fila se repite ni se salta
+    with database.engine.begin() as conn:
+        conn.execute(insert(models.Category), [
+            {"name": f"Categoría {i % 4}-{i}", "description": ""} for i in range(11)
+        ])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/categories/", params=params)
+        assert response.status_code == 200
+        seen += [category["name"] for category in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert len(seen) == 11
+    assert seen == sorted(seen)
+
+
+def test_invalid_cursor(client):
+    assert client.get("/api/v1/categories/", params={"cursor": "no-es-un-cursor"}).status_code == 400
@@ -0,0 +1,126 @@
+import pytest
+
+REVIEWS = "/api/v1/reviews/"
+
+
+def playa(nombre):
+    return {
+        "nombre": nombre,
+        "imagen": "playa.jpg",
+        "descripcion": "Arena blanca",
+        "zona": "Sur",
+        "pueblo": "Campos",
+        "servicios": [],
+        "acceso": "Fácil",
+    }
+
+
+@pytest.fixture
+def items(client):
+    """Ids de items de tres playas (sus filas en el catálogo)."""
+    for nombre in ("Es Trenc", "Caló des Moro", "Cala Agulla"):
+        client.post("/api/v1/playas/", json=playa(nombre))
+    catalog = client.get("/api/v1/catalog/", params={"tipo": "Playa"}).json()
+    ids = {item["nombre"]: item["id"] for item in catalog}
+    return [ids["Es Trenc"], ids["Caló des Moro"], ids["Cala Agulla"]]
+
+
+def review(client, item_id, rating):
+    response = client.post(REVIEWS, json={"item_id": item_id, "rating": rating, "comment": "ok"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def rating(client, item_id):
+    return client.get(f"{REVIEWS}items/{item_id}").json()
+
+
+def test_create_updates_aggregates(client, items):
+    for stars in (5, 4, 4):
+        review(client, items[0], stars)
+
+    result = rating(client, items[0])
+
+    assert result["rating_count"] == 3
+    assert result["rating_avg"] == pytest.approx(13 / 3)
+    assert result["histogram"] == {"1": 0, "2": 0, "3": 0, "4": 2, "5": 1}
+    assert rating(client, items[1])["rating_count"] == 0
+    assert rating(client, items[1])["rating_avg"] is None
+
+
+def test_update_moves_the_rating(client, items):
+    review_id = review(client, items[0], 2)
+    review(client, items[0], 4)
+
+    response = client.put(f"{REVIEWS}{review_id}", json={"item_id": items[0], "rating": 5, "comment": "mejor"})
+    assert response.status_code == 200
+    assert response.json()["rating"] == 5
+    first = rating(client, items[0])
+    assert (first["rating_count"], first["rating_avg"]) == (2, 4.5)
+    assert first["histogram"]["2"] == 0 and first["histogram"]["5"] == 1
+
+    # Cambiar de item descuenta en uno y suma en el otro
+    client.put(f"{REVIEWS}{review_id}", json={"item_id": items[1], "rating": 3, "comment": "otra playa"})
+    first, second = rating(client, items[0]), rating(client, items[1])
+    assert (first["rating_count"], first["rating_avg"]) == (1, 4.0)
+    assert (second["rating_count"], second["rating_avg"]) == (1, 3.0)
+
+
+def test_failed_update_keeps_aggregates(client, items):
+    review_id = review(client, items[0], 4)
+
+    assert client.put(f"{REVIEWS}{review_id}", json={"item_id": 999999, "rating": 5, "comment": ""}).status_code == 404
+    assert client.put(f"{REVIEWS}{review_id}", json={"item_id": items[0], "rating": 6, "comment": ""}).status_code == 400
+    assert client.put(f"{REVIEWS}999999", json={"item_id": items[0], "rating": 5, "comment": ""}).status_code == 404
+
+    result = rating(client, items[0])
+    assert (result["rating_count"], result["rating_avg"]) == (1, 4.0)
+    assert client.get(f"{REVIEWS}{review_id}").json()["rating"] == 4
+
+
+def test_delete_updates_aggregates_once(client, items):
+    keep = review(client, items[0], 5)
+    gone = review(client, items[0], 1)
+
+    assert client.delete(f"{REVIEWS}{gone}").status_code == 200
+    assert client.delete(f"{REVIEWS}{gone}").status_code == 404
+
+    result = rating(client, items[0])
+    assert (result["rating_count"], result["rating_avg"]) == (1, 5.0)
+    assert result["histogram"]["1"] == 0
+
+    client.delete(f"{REVIEWS}{keep}")
+    result = rating(client, items[0])
+    assert (result["rating_count"], result["rating_avg"]) == (0, None)
+
+
+def test_invalid_reviews_do_not_count(client, items):
+    assert client.post(REVIEWS, json={"item_id": items[0], "rating": 0, "comment": ""}).status_code == 400
+    assert client.post(REVIEWS, json={"item_id": 999999, "rating": 5, "comment": ""}).status_code == 404
+    assert rating(client, items[0])["rating_count"] == 0
+    assert client.get(f"{REVIEWS}items/999999").status_code == 404
+
+
+def test_top_orders_by_average_then_id(client, items):
+    es_trenc, calo, agulla = items
+    for stars in (5, 4):
+        review(client, es_trenc, stars)
+    review(client, calo, 5)
+    review(client, agulla, 3)
+
+    top = client.get(f"{REVIEWS}top").json()
+    assert [(item["item_id"], item["rating_avg"]) for item in top] == [
+        (calo, 5.0), (es_trenc, 4.5), (agulla, 3.0),
+    ]
+    assert [item["item_id"] for item in client.get(f"{REVIEWS}top", params={"min_reviews": 2}).json()] == [es_trenc]
+    assert client.get(f"{REVIEWS}top", params={"tipo": "Plato"}).json() == []
+    assert len(client.get(f"{REVIEWS}top", params={"limit": 1}).json()) == 1
+
+    # Empate de media: primero el id más alto
+    review(client, agulla, 5)
+    review(client, agulla, 5)
+    review(client, agulla, 5)
+    top = client.get(f"{REVIEWS}top").json()
+    assert top[0]["item_id"] == calo
+    assert [item["item_id"] for item in top[1:]] == sorted([es_trenc, agulla], reverse=True)
+    assert top[1]["rating_avg"] == top[2]["rating_avg"] == 4.5
@@ -0,0 +1,37 @@
+import asyncio
+
+import httpx
+import pytest
+
+from scraper import http
+
+
+def fetch(monkeypatch, retries, statuses):
+    """Descarga una URL con un transporte que responde `statuses` en orden."""
+    monkeypatch.setattr(http, "SCRAPER_RETRIES", retries)
+    pending = list(statuses)
+
+    def handler(request):
+        return httpx.Response(pending.pop(0), text="<html></html>")
+
+    async def run():
+        fetcher = http.Fetcher(transport=httpx.MockTransport(handler))
+        try:
+            return await fetcher.fetch("https://example.com/playas"), fetcher.stats
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("retries", [0, -1])
+def test_without_retries_makes_one_attempt(monkeypatch, retries):
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(monkeypatch, retries, [503])
+
+
+def test_retries_after_the_first_attempt(monkeypatch):
+    text, stats = fetch(monkeypatch, 1, [503, 200])
+
+    assert text == "<html></html>"
+    assert stats["requests"] == 2 and stats["errors"] == 1
@@ -0,0 +1,111 @@
+from sqlalchemy import insert
+
+import database
+import models
+
+SEARCH = "/api/v1/search/"
+
+
+def playa(**overrides):
+    data = {
+        "nombre": "Es Trenc",
+        "imagen": "es-trenc.jpg",
+        "descripcion": "Playa virgen de arena blanca",
+        "zona": "Sur",
+        "pueblo": "Campos",
+        "servicios": ["Parking"],
+        "acceso": "Fácil",
+    }
+    return {**data, **overrides}
+
+
+def plato(**overrides):
+    data = {
+        "nombre": "Sobrasada",
+        "categoria": "Embutido",
+        "descripcion": "Embutido curado de cerdo con pimentón",
+        "ingredientes": ["Cerdo", "Pimentón"],
+        "imagen": "sobrasada.jpg",
+    }
+    return {**data, **overrides}
+
+
+def search(client, **params):
+    response = client.get(SEARCH, params=params)
+    assert response.status_code == 200, response.text
+    return [(result["tipo"], result["nombre"]) for result in response.json()]
+
+
+def test_name_matches_rank_above_description_matches(client):
+    client.post("/api/v1/playas/", json=playa(nombre="Cala Agulla", descripcion="Arena fina junto a Cala Ratjada"))
+    client.post("/api/v1/playas/", json=playa(nombre="Cala Ratjada", descripcion="Puerto y playa urbana"))
+    client.post("/api/v1/playas/", json=playa(nombre="Es Trenc", descripcion="Dunas y arena blanca"))
+
+    assert search(client, q="ratjada") == [("playas", "Cala Ratjada"), ("playas", "Cala Agulla")]
+
+
+def test_matches_without_accents(client):
+    client.post("/api/v1/playas/", json=playa(nombre="Caló des Moro", pueblo="Santanyí"))
+
+    assert search(client, q="calo") == [("playas", "Caló des Moro")]
+
+
+def test_all_terms_must_match(client):
+    client.post("/api/v1/playas/", json=playa(nombre="Es Trenc", descripcion="Arena blanca"))
+    client.post("/api/v1/playas/", json=playa(nombre="Sa Calobra", descripcion="Cantos rodados"))
+
+    assert search(client, q="arena blanca") == [("playas", "Es Trenc")]
+    # La sintaxis de FTS5 se trata como texto
+    assert search(client, q='arena OR "cantos') == []
+
+
+def test_types_filter(client):
+    client.post("/api/v1/playas/", json=playa(nombre="Playa del Embutido"))
+    client.post("/api/v1/food/", json=plato())
+
+    assert {tipo for tipo, _ in search(client, q="embutido")} == {"playas", "food"}
+    assert search(client, q="embutido", types="food") == [("food", "Sobrasada")]
+    assert search(client, q="embutido", types="food, playas") == search(client, q="embutido")
+
+
+def test_unknown_type_is_rejected(client):
+    response = client.get(SEARCH, params={"q": "playa", "types": "playas,castillos"})
+
+    assert response.status_code == 400
+    assert "castillos" in response.json()["detail"]
+
+
+def test_index_follows_writes(client):
+    playa_id = client.post("/api/v1/playas/", json=playa()).json()["id"]
+    assert search(client, q="trenc") == [("playas", "Es Trenc")]
+
+    client.put(f"/api/v1/playas/{playa_id}", json=playa(nombre="Ses Covetes"))
+    assert search(client, q="trenc") == []
+    assert search(client, q="covetes") == [("playas", "Ses Covetes")]
+
+    client.delete(f"/api/v1/playas/{playa_id}")
+    assert search(client, q="covetes", types="playas,catalog") == []
+
+
+def test_monuments(client):
+    with database.engine.begin() as conn:
+        conn.execute(insert(models.Monument).values(nombre="Far de Capdepera", descripcion="Faro del siglo XIX"))
+    client.post("/api/v1/playas/", json=playa(nombre="Far de Formentor"))
+
+    assert sorted(search(client, q="far")) == [("monuments", "Far de Capdepera"), ("playas", "Far de Formentor")]
+    assert search(client, q="far", types="monuments") == [("monuments", "Far de Capdepera")]
+
+
+def test_catalog_only_when_requested(client):
+    playa_id = client.post("/api/v1/playas/", json=playa()).json()["id"]
+    client.post("/api/v1/food/", json=plato())
+
+    # Por defecto cada recurso sale una vez, por su tabla
+    assert search(client, q="trenc") == [("playas", "Es Trenc")]
+
+    response = client.get(SEARCH, params={"q": "trenc", "types": "catalog"})
+    [result] = response.json()
+    catalog = client.get("/api/v1/catalog/", params={"tipo": "Playa"}).json()
+    assert result["tipo"] == "catalog"
+    assert result["id"] == catalog[0]["id"]
+    assert catalog[0]["ref_id"] == playa_id